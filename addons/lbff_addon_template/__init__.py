@@ -6,6 +6,8 @@ Purpose:
 Contract:
 - Export `classes` list and `register()` / `unregister()` functions.
 - If the addon contributes menus, append to `LBFF_MT_main_menu` when available or follow the `lbff_gaffer` fallback pattern.
+- Record `perf_counter_ns` phase durations in `timings` (import, register/unregister classes and menus);
+  `lbff_all_in_one` collects them into its timing report.
 
 Notes for Copilot/AI:
 - Provide implementations for TODOs below.
@@ -24,6 +26,10 @@ bl_info = {
     "category": "Development",
 }
 
+import time
+
+_import_start = time.perf_counter_ns()
+
 from typing import List
 import bpy
 
@@ -58,6 +64,9 @@ class LBFF_MT_template_menu(bpy.types.Menu):
 # If this addon must ensure the main menu exists, follow the pattern used in repo.
 classes: List[type] = [LBFF_OT_template_action, LBFF_MT_template_menu]
 
+# Nanoseconds per phase, collected by lbff_all_in_one's timing report.
+timings = {"import": time.perf_counter_ns() - _import_start}
+
 
 def register():
     """Register classes and append menu.
@@ -66,8 +75,11 @@ def register():
     global `LBFF_MT_main_menu` if present. If not present, it's fine to register
     standalone; the all-in-one loader will handle wiring when used.
     """
+    start = time.perf_counter_ns()
     for cls in classes:
         bpy.utils.register_class(cls)
+    wired = time.perf_counter_ns()
+    timings["register_classes"] = wired - start
 
     # Try to append to the global LBFF main menu draw list if it exists.
     # Store the exact draw function on the menu class so unregister can remove it cleanly.
@@ -79,10 +91,12 @@ def register():
     except AttributeError:
         # TOPBAR_MT_editor_menus or LBFF main menu not present; nothing to do.
         pass
+    timings["register_menus"] = time.perf_counter_ns() - wired
 
 
 def unregister():
     """Unregister classes and remove appended menu if present."""
+    start = time.perf_counter_ns()
     # Remove the draw function from the global TOPBAR draw list if we stored it.
     try:
         if hasattr(LBFF_MT_template_menu, "_draw_fn"):
@@ -96,8 +110,11 @@ def unregister():
         # bpy or TOPBAR list not present — ignore
         pass
 
+    unwired = time.perf_counter_ns()
+    timings["unregister_menus"] = unwired - start
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    timings["unregister_classes"] = time.perf_counter_ns() - unwired
 
 
 if __name__ == '__main__':
@@ -1,12 +1,28 @@
-
 """All-in-one addon loader for LBFF packages.
 
 This module provides a small loader that ensures a single LBFF main menu
-is available and then loads the individual LBFF addon modules listed in
-`ADDON_MODULES`. Addons should expose `register()` / `unregister()` and
-optionally a `classes` list; this loader will call `mod.register()` when
+is available and then makes the individual LBFF addon modules listed in
+`ADDON_MODULES` available. Addons should expose `register()` / `unregister()`
+and optionally a `classes` list; this loader will call `mod.register()` when
 present and print import/register errors to stderr.
 
+Sub-addons with an entry in `ADDON_MANIFESTS` are loaded lazily: at startup
+only a placeholder submenu and a stub operator per manifest operator are
+registered, and the addon itself is imported and registered the first time
+that submenu is drawn or one of its operators is invoked. Menu entries go
+through `lbff.load_addon`; a stub called directly (from a script, F3 search
+or a keymap) loads the addon from a timer and repeats the call on the real
+operator with the properties the caller set. Scripts that need the result
+right away call `load_addon()` first. With `--background` every addon is
+loaded at startup, so headless scripts see the real operators.
+Modules are resolved once and cached by `AddonRegistry`.
+
+Startup timings: the loader and each sub-addon record `perf_counter_ns`
+durations of their import, class registration and menu wiring in a
+module-level `timings` dict. `timing_report()` gathers them; the LBFF menu's
+"Startup Timing Report" prints them, and with `--background` the report is
+dumped as JSON at exit, to the file named by `LBFF_TIMING_REPORT` or stdout.
+
 Design notes:
 - Keeps registration resilient: failures in one submodule don't stop
     others from registering.
@@ -26,8 +42,13 @@ bl_info = {
 }
 
 import bpy
+import os
 import sys
+import json
+import time
+import atexit
 import importlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # --- Addon Discovery & Management ---
 
@@ -39,17 +60,321 @@ ADDON_MODULES = [
     "lbff_gaffer",
 ]
 
+
+class AddonManifest(NamedTuple):
+    """What the LBFF menu offers for a sub-addon before it is imported.
+
+    ``operators`` mirrors the sub-addon's own submenu as
+    ``(bl_idname, label, properties)`` entries. ``stubs`` declares the
+    properties of every operator scripts may call before the addon is
+    loaded, by ``bl_idname``; enums may be declared as strings, since the
+    real operator validates the value.
+    """
+
+    label: str
+    operators: Tuple[Tuple[str, str, dict], ...] = ()
+    stubs: Dict[str, Dict[str, object]] = {}
+
+
+# Nanoseconds per phase of this loader, like the sub-addons' own `timings`.
+timings = {}
+
+# Addons without a manifest are imported and registered at startup. Each
+# manifest mirrors the addon's own submenu and operator properties;
+# tests/test_all_in_one.py checks them against the real addon.
+_String, _Int, _Float, _Bool = (bpy.props.StringProperty, bpy.props.IntProperty, bpy.props.FloatProperty,
+                                bpy.props.BoolProperty)
+ADDON_MANIFESTS = {
+    "lbff_minecraft_importer": AddonManifest("Minecraft Importer", (
+        ("lbff.import_minecraft_texture", "Import Minecraft Texture", {}),
+        ("lbff.import_minecraft_block_textures", "Import All Block Textures", {}),
+        ("lbff.import_minecraft_world", "Import Minecraft World", {}),
+        ("lbff.import_minecraft_world", "Import Minecraft World (Background)", {"background": True}),
+        ("lbff.add_minecraft_area", "Add Import Area", {}),
+    ), {
+        "lbff.import_minecraft_texture": {"texture": _String()},
+        "lbff.import_minecraft_block_textures": {"folder": _String(), "workers": _Int(),
+                                                 "create_materials": _Bool()},
+        "lbff.import_minecraft_world": {
+            "directory": _String(subtype='DIR_PATH'), "dimension": _String(), "workers": _Int(),
+            "greedy": _Bool(), "area": _String(), "box_min": bpy.props.IntVectorProperty(size=2),
+            "box_max": bpy.props.IntVectorProperty(size=2), "radius": _Int(), "area_name": _String(),
+            "camera_margin": _Float(), "placeholders": _Bool(), "placeholder_height": _Int(),
+            "use_lod": _Bool(), "lod_distances": bpy.props.IntVectorProperty(size=3),
+            "artifacts": _String(subtype='DIR_PATH'), "mesh_cache": _Bool(), "background": _Bool(),
+            "chunks_per_tick": _Int(), "instance_models": _Bool(),
+        },
+        "lbff.add_minecraft_area": {"name": _String(), "min_corner": bpy.props.IntVectorProperty(size=2),
+                                    "max_corner": bpy.props.IntVectorProperty(size=2)},
+        "lbff.export_profile": {"filepath": _String(subtype='FILE_PATH'), "format": _String()},
+        "lbff.clear_profile": {},
+    }),
+    "lbff_gaffer": AddonManifest("Gaffer", (
+        ("lbff.gaffer_create_lighting", "Create 3-Point Lighting", {"mode": 'THREE_POINT'}),
+        ("lbff.gaffer_create_lighting", "Light Emissive Blocks", {"mode": 'EMISSIVE'}),
+    ), {
+        "lbff.gaffer_create_lighting": {"mode": _String(), "max_lights": _Int(), "method": _String(),
+                                        "light_type": _String(), "watts": _Float()},
+    }),
+}
+
+
+class AddonRegistry:
+    """Resolves sub-addon modules once and registers each at most once.
+
+    A module that failed to import is cached as ``None`` so it is not
+    retried on every menu redraw. ``timings`` holds the nanoseconds each
+    module took to resolve, register and unregister as seen from here.
+    """
+
+    def __init__(self):
+        self.modules: Dict[str, Optional[object]] = {}
+        self.loaded: List[str] = []
+        self.timings: Dict[str, Dict[str, int]] = {}
+
+    def module(self, name: str):
+        """Import ``name`` on first use; return the module or ``None``."""
+        if name not in self.modules:
+            # The package is '..', which is 'lbff.addons'
+            package = __package__.rsplit('.', 1)[0]
+            start = time.perf_counter_ns()
+            try:
+                self.modules[name] = importlib.import_module(f".{name}", package)
+            except ImportError as e:
+                print(f"[{bl_info['name']}] Could not import addon '{name}': {e}")
+                self.modules[name] = None
+            self.timings.setdefault(name, {})["resolve"] = time.perf_counter_ns() - start
+        return self.modules[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.loaded
+
+    def load(self, name: str):
+        """Import and register ``name`` unless that already happened."""
+        mod = self.module(name)
+        if mod is None or name in self.loaded:
+            return mod
+        # Marked before registering so a failing addon isn't retried on every redraw.
+        self.loaded.append(name)
+        if hasattr(mod, "register"):
+            start = time.perf_counter_ns()
+            try:
+                mod.register()
+            except Exception as e:
+                print(f"[{bl_info['name']}] Failed to register module {mod.__name__}: {e}", file=sys.stderr)
+            self.timings[name]["register"] = time.perf_counter_ns() - start
+        return mod
+
+    def unload_all(self):
+        """Unregister the loaded addons in reverse order; nothing is imported."""
+        for name in reversed(self.loaded):
+            mod = self.modules[name]
+            if hasattr(mod, "unregister"):
+                start = time.perf_counter_ns()
+                try:
+                    mod.unregister()
+                except Exception as e:
+                    print(f"[{bl_info['name']}] Failed to unregister module {mod.__name__}: {e}", file=sys.stderr)
+                self.timings[name]["unregister"] = time.perf_counter_ns() - start
+        self.loaded.clear()
+
+
+_registry = AddonRegistry()
+
+
 def get_addon_modules():
-    """Dynamically import and return the addon modules."""
-    modules = []
-    # The package is '..', which is 'lbff.addons'
-    package = __package__.rsplit('.', 1)[0]
-    for mod_name in ADDON_MODULES:
-        try:
-            modules.append(importlib.import_module(f".{mod_name}", package))
-        except ImportError as e:
-            print(f"[{bl_info['name']}] Could not import addon '{mod_name}': {e}")
-    return modules
+    """Return the addon modules that import, resolving each only once."""
+    return [mod for mod in map(_registry.module, ADDON_MODULES) if mod is not None]
+
+
+def load_addon(name: str):
+    """Import and register sub-addon ``name`` now; return it, or ``None`` if it failed to import.
+
+    Menus and stub operators load their addon on demand; scripts in an
+    interactive session call this to use the addon's operators right away.
+    Must not run from inside one of the addon's stub operators, which it
+    unregisters.
+    """
+    if _registry.module(name) is not None:
+        # The addon registers its real operators under the stubs' names.
+        for stub in _stubs.pop(name, ()):
+            bpy.utils.unregister_class(stub)
+    return _registry.load(name)
+
+
+def timing_report():
+    """Return the recorded startup timings as a JSON-ready dict.
+
+    Durations are integer nanoseconds. Each addon's ``phases`` merge what
+    the loader measured around it (``resolve``, ``register``,
+    ``unregister``) with the phases the addon recorded itself; they are
+    empty for an addon that was never resolved.
+    """
+    addons = []
+    for name in ADDON_MODULES:
+        mod = _registry.modules.get(name)
+        phases = dict(_registry.timings.get(name, {}))
+        phases.update(getattr(mod, "timings", {}))
+        addons.append({"module": name, "imported": mod is not None, "loaded": _registry.is_loaded(name),
+                       "phases": phases})
+    return {"loader": dict(timings), "addons": addons}
+
+
+def format_timing_report(report) -> str:
+    """Render ``report`` as aligned text in milliseconds."""
+    lines = ["LBFF startup timings (ms)"]
+    rows = [("lbff_all_in_one", report["loader"])]
+    rows += [(f"{a['module']}{'' if a['loaded'] else ' (not loaded)'}", a["phases"]) for a in report["addons"]]
+    width = max(len(label) for label, _ in rows)
+    for label, phases in rows:
+        cells = [f"{phase} {ns / 1e6:.2f}" for phase, ns in phases.items()]
+        lines.append(f"  {label:<{width}}  {'  '.join(cells)}")
+    return "\n".join(lines)
+
+
+def _dump_timing_report():
+    data = json.dumps(timing_report(), indent=2)
+    path = os.environ.get("LBFF_TIMING_REPORT")
+    if not path:
+        print(data)
+        return
+    try:
+        with open(path, "w", encoding="utf8") as fh:
+            fh.write(data)
+    except OSError as e:
+        print(f"[{bl_info['name']}] Could not write timing report {path}: {e}", file=sys.stderr)
+
+
+class LBFF_OT_timing_report(bpy.types.Operator):
+    """Print how long each LBFF addon took to import and register"""
+    bl_idname = "lbff.timing_report"
+    bl_label = "Startup Timing Report"
+
+    def execute(self, context):
+        text = format_timing_report(timing_report())
+        print(text)
+        self.report({'INFO'}, "LBFF startup timings printed to the system console")
+        return {'FINISHED'}
+
+
+class LBFF_OT_load_addon(bpy.types.Operator):
+    """Load an LBFF addon, then run one of its operators"""
+    bl_idname = "lbff.load_addon"
+    bl_label = "Load LBFF Addon"
+    bl_options = {'INTERNAL'}
+
+    module: bpy.props.StringProperty(name="Module")
+    operator: bpy.props.StringProperty(name="Operator")
+    properties: bpy.props.StringProperty(name="Properties", default="{}")
+
+    def invoke(self, context, event):
+        return self._run('INVOKE_DEFAULT')
+
+    def execute(self, context):
+        return self._run('EXEC_DEFAULT')
+
+    def _run(self, mode):
+        if load_addon(self.module) is None:
+            self.report({'ERROR'}, f"Could not load addon '{self.module}'")
+            return {'CANCELLED'}
+        if not self.operator:
+            return {'FINISHED'}
+        category, name = self.operator.split(".", 1)
+        result = getattr(getattr(bpy.ops, category), name)(mode, **json.loads(self.properties))
+        # The target may go modal (e.g. open a file browser), but it has its
+        # own handler; this proxy has none and is done either way.
+        return {'CANCELLED'} if 'CANCELLED' in result else {'FINISHED'}
+
+
+# Pending one-shot load timers by addon, and the stub calls to repeat on the
+# real operators once the addon is loaded.
+_scheduled = {}
+_pending_calls = {}
+
+
+def _dispatch(idname: str, execution_context: str, props: dict, window) -> None:
+    category, name = idname.split(".", 1)
+    op = getattr(getattr(bpy.ops, category), name)
+    if window is not None and hasattr(bpy.context, "temp_override"):
+        # Timers run without a window, which e.g. file browsers need.
+        with bpy.context.temp_override(window=window):
+            op(execution_context, **props)
+    else:
+        op(execution_context, **props)
+
+
+def _schedule_load(name):
+    # Registering classes from inside a draw callback is not allowed, and a
+    # stub must not be replaced while it runs, so the load runs from a
+    # one-shot timer right after the menu is drawn or the stub returns.
+    if name in _scheduled or (_registry.is_loaded(name) and not _pending_calls.get(name)):
+        return
+
+    def load():
+        del _scheduled[name]
+        if load_addon(name) is None:
+            print(f"[{bl_info['name']}] Dropped calls to '{name}', which could not be imported", file=sys.stderr)
+            _pending_calls.pop(name, None)
+            return None
+        for call in _pending_calls.pop(name, ()):
+            try:
+                _dispatch(*call)
+            except (RuntimeError, TypeError, AttributeError) as e:
+                print(f"[{bl_info['name']}] {call[0]} failed: {e}", file=sys.stderr)
+        return None
+
+    _scheduled[name] = load
+    bpy.app.timers.register(load, first_interval=0.0)
+
+
+def _property_value(value):
+    # Vector properties read back as bpy_prop_array.
+    return value if isinstance(value, (str, bytes)) or not hasattr(value, "__len__") else tuple(value)
+
+
+def _stub_operator(name: str, idname: str, properties: Dict[str, object], label: str):
+    """Build the operator registered as ``idname`` until addon ``name`` is loaded."""
+    def run(self, context, mode):
+        props = {key: _property_value(getattr(self, key))
+                 for key in properties if self.properties.is_property_set(key)}
+        _pending_calls.setdefault(name, []).append((idname, mode, props, getattr(context, "window", None)))
+        _schedule_load(name)
+        return {'FINISHED'}
+
+    return type(f"LBFF_OT_stub_{idname.replace('.', '_')}", (bpy.types.Operator,), {
+        "__annotations__": dict(properties),
+        "__doc__": f"{label} (loads the {name} addon first)",
+        "bl_idname": idname,
+        "bl_label": label,
+        "lbff_addon": name,
+        "invoke": lambda self, context, event: run(self, context, 'INVOKE_DEFAULT'),
+        "execute": lambda self, context: run(self, context, 'EXEC_DEFAULT'),
+    })
+
+
+_stubs = {}
+
+
+def _placeholder_menu(name: str, manifest: AddonManifest):
+    """Build the submenu shown for ``name`` until the addon is loaded."""
+    def draw(self, context):
+        _schedule_load(name)
+        for idname, label, props in manifest.operators:
+            op = self.layout.operator(LBFF_OT_load_addon.bl_idname, text=label)
+            op.module = name
+            op.operator = idname
+            op.properties = json.dumps(props)
+
+    return type(f"LBFF_MT_lazy_{name}", (bpy.types.Menu,), {
+        "bl_idname": f"LBFF_MT_lazy_{name}",
+        "bl_label": manifest.label,
+        "lbff_addon": name,
+        "draw": draw,
+    })
+
+
+_placeholders = []
+
 
 # Define the main LBFF menu here so it's guaranteed to exist
 class LBFF_MT_main_menu(bpy.types.Menu):
@@ -57,37 +382,69 @@ class LBFF_MT_main_menu(bpy.types.Menu):
     bl_idname = "LBFF_MT_main_menu"
 
     def draw(self, context):
-        # This menu will be populated by the other addons
-        pass
+        # Loaded addons append their own submenus; the rest show placeholders.
+        layout = self.layout
+        for menu in _placeholders:
+            if not _registry.is_loaded(menu.lbff_addon):
+                layout.menu(menu.bl_idname)
+        layout.separator()
+        layout.operator(LBFF_OT_timing_report.bl_idname)
 
 def draw_main_menu(self, context):
     self.layout.menu(LBFF_MT_main_menu.bl_idname)
 
 
 def register():
+    start = time.perf_counter_ns()
     # Register the main menu first
     bpy.utils.register_class(LBFF_MT_main_menu)
+    bpy.utils.register_class(LBFF_OT_load_addon)
+    bpy.utils.register_class(LBFF_OT_timing_report)
+    # Headless runs load every addon below: their scripts call operators
+    # directly and no menu is ever drawn.
+    lazy = [name for name in ADDON_MODULES if name in ADDON_MANIFESTS and not bpy.app.background]
+    # Placeholder submenus and stub operators for lazy addons
+    for name in lazy:
+        manifest = ADDON_MANIFESTS[name]
+        menu = _placeholder_menu(name, manifest)
+        bpy.utils.register_class(menu)
+        _placeholders.append(menu)
+        labels = {idname: label for idname, label, _ in reversed(manifest.operators)}
+        for idname, properties in manifest.stubs.items():
+            stub = _stub_operator(name, idname, properties, labels.get(idname, idname))
+            bpy.utils.register_class(stub)
+            _stubs.setdefault(name, []).append(stub)
+    wired = time.perf_counter_ns()
+    timings["register_classes"] = wired - start
+
     # Store the draw function on the menu class so unregister can remove it
     LBFF_MT_main_menu._draw_fn = draw_main_menu
     bpy.types.TOPBAR_MT_editor_menus.append(draw_main_menu)
+    timings["register_menus"] = time.perf_counter_ns() - wired
 
-    # Register the other addons, with error handling
-    for mod in get_addon_modules():
-        if hasattr(mod, "register"):
-            try:
-                mod.register()
-            except Exception as e:
-                print(f"[{bl_info['name']}] Failed to register module {mod.__name__}: {e}", file=sys.stderr)
+    # Register the other addons right away, with error handling
+    for name in ADDON_MODULES:
+        if name not in lazy:
+            load_addon(name)
+
+    if bpy.app.background:
+        # Left in place by unregister() so the dump includes the teardown
+        # Blender runs at exit; dropped first so re-registering dumps once.
+        atexit.unregister(_dump_timing_report)
+        atexit.register(_dump_timing_report)
 
 def unregister():
-    # Unregister in reverse order
-    for mod in reversed(get_addon_modules()):
-        if hasattr(mod, "unregister"):
-            try:
-                mod.unregister()
-            except Exception as e:
-                print(f"[{bl_info['name']}] Failed to unregister module {mod.__name__}: {e}", file=sys.stderr)
+    # A load still pending would register an addon nobody unregisters.
+    for load in _scheduled.values():
+        if bpy.app.timers.is_registered(load):
+            bpy.app.timers.unregister(load)
+    _scheduled.clear()
+    _pending_calls.clear()
+
+    # Unregister the loaded addons in reverse order
+    _registry.unload_all()
 
+    start = time.perf_counter_ns()
     # Remove stored draw function if present
     if hasattr(LBFF_MT_main_menu, '_draw_fn'):
         try:
@@ -95,8 +452,20 @@ def unregister():
         except (ValueError, AttributeError):
             pass
         del LBFF_MT_main_menu._draw_fn
+    unwired = time.perf_counter_ns()
+    timings["unregister_menus"] = unwired - start
 
+    for stubs in _stubs.values():
+        for stub in reversed(stubs):
+            bpy.utils.unregister_class(stub)
+    _stubs.clear()
+    for menu in reversed(_placeholders):
+        bpy.utils.unregister_class(menu)
+    _placeholders.clear()
+    bpy.utils.unregister_class(LBFF_OT_timing_report)
+    bpy.utils.unregister_class(LBFF_OT_load_addon)
     bpy.utils.unregister_class(LBFF_MT_main_menu)
+    timings["unregister_classes"] = time.perf_counter_ns() - unwired
 
 if __name__ == "__main__":
     register()
@@ -18,12 +18,19 @@ bl_info = {
     "category": "Object",
 }
 
+import time
+
+_import_start = time.perf_counter_ns()
+
 import bpy
 
 # Implementation modules
 from .operators import LBFF_OT_gaffer_create_lighting
 from .menus import LBFF_MT_gaffer_menu
 
+# Nanoseconds per phase, collected by lbff_all_in_one's timing report.
+timings = {"import": time.perf_counter_ns() - _import_start}
+
 
 def _menu_draw(self, context):
     self.layout.menu(LBFF_MT_gaffer_menu.bl_idname)
@@ -33,8 +40,11 @@ classes = [LBFF_OT_gaffer_create_lighting, LBFF_MT_gaffer_menu]
 
 
 def register():
+    start = time.perf_counter_ns()
     for cls in classes:
         bpy.utils.register_class(cls)
+    wired = time.perf_counter_ns()
+    timings["register_classes"] = wired - start
 
     # Try to append to the main LBFF menu if it exists. Store the draw function
     # on the menu class so unregister can remove the exact same callable.
@@ -59,9 +69,11 @@ def register():
 
         bpy.types.TOPBAR_MT_editor_menus.append(draw_main_menu)
         LBFF_MT_gaffer_menu._draw_main_menu = draw_main_menu
+    timings["register_menus"] = time.perf_counter_ns() - wired
 
 
 def unregister():
+    start = time.perf_counter_ns()
     # Try to remove from the main menu
     try:
         main_menu = bpy.types.LBFF_MT_main_menu
@@ -81,8 +93,11 @@ def unregister():
         except (AttributeError, RuntimeError):
             pass
 
+    unwired = time.perf_counter_ns()
+    timings["unregister_menus"] = unwired - start
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    timings["unregister_classes"] = time.perf_counter_ns() - unwired
 
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+"""Cluster emissive Minecraft blocks into a bounded set of lights.
+
+An imported world can hold tens of thousands of torches, lanterns and
+glowstone faces. One Blender light each would exceed EEVEE's light limit
+and make Cycles' light tree slow to build, so :func:`cluster_emitters`
+groups the emitters spatially into at most ``max_lights`` clusters by
+splitting an octree, optionally refined with weighted k-means.
+:class:`LightClusters` sums each cluster's energy and averages its colour.
+
+Emitters are identified by texture name (:func:`emitter_for_texture`); the
+table holds each emissive texture's Minecraft light level and a
+representative light colour.
+
+This module does not import ``bpy``.
+"""
+
+import heapq
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+Color = Tuple[float, float, float]
+
+
+class Emitter(NamedTuple):
+    level: int  # Minecraft light level, 1..15
+    color: Color
+
+
+_WARM = (1.0, 0.72, 0.42)
+_SOUL = (0.45, 0.85, 1.0)
+
+# Texture base names; see emitter_for_texture for how suffixes are matched.
+EMISSIVE_TEXTURES: Dict[str, Emitter] = {
+    "glowstone": Emitter(15, (1.0, 0.85, 0.55)),
+    "sea_lantern": Emitter(15, (0.75, 0.9, 1.0)),
+    "lava": Emitter(15, (1.0, 0.45, 0.1)),
+    "shroomlight": Emitter(15, (1.0, 0.6, 0.35)),
+    "jack_o_lantern": Emitter(15, (1.0, 0.65, 0.3)),
+    "redstone_lamp_on": Emitter(15, (1.0, 0.7, 0.4)),
+    "beacon": Emitter(15, (0.8, 0.95, 1.0)),
+    "lantern": Emitter(15, _WARM),
+    "campfire_fire": Emitter(15, (1.0, 0.6, 0.25)),
+    "fire": Emitter(15, (1.0, 0.6, 0.25)),
+    "ochre_froglight": Emitter(15, (1.0, 0.85, 0.5)),
+    "verdant_froglight": Emitter(15, (0.75, 1.0, 0.6)),
+    "pearlescent_froglight": Emitter(15, (1.0, 0.75, 0.9)),
+    "torch": Emitter(14, _WARM),
+    "end_rod": Emitter(14, (1.0, 0.95, 0.9)),
+    "soul_lantern": Emitter(10, _SOUL),
+    "soul_torch": Emitter(10, _SOUL),
+    "soul_campfire_fire": Emitter(10, _SOUL),
+    "soul_fire": Emitter(10, _SOUL),
+    "crying_obsidian": Emitter(10, (0.6, 0.25, 1.0)),
+    "redstone_torch": Emitter(7, (1.0, 0.25, 0.1)),
+    "glow_lichen": Emitter(7, (0.65, 0.9, 0.75)),
+    "magma": Emitter(3, (1.0, 0.4, 0.1)),
+}
+
+# Blender's ".001" duplicate suffix and the per-face/frame suffixes of
+# multi-texture blocks (lava_still, fire_0, ochre_froglight_side, ...).
+_DUPLICATE = re.compile(r"\.\d{3}$")
+_SUFFIX = re.compile(r"_(still|flow|side|top|bottom|front|\d+)$")
+
+
+def emitter_for_texture(name: str) -> Optional[Emitter]:
+    """Return the :class:`Emitter` for a texture or material name, or ``None``.
+
+    Accepts ``minecraft:block/torch``, ``block/lava_still`` or a material
+    name such as ``glowstone.001``.
+    """
+    base = _DUPLICATE.sub("", name).rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+    emitter = EMISSIVE_TEXTURES.get(base)
+    if emitter is None:
+        emitter = EMISSIVE_TEXTURES.get(_SUFFIX.sub("", base))
+    return emitter
+
+
+class LightClusters(NamedTuple):
+    """``K`` lights: ``positions`` ``(K, 3)``; ``weights`` ``(K,)`` summed
+    emitter weights; ``colors`` ``(K, 3)`` weight-averaged; ``radii`` ``(K,)``
+    weighted RMS distance of the members from the position; ``counts``
+    ``(K,)`` emitters per light."""
+
+    positions: np.ndarray
+    weights: np.ndarray
+    colors: np.ndarray
+    radii: np.ndarray
+    counts: np.ndarray
+
+
+_BLOCK_ROWS = 4096
+
+
+def _nearest(points: np.ndarray, centres: np.ndarray) -> np.ndarray:
+    """Return the index of the nearest centre for every point, in row blocks to bound memory."""
+    labels = np.empty(len(points), dtype=np.int64)
+    centres = centres.astype(np.float32)
+    norms = (centres ** 2).sum(axis=1)
+    transposed = np.ascontiguousarray(-2 * centres.T)
+    for start in range(0, len(points), _BLOCK_ROWS):
+        block = points[start:start + _BLOCK_ROWS]
+        # |p - c|^2 without the |p|^2 term, which doesn't change the argmin.
+        labels[start:start + _BLOCK_ROWS] = np.argmin(block @ transposed + norms, axis=1)
+    return labels
+
+
+def kmeans_labels(points: np.ndarray, weights: np.ndarray, k: int, iterations: int = 10) -> np.ndarray:
+    """Weighted k-means seeded from :func:`octree_labels`; returns a cluster label per point.
+
+    Emitters inside the same block are clustered as one weighted point, and
+    iteration stops once fewer than 0.1% of the labels change. Fewer than
+    ``k`` clusters come back when there are fewer distinct blocks.
+    """
+    blocks, inverse = np.unique(np.floor(points), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    mass = np.bincount(inverse, weights, len(blocks))
+    cells = np.stack([np.bincount(inverse, weights * points[:, i], len(blocks)) for i in range(3)], axis=1)
+    cells = np.where(mass[:, None] > 0, cells / np.where(mass > 0, mass, 1.0)[:, None], blocks)
+    weights = mass
+    if len(cells) <= k:
+        return inverse
+
+    # Octree leaves are cheap, deterministic seeds that already follow the light.
+    labels = octree_labels(cells, weights, k)
+    compact = cells.astype(np.float32)
+    for _ in range(iterations):
+        count = labels.max() + 1
+        mass = np.bincount(labels, weights, count)
+        centres = np.stack([np.bincount(labels, weights * cells[:, i], count) for i in range(3)], axis=1)
+        centres = centres[mass > 0] / mass[mass > 0, None]
+        new = _nearest(compact, centres)
+        changed = np.count_nonzero(new != labels)
+        labels = new
+        if changed <= len(labels) // 1000:
+            break
+    return labels[inverse]
+
+
+def octree_labels(points: np.ndarray, weights: np.ndarray, k: int) -> np.ndarray:
+    """Split an octree into at most ``k`` leaves; returns a leaf label per point.
+
+    The cell with the largest ``weight * size`` is split first, so bright,
+    spread-out areas get more lights. When the remaining budget can't take
+    all of a cell's octants it is halved along its longest axis instead.
+    """
+    def cell(index):
+        lo = points[index].min(axis=0)
+        hi = points[index].max(axis=0)
+        size = float((hi - lo).max())
+        return (-float(weights[index].sum()) * size, next(counter), index, lo, hi)
+
+    counter = iter(range(1 << 62))
+    heap = [cell(np.arange(len(points)))]
+    leaves = []
+    while heap and len(heap) + len(leaves) < k:
+        priority, _, index, lo, hi = heapq.heappop(heap)
+        if priority == 0:  # all points coincide (or carry no weight)
+            leaves.append(index)
+            continue
+        octant = ((points[index] > (lo + hi) / 2) * [1, 2, 4]).sum(axis=1)
+        children = [index[octant == o] for o in np.unique(octant)]
+        if len(heap) + len(leaves) + len(children) > k:
+            # Too few lights left for all octants: halve the longest axis instead.
+            axis = int(np.argmax(hi - lo))
+            upper = points[index, axis] > (lo[axis] + hi[axis]) / 2
+            children = [index[~upper], index[upper]]
+        for child in children:
+            heapq.heappush(heap, cell(child))
+    labels = np.empty(len(points), dtype=np.int64)
+    for label, index in enumerate(leaves + [entry[2] for entry in heap]):
+        labels[index] = label
+    return labels
+
+
+def aggregate(points: np.ndarray, weights: np.ndarray, colors: np.ndarray, labels: np.ndarray) -> LightClusters:
+    """Sum and average the emitters of each label into :class:`LightClusters`."""
+    _, labels = np.unique(labels, return_inverse=True)
+    labels = labels.reshape(-1)
+    count = labels.max() + 1 if len(labels) else 0
+    mass = np.bincount(labels, weights, minlength=count)
+    safe = np.where(mass > 0, mass, 1.0)
+    positions = np.stack([np.bincount(labels, weights * points[:, i], count) for i in range(3)], axis=1)
+    positions /= safe[:, None]
+    mean_colors = np.stack([np.bincount(labels, weights * colors[:, i], count) for i in range(3)], axis=1)
+    mean_colors /= safe[:, None]
+    spread = np.bincount(labels, weights * ((points - positions[labels]) ** 2).sum(axis=1), count) / safe
+    return LightClusters(positions, mass, mean_colors, np.sqrt(spread), np.bincount(labels, minlength=count))
+
+
+def cluster_emitters(points: np.ndarray, weights: np.ndarray, colors: np.ndarray, max_lights: int,
+                     method: str = 'KMEANS') -> LightClusters:
+    """Group emitters into at most ``max_lights`` lights.
+
+    Args:
+        points: ``(N, 3)`` emitter positions.
+        weights: ``(N,)`` emitter strengths (e.g. light level times area).
+        colors: ``(N, 3)`` emitter light colours.
+        max_lights: upper bound on the number of lights.
+        method: ``'KMEANS'`` (tighter clusters) or ``'OCTREE'`` (faster).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0 or max_lights < 1:
+        empty = np.zeros((0, 3))
+        return LightClusters(empty, np.zeros(0), empty, np.zeros(0), np.zeros(0, dtype=np.int64))
+    if len(points) <= max_lights:
+        labels = np.arange(len(points))
+    elif method == 'OCTREE':
+        labels = octree_labels(points, weights, max_lights)
+    else:
+        labels = kmeans_labels(points, weights, max_lights)
+    return aggregate(points, weights, colors, labels)
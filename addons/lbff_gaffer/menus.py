@@ -8,7 +8,10 @@ class LBFF_MT_gaffer_menu(bpy.types.Menu):
 
     def draw(self, context):
         layout = self.layout
-        layout.operator(LBFF_OT_gaffer_create_lighting.bl_idname)
+        op = layout.operator(LBFF_OT_gaffer_create_lighting.bl_idname, text="Create 3-Point Lighting")
+        op.mode = 'THREE_POINT'
+        op = layout.operator(LBFF_OT_gaffer_create_lighting.bl_idname, text="Light Emissive Blocks")
+        op.mode = 'EMISSIVE'
 
 
 classes = [LBFF_MT_gaffer_menu]
@@ -1,15 +1,341 @@
+"""Gaffer operators: a 3-point rig, or lights for the emissive blocks of imported Minecraft worlds.
+
+The emissive scan reads what the Minecraft importer writes into the scene
+(collection, material and attribute names below) without importing it, so
+Gaffer keeps working on saved .blend files and stays cheap to enable.
+"""
+
+import json
+import math
+import re
+
 import bpy
+from bpy.props import EnumProperty, FloatProperty, IntProperty
+
+from .profiling import profiled, stage
+
+# Data contract with lbff_minecraft_importer (operators.py, datablocks.py, instancing.py).
+WORLD_PROP = "lbff_world"
+PLACEHOLDER_PROP = "lbff_placeholders"
+ATLAS_UV_TABLE_PROP = "lbff_atlas_uv_table"
+MODEL_ATTRIBUTE = "lbff_model"
+PROTOTYPES_PROP = "lbff_prototypes"
+_ATLAS_PAGE = re.compile(r"LBFF_Atlas_(\d+)")
+
+# Marks the collections Gaffer fills, so running again replaces their lights.
+GAFFER_PROP = "lbff_gaffer"
+# An instanced model (torch, lantern) lights like a whole block, which
+# typically shows about three faces.
+MODEL_FACES = 3.0
+
+# (name, azimuth, elevation, watts at 5 m) around the target; azimuth 0 is the front (-Y).
+_RIG = (
+    ("Key", 45.0, 35.0, 1000.0),
+    ("Fill", -50.0, 15.0, 350.0),
+    ("Rim", 180.0, 50.0, 700.0),
+)
+
+
+def _gaffer_collection(parent, name: str, kind: str) -> bpy.types.Collection:
+    """Return the emptied child collection of ``parent`` Gaffer made for ``kind``, or a new one."""
+    for child in parent.children:
+        if child.get(GAFFER_PROP) == kind:
+            for obj in list(child.objects):
+                light = obj.data
+                bpy.data.objects.remove(obj)
+                if light is not None and light.users == 0:
+                    bpy.data.lights.remove(light)
+            return child
+    collection = bpy.data.collections.new(name)
+    collection[GAFFER_PROP] = kind
+    parent.children.link(collection)
+    return collection
+
+
+def _add_light(collection, name: str, light_type: str, location, energy: float, color=(1.0, 1.0, 1.0)):
+    light = bpy.data.lights.new(name, light_type)
+    light.energy = energy
+    light.color = color
+    obj = bpy.data.objects.new(name, light)
+    obj.location = location
+    collection.objects.link(obj)
+    return obj
+
+
+def _aim(obj, target) -> None:
+    """Rotate ``obj`` so its -Z axis (the light direction) points at ``target``."""
+    dx, dy, dz = (obj.location[i] - target[i] for i in range(3))
+    obj.rotation_euler = (math.atan2(math.hypot(dx, dy), dz), 0.0, math.atan2(dx, -dy))
+
+
+def _three_point(context) -> int:
+    """Build a key/fill/rim rig around the active object, or the 3D cursor; returns the light count."""
+    obj = context.active_object
+    if obj is not None:
+        target = tuple(obj.matrix_world.translation)
+        size = max(max(obj.dimensions), 0.5)
+    else:
+        target = tuple(context.scene.cursor.location)
+        size = 2.0
+    distance = max(2.5 * size, 3.0)
+    collection = _gaffer_collection(context.scene.collection, "LBFF 3-Point Lighting", 'THREE_POINT')
+    for name, azimuth, elevation, watts in _RIG:
+        az, el = math.radians(azimuth), math.radians(elevation)
+        offset = (math.cos(el) * math.sin(az), -math.cos(el) * math.cos(az), math.sin(el))
+        location = tuple(t + distance * o for t, o in zip(target, offset))
+        light = _add_light(collection, f"LBFF {name}", 'AREA', location, watts * (distance / 5.0) ** 2)
+        light.data.size = size
+        _aim(light, target)
+    return len(_RIG)
+
+
+class _EmitterScan:
+    """Collects emissive face and instance positions, weights and colours from world objects."""
+
+    def __init__(self):
+        from . import clustering  # NumPy is only loaded once emissive lighting is used.
+        self.clustering = clustering
+        self.points = []
+        self.weights = []
+        self.colors = []
+        self._rects = {}
+        self._prototypes = {}
+
+    def _atlas_rects(self, material):
+        """Return ``[(u0, v0, u1, v1, emitter)]`` for the emissive textures on an atlas page material."""
+        rects = self._rects.get(material.name)
+        if rects is None:
+            match = _ATLAS_PAGE.match(material.name)
+            page = int(match.group(1)) if match else None
+            rects = []
+            for name, (p, u0, v0, u1, v1) in json.loads(material[ATLAS_UV_TABLE_PROP]).items():
+                emitter = self.clustering.emitter_for_texture(name)
+                if emitter is not None and page in (None, p):
+                    rects.append((u0, v0, u1, v1, emitter))
+            self._rects[material.name] = rects
+        return rects
+
+    def face_emitters(self, mesh):
+        """Return per-face ``(levels, colors)`` arrays for ``mesh``; level 0 means not emissive."""
+        np = self.clustering.np
+        count = len(mesh.polygons)
+        levels = np.zeros(count)
+        colors = np.zeros((count, 3))
+        slots = np.empty(count, dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", slots)
+        uv_centres = None
+        for slot, material in enumerate(mesh.materials):
+            if material is None:
+                continue
+            in_slot = slots == slot
+            if material.get(ATLAS_UV_TABLE_PROP) is None:
+                emitter = self.clustering.emitter_for_texture(material.name)
+                if emitter is not None:
+                    levels[in_slot] = emitter.level
+                    colors[in_slot] = emitter.color
+                continue
+            rects = self._atlas_rects(material)
+            if not rects or mesh.uv_layers.active is None:
+                continue
+            if uv_centres is None:
+                uv_centres = self._uv_centres(mesh)
+            u, v = uv_centres[:, 0], uv_centres[:, 1]
+            for u0, v0, u1, v1, emitter in rects:
+                hit = in_slot & (u >= u0) & (u <= u1) & (v >= v0) & (v <= v1)
+                levels[hit] = emitter.level
+                colors[hit] = emitter.color
+        return levels, colors
+
+    def _uv_centres(self, mesh):
+        np = self.clustering.np
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        starts = np.empty(len(mesh.polygons), dtype=np.int32)
+        totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", starts)
+        mesh.polygons.foreach_get("loop_total", totals)
+        return np.add.reduceat(uvs.reshape(-1, 2), starts, axis=0) / totals[:, None]
+
+    def _add(self, obj, points, weights, colors) -> None:
+        np = self.clustering.np
+        matrix = np.array(obj.matrix_world)
+        self.points.append(points @ matrix[:3, :3].T + matrix[:3, 3])
+        self.weights.append(weights)
+        self.colors.append(colors)
+
+    def add_faces(self, obj) -> None:
+        np = self.clustering.np
+        mesh = obj.data
+        if not len(mesh.polygons) or not mesh.materials:
+            return
+        levels, colors = self.face_emitters(mesh)
+        emissive = levels > 0
+        if not emissive.any():
+            return
+        centres = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+        areas = np.empty(len(mesh.polygons), dtype=np.float32)
+        mesh.polygons.foreach_get("center", centres)
+        mesh.polygons.foreach_get("area", areas)
+        # Greedy meshing merges runs of equal faces, so area counts them.
+        weights = levels[emissive] / 15.0 * areas[emissive]
+        self._add(obj, centres.reshape(-1, 3)[emissive], weights, colors[emissive])
+
+    def _prototype_emitters(self, obj):
+        """Return ``(levels, colors)`` per prototype index of ``obj``'s instancing modifier, or ``None``."""
+        np = self.clustering.np
+        for modifier in obj.modifiers:
+            group = getattr(modifier, "node_group", None)
+            name = group.get(PROTOTYPES_PROP) if group is not None else None
+            if name is None:
+                continue
+            if name not in self._prototypes:
+                collection = bpy.data.collections.get(name)
+                # Prototypes are named with zero-padded indices, so name order is index order.
+                prototypes = sorted(collection.objects, key=lambda o: o.name) if collection is not None else []
+                levels = np.zeros(len(prototypes))
+                colors = np.zeros((len(prototypes), 3))
+                for i, prototype in enumerate(prototypes):
+                    if prototype.type != 'MESH' or not len(prototype.data.polygons):
+                        continue
+                    face_levels, face_colors = self.face_emitters(prototype.data)
+                    brightest = int(np.argmax(face_levels))
+                    levels[i] = face_levels[brightest]
+                    colors[i] = face_colors[brightest]
+                self._prototypes[name] = (levels, colors)
+            return self._prototypes[name]
+        return None
+
+    def add_instances(self, obj) -> None:
+        np = self.clustering.np
+        mesh = obj.data
+        attribute = mesh.attributes.get(MODEL_ATTRIBUTE)
+        prototypes = self._prototype_emitters(obj)
+        if attribute is None or prototypes is None or not len(prototypes[0]) or not len(mesh.vertices):
+            return
+        levels, colors = prototypes
+        models = np.empty(len(mesh.vertices), dtype=np.int32)
+        attribute.data.foreach_get("value", models)
+        known = (models >= 0) & (models < len(levels))
+        models = np.where(known, models, 0)
+        emissive = known & (levels[models] > 0)
+        if not emissive.any():
+            return
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        models = models[emissive]
+        self._add(obj, co.reshape(-1, 3)[emissive], levels[models] / 15.0 * MODEL_FACES, colors[models])
+
+    def scan(self, collection) -> None:
+        """Add the emitters of every chunk and instance object under ``collection``."""
+        for obj in collection.all_objects:
+            if obj.type != 'MESH' or obj.get(PLACEHOLDER_PROP):
+                continue
+            if obj.data.attributes.get(MODEL_ATTRIBUTE) is not None:
+                self.add_instances(obj)
+            else:
+                self.add_faces(obj)
+
+    def arrays(self):
+        np = self.clustering.np
+        if not self.points:
+            return np.zeros((0, 3)), np.zeros(0), np.zeros((0, 3))
+        return np.concatenate(self.points), np.concatenate(self.weights), np.concatenate(self.colors)
 
 
 class LBFF_OT_gaffer_create_lighting(bpy.types.Operator):
-    """Creates a standard lighting setup"""
+    """Create a 3-point rig, or light the emissive blocks of imported Minecraft worlds"""
     bl_idname = "lbff.gaffer_create_lighting"
-    bl_label = "Create 3-Point Lighting"
+    bl_label = "Create Lighting"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: EnumProperty(
+        name="Mode",
+        items=[
+            ('THREE_POINT', "3-Point", "Key, fill and rim area lights around the active object or 3D cursor"),
+            ('EMISSIVE', "Emissive Blocks", "Cluster the glowing blocks of imported Minecraft worlds into lights"),
+        ],
+        default='THREE_POINT',
+    )
+    max_lights: IntProperty(
+        name="Max Lights",
+        description="Upper bound on the lights created per world",
+        default=64,
+        min=1,
+        soft_max=512,
+    )
+    method: EnumProperty(
+        name="Clustering",
+        items=[
+            ('KMEANS', "K-Means", "Tighter clusters; slower on very large worlds"),
+            ('OCTREE', "Octree", "Split space around the brightest areas; faster"),
+        ],
+        default='KMEANS',
+    )
+    light_type: EnumProperty(
+        name="Light Type",
+        items=[
+            ('POINT', "Point", "Point lights sized to their cluster"),
+            ('AREA', "Area", "Disk area lights sized to their cluster"),
+        ],
+        default='POINT',
+    )
+    watts: FloatProperty(
+        name="Watts per Face",
+        description="Power of one fully bright (light level 15) emissive block face",
+        default=20.0,
+        min=0.0,
+        soft_max=500.0,
+    )
 
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "mode")
+        if self.mode == 'EMISSIVE':
+            layout.prop(self, "max_lights")
+            layout.prop(self, "method")
+            layout.prop(self, "light_type")
+            layout.prop(self, "watts")
+
+    @profiled
     def execute(self, context):
-        print("Creating lighting setup...")
-        # TODO: Add lighting creation logic here
+        if self.mode == 'THREE_POINT':
+            with stage("lights", len(_RIG)):
+                _three_point(context)
+            self.report({'INFO'}, "Created 3-point lighting")
+            return {'FINISHED'}
+
+        worlds = [c for c in context.scene.collection.children if c.get(WORLD_PROP)]
+        if not worlds:
+            self.report({'ERROR'}, "No imported Minecraft world in the scene")
+            return {'CANCELLED'}
+        emitters = lights = 0
+        for world in worlds:
+            with stage("scan") as timed:
+                scan = _EmitterScan()
+                scan.scan(world)
+                points, weights, colors = scan.arrays()
+                timed.items = len(points)
+            with stage("cluster", len(points)):
+                clusters = scan.clustering.cluster_emitters(points, weights, colors, self.max_lights, self.method)
+            with stage("bpy_write", len(clusters.weights)):
+                self._build(world, clusters)
+            emitters += len(points)
+            lights += len(clusters.weights)
+        self.report({'INFO'}, f"Created {lights} lights for {emitters} emissive faces and models")
         return {'FINISHED'}
 
+    def _build(self, world, clusters) -> None:
+        collection = _gaffer_collection(world, f"{world.name} Emissive Lights", 'EMISSIVE')
+        for i, (position, weight, color, radius) in enumerate(
+                zip(clusters.positions, clusters.weights, clusters.colors, clusters.radii)):
+            light = _add_light(collection, f"LBFF Emissive {i:03d}", self.light_type, tuple(position),
+                               float(weight) * self.watts, tuple(color))
+            if self.light_type == 'AREA':
+                light.data.shape = 'DISK'
+                light.data.size = max(2.0 * float(radius), 0.5)
+            else:
+                # Soft shadows from the cluster's extent, capped so large clusters stay defined.
+                light.data.shadow_soft_size = min(float(radius), 4.0)
+
 
 classes = [LBFF_OT_gaffer_create_lighting]
@@ -0,0 +1,46 @@
+"""Profiling hooks for Gaffer operators.
+
+The stage profiler ships with the Minecraft importer
+(``lbff_minecraft_importer.core.profiling``). Gaffer records into it only
+when that module is already loaded, looking it up in ``sys.modules`` at
+call time, so enabling Gaffer never imports the importer. Without it these
+hooks do nothing.
+"""
+
+import functools
+import sys
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+_PROFILING_MODULES = tuple(
+    f"{package}lbff_minecraft_importer.core.profiling"
+    for package in ("", f"{__package__.rsplit('.', 1)[0]}.")
+)
+
+
+def _profiling():
+    for name in _PROFILING_MODULES:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+    return None
+
+
+def stage(name: str, items: int = 0):
+    """Time stage ``name`` like ``core.profiling.stage``, or do nothing without the importer."""
+    profiling = _profiling()
+    if profiling is None:
+        return nullcontext(SimpleNamespace(items=items))
+    return profiling.stage(name, items)
+
+
+def profiled(execute):
+    """Record each call of an operator's ``execute`` as one profiler run, like ``core.profiling.profiled``."""
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        profiling = _profiling()
+        if profiling is None:
+            return execute(self, context)
+        with profiling.PROFILER.run(self.bl_idname):
+            return execute(self, context)
+    return wrapper
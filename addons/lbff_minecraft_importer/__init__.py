@@ -1,10 +1,13 @@
 
 """Minecraft importer addon wiring for LBFF.
 
-This module exposes the addon metadata and registers the importer operator
-and its submenu. It follows the LBFF pattern: try to append to the global
+This module exposes the addon metadata and registers the importer settings,
+operators and submenu. It follows the LBFF pattern: try to append to the global
 `LBFF_MT_main_menu` if present, otherwise provide a small main menu so the
 sub-menu can be accessed.
+
+The parsing and meshing live in the bpy-free :mod:`.core` package, which
+stays importable when ``bpy`` is not.
 """
 
 bl_info = {
@@ -13,61 +16,125 @@ bl_info = {
     "version": (1, 0),
     "blender": (3, 0, 0),
     "location": "View3D > Topbar > LBFF",
-    "description": "Imports Minecraft textures and creates materials.",
+    "description": "Imports Minecraft textures, materials and worlds.",
     "warning": "",
     "doc_url": "",
     "category": "Import-Export",
 }
 
-import bpy
-
-# Import implementation modules
-from .operators import LBFF_OT_import_minecraft_texture
-from .menus import LBFF_MT_minecraft_importer_menu
-
-
-# The main menu is provided by lbff_all_in_one or created lazily by other addons.
-class LBFF_MT_main_menu(bpy.types.Menu):
-    bl_label = "LBFF"
-    bl_idname = "LBFF_MT_main_menu"
+import time
+
+_import_start = time.perf_counter_ns()
+
+try:
+    import bpy
+except ImportError:
+    # Outside Blender only the bpy-free ``core`` package is usable (the
+    # tests and the ``python -m lbff_minecraft_importer.core`` CLI).
+    bpy = None
+
+if bpy is not None:
+    # Import implementation modules
+    from .properties import LBFF_PG_minecraft_area, LBFF_PG_minecraft_importer_settings, profiling_property
+    from .operators import (
+        LBFF_OT_add_minecraft_area,
+        LBFF_OT_clear_profile,
+        LBFF_OT_export_profile,
+        LBFF_OT_import_minecraft_block_textures,
+        LBFF_OT_import_minecraft_texture,
+        LBFF_OT_import_minecraft_world,
+    )
+    from .menus import LBFF_MT_minecraft_importer_menu
+    from .panels import LBFF_PT_profiler
+
+    classes = [
+        LBFF_PG_minecraft_area,
+        LBFF_PG_minecraft_importer_settings,
+        LBFF_OT_import_minecraft_texture,
+        LBFF_OT_import_minecraft_block_textures,
+        LBFF_OT_import_minecraft_world,
+        LBFF_OT_add_minecraft_area,
+        LBFF_OT_export_profile,
+        LBFF_OT_clear_profile,
+        LBFF_MT_minecraft_importer_menu,
+        LBFF_PT_profiler,
+    ]
+
+# Nanoseconds per phase, collected by lbff_all_in_one's timing report.
+timings = {"import": time.perf_counter_ns() - _import_start}
+
+
+def _menu_draw(self, context):
+    self.layout.menu(LBFF_MT_minecraft_importer_menu.bl_idname)
 
-    def draw(self, context):
-        layout = self.layout
-        layout.menu(LBFF_MT_minecraft_importer_menu.bl_idname)
 
+def register():
+    start = time.perf_counter_ns()
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.lbff_minecraft = bpy.props.PointerProperty(type=LBFF_PG_minecraft_importer_settings)
+    bpy.types.WindowManager.lbff_profiling = profiling_property()
+    wired = time.perf_counter_ns()
+    timings["register_classes"] = wired - start
 
-def _draw_main_menu(self, context):
-    self.layout.menu(LBFF_MT_main_menu.bl_idname)
-
+    # Append to the main LBFF menu if lbff_all_in_one (or another LBFF addon)
+    # registered it, storing the draw function so unregister removes the same callable.
+    try:
+        main_menu = bpy.types.LBFF_MT_main_menu
+        LBFF_MT_minecraft_importer_menu._menu_draw = _menu_draw
+        main_menu.append(_menu_draw)
+    except AttributeError:
+        # Main menu not registered yet, create it here and append to TOPBAR
+        class LBFF_MT_main_menu(bpy.types.Menu):
+            bl_label = "LBFF"
+            bl_idname = "LBFF_MT_main_menu"
 
-classes = [
-    LBFF_OT_import_minecraft_texture,
-    LBFF_MT_minecraft_importer_menu,
-    LBFF_MT_main_menu,
-]
+            def draw(self, context):
+                layout = self.layout
+                layout.menu(LBFF_MT_minecraft_importer_menu.bl_idname)
 
+        bpy.utils.register_class(LBFF_MT_main_menu)
 
-def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+        def draw_main_menu(self, context):
+            self.layout.menu(LBFF_MT_main_menu.bl_idname)
 
-    # Append the main LBFF menu to TOPBAR and store the draw function on the class
-    draw_fn = _draw_main_menu
-    LBFF_MT_main_menu._draw_fn = draw_fn
-    bpy.types.TOPBAR_MT_editor_menus.append(draw_fn)
+        bpy.types.TOPBAR_MT_editor_menus.append(draw_main_menu)
+        LBFF_MT_minecraft_importer_menu._draw_main_menu = draw_main_menu
+    timings["register_menus"] = time.perf_counter_ns() - wired
 
 
 def unregister():
-    # Remove draw callback if stored
-    if hasattr(LBFF_MT_main_menu, "_draw_fn"):
+    start = time.perf_counter_ns()
+    # Try to remove from the main menu
+    try:
+        main_menu = bpy.types.LBFF_MT_main_menu
+        if hasattr(LBFF_MT_minecraft_importer_menu, '_menu_draw'):
+            main_menu.remove(LBFF_MT_minecraft_importer_menu._menu_draw)
+            del LBFF_MT_minecraft_importer_menu._menu_draw
+    except (AttributeError, RuntimeError):
+        pass
+
+    if hasattr(LBFF_MT_minecraft_importer_menu, '_draw_main_menu'):
         try:
-            bpy.types.TOPBAR_MT_editor_menus.remove(LBFF_MT_main_menu._draw_fn)
+            bpy.types.TOPBAR_MT_editor_menus.remove(LBFF_MT_minecraft_importer_menu._draw_main_menu)
         except (ValueError, AttributeError):
             pass
-        del LBFF_MT_main_menu._draw_fn
+        del LBFF_MT_minecraft_importer_menu._draw_main_menu
+        try:
+            bpy.utils.unregister_class(bpy.types.LBFF_MT_main_menu)
+        except (AttributeError, RuntimeError):
+            pass
+
+    unwired = time.perf_counter_ns()
+    timings["unregister_menus"] = unwired - start
+    if hasattr(bpy.types.WindowManager, "lbff_profiling"):
+        del bpy.types.WindowManager.lbff_profiling
+    if hasattr(bpy.types.Scene, "lbff_minecraft"):
+        del bpy.types.Scene.lbff_minecraft
 
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    timings["unregister_classes"] = time.perf_counter_ns() - unwired
 
 
 if __name__ == "__main__":
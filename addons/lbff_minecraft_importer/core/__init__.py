@@ -0,0 +1,9 @@
+"""Blender-independent core of the LBFF Minecraft importer.
+
+Pack reading, NBT and region decoding, palette unpacking, model baking,
+meshing and atlas packing live here and never import ``bpy``, so they run
+under plain Python: in the tests, and in the headless conversion CLI
+(``python -m lbff_minecraft_importer.core``, see :mod:`.convert`) that
+pre-bakes worlds into mesh artifacts on machines without Blender. The addon
+modules one level up are the thin ``bpy`` layer on top.
+"""
@@ -0,0 +1,7 @@
+"""Entry point for ``python -m lbff_minecraft_importer.core``."""
+
+import sys
+
+from .convert import main
+
+sys.exit(main())
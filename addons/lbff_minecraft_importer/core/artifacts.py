@@ -0,0 +1,185 @@
+"""Memory-mappable chunk mesh artifacts.
+
+The world importer writes one artifact per meshed chunk into the shared
+cache (:func:`default_artifact_dir`) and the conversion CLI
+(:mod:`.convert`) writes the same files ahead of time; later imports load
+them instead of decoding NBT and meshing again. An artifact holds the
+chunk's :class:`.mesher.MeshData` buffers (always meshed without an atlas;
+see :func:`.mesher.atlas_mesh`), its instance placements, its biome grid
+and the header timestamp and content digest the importer's manifest
+needs. Texture and prototype indices are local to the process that meshed
+the chunk, so the artifact names them, along with the tint kinds of its
+textures (see :mod:`.biomes`).
+
+Artifacts live under ``<root>/<key>/r.<rx>.<rz>/c.<x>.<z>.lbm`` where
+``key`` is :func:`mesh_cache_key`, so a different pack stack, mesher
+version or meshing flag simply looks in another folder. A file is a small
+prefix and JSON header followed by the raw arrays, each aligned to
+:data:`ALIGNMENT` bytes, so :func:`load_artifact` maps the file and hands
+out read-only array views that ``foreach_set`` consumes without copying.
+
+This module does not import ``bpy``.
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .biomes import TintKind
+from .cache import PathLike, default_cache_dir
+from .manifest import settings_key
+from .mesher import MESHER_VERSION, BlockTable, InstancePoints, MeshData
+
+ARTIFACT_VERSION = 3
+ALIGNMENT = 64
+
+_MAGIC = b"LBFFMESH"
+_PREFIX = struct.Struct("<8sII")  # magic, version, header length
+_MESH_ARRAYS = ("vertices", "loops", "loop_starts", "uvs", "material_indices", "face_textures", "face_blocks")
+_POINT_ARRAYS = ("positions", "rotations", "prototypes")
+
+
+class ChunkArtifact(NamedTuple):
+    """One meshed chunk as stored on disk.
+
+    ``mesh.face_textures`` index ``textures`` and ``points.prototypes``
+    index ``prototypes``, the model names of the instanced prototypes the
+    chunk uses. ``tints`` holds the tint kinds of the tinted textures among
+    both. ``biome_grid`` (see :func:`.biomes.chunk_biomes`) indexes
+    ``biomes`` and starts at section ``low``.
+    """
+
+    x: int
+    z: int
+    timestamp: int
+    digest: str
+    mesh: MeshData
+    points: InstancePoints
+    prototypes: List[str]
+    textures: List[str]
+    tints: Dict[str, TintKind]
+    low: int
+    biomes: List[str]
+    biome_grid: np.ndarray
+
+
+def default_artifact_dir() -> Path:
+    return default_cache_dir() / "meshes"
+
+
+def mesh_cache_key(fingerprint: str, greedy: bool, instance: bool) -> str:
+    """Return the folder key for artifacts meshed from a pack stack with these flags."""
+    return settings_key("artifacts", ARTIFACT_VERSION, fingerprint, MESHER_VERSION, greedy, instance)
+
+
+def artifact_folder(root: PathLike, key: str) -> Path:
+    return Path(root) / key
+
+
+def artifact_path(folder: PathLike, x: int, z: int) -> Path:
+    return Path(folder) / f"r.{x >> 5}.{z >> 5}" / f"c.{x}.{z}.lbm"
+
+
+def chunk_artifact(x: int, z: int, timestamp: int, digest: str, mesh: MeshData, points: InstancePoints,
+                   table: BlockTable, low: int, biomes: Tuple[List[str], np.ndarray]) -> ChunkArtifact:
+    """Bundle a meshed chunk, renumbering texture and prototype ids to the ones it uses.
+
+    ``biomes`` is the chunk's :func:`.biomes.chunk_biomes` result.
+    """
+    used, local = np.unique(mesh.face_textures, return_inverse=True)
+    textures = [table.texture_names[i] for i in used.tolist()]
+    mesh = mesh._replace(face_textures=local.reshape(-1).astype(np.int32))
+    used, local = np.unique(points.prototypes, return_inverse=True)
+    names = list(table.prototypes)
+    prototypes = [names[i] for i in used.tolist()]
+    points = points._replace(prototypes=local.reshape(-1).astype(np.int32))
+    drawn = set(textures).union(*(table.prototype_models[table.prototypes[n]].textures for n in prototypes))
+    tints = {name: kind for name, kind in table.texture_tints.items() if name in drawn}
+    return ChunkArtifact(x, z, timestamp, digest, mesh, points, prototypes, textures, tints, low, *biomes)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_artifact(folder: PathLike, artifact: ChunkArtifact) -> bool:
+    """Write ``artifact`` to ``folder``, replacing any previous version atomically.
+
+    Returns whether the file was written; failures are reported, not raised.
+    """
+    arrays = [(name, np.ascontiguousarray(getattr(artifact.mesh, name))) for name in _MESH_ARRAYS]
+    arrays += [(name, np.ascontiguousarray(getattr(artifact.points, name))) for name in _POINT_ARRAYS]
+    arrays.append(("biome_grid", np.ascontiguousarray(artifact.biome_grid)))
+    layout = {}
+    offset = 0
+    for name, array in arrays:
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({
+        "x": artifact.x,
+        "z": artifact.z,
+        "timestamp": artifact.timestamp,
+        "digest": artifact.digest,
+        "materials": artifact.mesh.materials,
+        "prototypes": artifact.prototypes,
+        "textures": artifact.textures,
+        "tints": artifact.tints,
+        "low": artifact.low,
+        "biomes": artifact.biomes,
+        "arrays": layout,
+    }, separators=(",", ":")).encode("utf-8")
+    start = _aligned(_PREFIX.size + len(header))
+
+    path = artifact_path(folder, artifact.x, artifact.z)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as fh:
+            fh.write(_PREFIX.pack(_MAGIC, ARTIFACT_VERSION, len(header)))
+            fh.write(header)
+            for name, array in arrays:
+                fh.seek(start + layout[name][2])
+                fh.write(array.tobytes())
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[LBFF Minecraft Importer] Could not write mesh artifact {path}: {e}")
+        return False
+    return True
+
+
+def load_artifact(folder: PathLike, x: int, z: int, timestamp: Optional[int] = None) -> Optional[ChunkArtifact]:
+    """Return the artifact of chunk ``(x, z)``, or ``None`` if missing or unreadable.
+
+    With ``timestamp``, an artifact from another version of the chunk is
+    also ``None``; only its header is read in that case. The returned
+    arrays are read-only views of the mapped file.
+    """
+    try:
+        with open(artifact_path(folder, x, z), "rb") as fh:
+            magic, version, size = _PREFIX.unpack(fh.read(_PREFIX.size))
+            if magic != _MAGIC or version != ARTIFACT_VERSION:
+                return None
+            header = json.loads(fh.read(size))
+            if timestamp is not None and header["timestamp"] != timestamp:
+                return None
+            buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        start = _aligned(_PREFIX.size + size)
+        arrays = {}
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            count = int(np.prod(shape))
+            if count:
+                arrays[name] = np.frombuffer(buffer, dtype, count, start + offset).reshape(shape)
+            else:
+                arrays[name] = np.zeros(shape, dtype)
+        mesh = MeshData(materials=header["materials"], **{name: arrays[name] for name in _MESH_ARRAYS})
+        points = InstancePoints(**{name: arrays[name] for name in _POINT_ARRAYS})
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+    return ChunkArtifact(header["x"], header["z"], header["timestamp"], header["digest"], mesh, points,
+                         header["prototypes"], header["textures"], header["tints"], header["low"],
+                         header["biomes"], arrays["biome_grid"])
@@ -0,0 +1,240 @@
+"""Texture atlas packing for the LBFF Minecraft importer.
+
+Packs block textures into one or a few power-of-two atlas pages so a whole
+world can render with one material per page instead of one per texture.
+The layout is deterministic for a given set of texture names and sizes, and
+the packed pages are cached on disk (``.npy`` per page plus a JSON layout)
+under a key built from the pack-stack fingerprint, so re-imports skip both
+PNG decoding and repacking.
+
+The mesh stage uses :meth:`AtlasLayout.uv_table` and :func:`remap_uvs` to
+rewrite per-face UVs into atlas space.
+
+This module does not import ``bpy``.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import PathLike, read_json, write_json_atomic
+
+# Bump when the packing algorithm or cache layout changes.
+ATLAS_VERSION = 1
+
+
+class AtlasRect(NamedTuple):
+    """Placement of one texture: page index and pixel rect (top-left origin)."""
+
+    page: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class AtlasLayout:
+    """Page sizes and texture placements of a packed atlas."""
+
+    def __init__(self, pages: Sequence[Tuple[int, int]], rects: Mapping[str, AtlasRect], padding: int = 0):
+        self.pages = [tuple(p) for p in pages]
+        self.rects = dict(rects)
+        self.padding = padding
+
+    def uv_rect(self, name: str) -> Tuple[int, float, float, float, float]:
+        """Return ``(page, u0, v0, u1, v1)`` for ``name`` in Blender UV space.
+
+        Blender's V axis points up, so ``v0`` is the bottom edge.
+        """
+        rect = self.rects[name]
+        width, height = self.pages[rect.page]
+        return (
+            rect.page,
+            rect.x / width,
+            1.0 - (rect.y + rect.height) / height,
+            (rect.x + rect.width) / width,
+            1.0 - rect.y / height,
+        )
+
+    def uv_table(self) -> Dict[str, Tuple[int, float, float, float, float]]:
+        """Return :meth:`uv_rect` for every texture."""
+        return {name: self.uv_rect(name) for name in self.rects}
+
+    def to_json(self) -> dict:
+        return {
+            "version": ATLAS_VERSION,
+            "pages": [list(p) for p in self.pages],
+            "padding": self.padding,
+            "rects": {name: list(rect) for name, rect in self.rects.items()},
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict) -> "AtlasLayout":
+        rects = {name: AtlasRect(*fields) for name, fields in payload["rects"].items()}
+        return cls(payload["pages"], rects, payload.get("padding", 0))
+
+
+def _next_pow2(value: int) -> int:
+    return 1 << max(0, int(value) - 1).bit_length()
+
+
+def _shelf_pack(items, width: int, height: int):
+    """Place ``items`` on shelves; return ``(placed, rest)``.
+
+    ``items`` must be sorted tallest first so each shelf's height is set by
+    its first texture.
+    """
+    placed = {}
+    x = y = shelf = 0
+    for i, (name, (w, h)) in enumerate(items):
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        if y + h > height:
+            return placed, items[i:]
+        placed[name] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return placed, []
+
+
+def _page_sizes(min_side: int, max_size: int) -> Iterable[Tuple[int, int]]:
+    """Yield power-of-two page sizes in increasing area, wide before tall."""
+    side = min_side
+    while side <= max_size:
+        yield side, side
+        if side * 2 <= max_size:
+            yield side * 2, side
+        side *= 2
+
+
+def pack_layout(sizes: Mapping[str, Tuple[int, int]], max_size: int = 4096, padding: int = 0) -> AtlasLayout:
+    """Pack textures of the given ``(width, height)`` sizes into atlas pages.
+
+    Textures are sorted by height, width and name, so the same inputs always
+    produce the same layout. Each page is the smallest power-of-two size that
+    holds the remaining textures, up to ``max_size``; overflow spills onto
+    further pages. ``padding`` pixels are reserved around every texture.
+
+    Raises:
+        ValueError: if a single texture does not fit in ``max_size``.
+    """
+    # Pages are powers of two; round a non power-of-two limit down.
+    max_size = 1 << (int(max_size).bit_length() - 1)
+    items = sorted(
+        ((name, (w + 2 * padding, h + 2 * padding)) for name, (w, h) in sizes.items()),
+        key=lambda item: (-item[1][1], -item[1][0], item[0]),
+    )
+    for name, (w, h) in items:
+        if w > max_size or h > max_size:
+            raise ValueError(f"texture {name!r} ({w}x{h} padded) exceeds atlas size {max_size}")
+
+    pages: List[Tuple[int, int]] = []
+    rects: Dict[str, AtlasRect] = {}
+    while items:
+        area = sum(w * h for _, (w, h) in items)
+        min_side = _next_pow2(max(max(w for _, (w, _) in items), max(h for _, (_, h) in items), int(area ** 0.5)))
+        for page_w, page_h in _page_sizes(min(min_side, max_size), max_size):
+            placed, rest = _shelf_pack(items, page_w, page_h)
+            if not rest:
+                break
+        page = len(pages)
+        pages.append((page_w, page_h))
+        for name, (x, y, w, h) in placed.items():
+            rects[name] = AtlasRect(page, x + padding, y + padding, w - 2 * padding, h - 2 * padding)
+        items = rest
+    return AtlasLayout(pages, rects, padding)
+
+
+def blit_pages(layout: AtlasLayout, images: Mapping[str, np.ndarray]) -> List[np.ndarray]:
+    """Copy ``images`` (``(h, w, 4)`` uint8, top row first) into atlas pages.
+
+    Each texture is one vectorized slice assignment; padding is filled by
+    replicating edge pixels so filtering and mipmaps don't bleed neighbours.
+    """
+    pages = [np.zeros((h, w, 4), dtype=np.uint8) for w, h in layout.pages]
+    pad = layout.padding
+    for name, rect in layout.rects.items():
+        rgba = images[name]
+        if pad:
+            rgba = np.pad(rgba, ((pad, pad), (pad, pad), (0, 0)), mode="edge")
+        pages[rect.page][rect.y - pad:rect.y + rect.height + pad, rect.x - pad:rect.x + rect.width + pad] = rgba
+    return pages
+
+
+def remap_uvs(uvs: np.ndarray, rects: np.ndarray) -> np.ndarray:
+    """Map per-loop texture-local UVs into atlas space.
+
+    Args:
+        uvs: ``(n, 2)`` UVs in ``[0, 1]`` texture space.
+        rects: ``(n, 4)`` ``(u0, v0, u1, v1)`` atlas rects, one per loop
+            (typically ``table[texture_index_per_loop]``).
+
+    Returns:
+        ``(n, 2)`` float32 atlas UVs.
+    """
+    rects = np.asarray(rects, dtype=np.float32)
+    origin = rects[:, :2]
+    return (origin + np.asarray(uvs, dtype=np.float32) * (rects[:, 2:] - origin)).astype(np.float32, copy=False)
+
+
+def atlas_cache_key(stack_fingerprint: str, names: Iterable[str], max_size: int, padding: int) -> str:
+    """Return the cache key for an atlas of ``names`` from a given pack stack."""
+    digest = hashlib.sha1(f"atlas-v{ATLAS_VERSION}\0{stack_fingerprint}\0{max_size}\0{padding}".encode("utf-8"))
+    for name in sorted(names):
+        digest.update(b"\n" + name.encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+def _cache_dir(cache_dir: PathLike, key: str) -> Path:
+    return Path(cache_dir) / "atlas" / key
+
+
+def load_cached_atlas(cache_dir: PathLike, key: str) -> Optional[Tuple[AtlasLayout, List[np.ndarray]]]:
+    """Return ``(layout, pages)`` for ``key`` or ``None`` if not cached.
+
+    Pages are memory-mapped read-only.
+    """
+    folder = _cache_dir(cache_dir, key)
+    payload = read_json(folder / "layout.json")
+    if not isinstance(payload, dict) or payload.get("version") != ATLAS_VERSION:
+        return None
+    layout = AtlasLayout.from_json(payload)
+    try:
+        pages = [np.load(folder / f"page_{i}.npy", mmap_mode="r") for i in range(len(layout.pages))]
+    except (OSError, ValueError):
+        return None
+    return layout, pages
+
+
+def save_cached_atlas(cache_dir: PathLike, key: str, layout: AtlasLayout, pages: Sequence[np.ndarray]) -> None:
+    """Persist ``layout`` and ``pages`` under ``key``.
+
+    Pages are written before the layout so a partial write is never mistaken
+    for a complete cache entry.
+    """
+    folder = _cache_dir(cache_dir, key)
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        for i, page in enumerate(pages):
+            tmp = folder / f"page_{i}.tmp.npy"
+            np.save(tmp, page)
+            os.replace(tmp, folder / f"page_{i}.npy")
+    except OSError as e:
+        print(f"[LBFF Minecraft Importer] Could not write atlas cache {folder}: {e}")
+        return
+    write_json_atomic(folder / "layout.json", layout.to_json())
+
+
+def build_atlas(images: Mapping[str, np.ndarray], max_size: int = 4096, padding: int = 0):
+    """Pack and blit ``images``; returns ``(layout, pages)``."""
+    layout = pack_layout({name: (a.shape[1], a.shape[0]) for name, a in images.items()}, max_size, padding)
+    return layout, blit_pages(layout, images)
+
+
+def json_uv_table(layout: AtlasLayout) -> str:
+    """Serialize the UV table compactly, e.g. for a custom property."""
+    return json.dumps(layout.uv_table(), separators=(",", ":"))
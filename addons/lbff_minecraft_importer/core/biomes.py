@@ -0,0 +1,317 @@
+"""Biome tints for grass, foliage and water.
+
+Minecraft stores grass, leaves, vines and water textures in grayscale and
+multiplies the faces whose model sets a ``tintindex`` by a colour picked
+per biome: grass and foliage from the ``colormap/grass.png`` and
+``colormap/foliage.png`` lookups by temperature and downfall, water from a
+per-biome table, with hardcoded exceptions (swamps, badlands, dark forest)
+and fixed colours for some blocks (spruce and birch leaves, lily pads).
+
+:class:`BiomeTints` builds one ``(biome, tint kind)`` colour table and
+resolves the tints of a whole chunk mesh with a single gather, keyed by
+each face corner's biome cell and its texture's tint kind. The importer
+writes the result as a face-corner colour attribute, so every texture
+keeps one shared material that multiplies by it instead of one material
+per biome.
+
+This module does not import ``bpy``.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .palette import BIOME_SIDE, SECTION_SIDE, Section
+
+# A tint kind: one of the biome-dependent kinds or a fixed 0xRRGGBB colour.
+TintKind = Union[str, int]
+GRASS = "grass"
+FOLIAGE = "foliage"
+WATER = "water"
+
+COLORMAPS = {GRASS: "minecraft:colormap/grass", FOLIAGE: "minecraft:colormap/foliage"}
+
+# Blocks whose tinted faces follow the biome, or a fixed colour.
+BLOCK_TINTS: Dict[str, TintKind] = {
+    **dict.fromkeys((
+        "minecraft:grass_block", "minecraft:short_grass", "minecraft:grass", "minecraft:tall_grass",
+        "minecraft:fern", "minecraft:large_fern", "minecraft:potted_fern", "minecraft:sugar_cane",
+        "minecraft:bush",
+    ), GRASS),
+    **dict.fromkeys((
+        "minecraft:oak_leaves", "minecraft:jungle_leaves", "minecraft:acacia_leaves",
+        "minecraft:dark_oak_leaves", "minecraft:vine",
+    ), FOLIAGE),
+    **dict.fromkeys(("minecraft:water", "minecraft:water_cauldron", "minecraft:bubble_column"), WATER),
+    "minecraft:spruce_leaves": 0x619961,
+    "minecraft:birch_leaves": 0x80A755,
+    "minecraft:mangrove_leaves": 0x8DB127,
+    "minecraft:lily_pad": 0x208030,
+    "minecraft:attached_melon_stem": 0xE0C71C,
+    "minecraft:attached_pumpkin_stem": 0xE0C71C,
+}
+
+DEFAULT_BIOME = "minecraft:plains"
+
+# (temperature, downfall) of the vanilla biomes.
+BIOME_CLIMATE: Dict[str, Tuple[float, float]] = {
+    **dict.fromkeys(("plains", "sunflower_plains", "beach", "dripstone_caves", "deep_dark"), (0.8, 0.4)),
+    **dict.fromkeys(("snowy_plains", "ice_spikes", "frozen_river", "frozen_ocean"), (0.0, 0.5)),
+    **dict.fromkeys((
+        "desert", "savanna", "savanna_plateau", "windswept_savanna", "badlands", "eroded_badlands",
+        "wooded_badlands", "nether_wastes", "warped_forest", "crimson_forest", "soul_sand_valley",
+        "basalt_deltas",
+    ), (2.0, 0.0)),
+    **dict.fromkeys(("swamp", "mangrove_swamp"), (0.8, 0.9)),
+    **dict.fromkeys(("forest", "flower_forest", "dark_forest", "pale_garden"), (0.7, 0.8)),
+    **dict.fromkeys(("birch_forest", "old_growth_birch_forest"), (0.6, 0.6)),
+    "old_growth_pine_taiga": (0.3, 0.8),
+    **dict.fromkeys(("taiga", "old_growth_spruce_taiga"), (0.25, 0.8)),
+    "snowy_taiga": (-0.5, 0.4),
+    **dict.fromkeys(("windswept_hills", "windswept_gravelly_hills", "windswept_forest", "stony_shore"), (0.2, 0.3)),
+    **dict.fromkeys(("jungle", "bamboo_jungle"), (0.95, 0.9)),
+    "sparse_jungle": (0.95, 0.8),
+    **dict.fromkeys(("meadow", "cherry_grove"), (0.5, 0.8)),
+    "grove": (-0.2, 0.8),
+    "snowy_slopes": (-0.3, 0.9),
+    **dict.fromkeys(("frozen_peaks", "jagged_peaks"), (-0.7, 0.9)),
+    "stony_peaks": (1.0, 0.3),
+    "snowy_beach": (0.05, 0.3),
+    **dict.fromkeys((
+        "river", "ocean", "deep_ocean", "warm_ocean", "lukewarm_ocean", "deep_lukewarm_ocean",
+        "cold_ocean", "deep_cold_ocean", "deep_frozen_ocean", "lush_caves", "the_end", "end_highlands",
+        "end_midlands", "small_end_islands", "end_barrens", "the_void",
+    ), (0.5, 0.5)),
+    "mushroom_fields": (0.9, 1.0),
+}
+
+# Biomes that override the colormaps (swamp grass is noise-based in game;
+# its darker colour is used).
+GRASS_COLORS = {
+    **dict.fromkeys(("swamp", "mangrove_swamp"), 0x6A7039),
+    **dict.fromkeys(("badlands", "eroded_badlands", "wooded_badlands"), 0x90814D),
+    "cherry_grove": 0xB6DB61,
+    "pale_garden": 0x778272,
+}
+FOLIAGE_COLORS = {
+    "swamp": 0x6A7039,
+    "mangrove_swamp": 0x8DB127,
+    **dict.fromkeys(("badlands", "eroded_badlands", "wooded_badlands"), 0x9E814D),
+    "cherry_grove": 0xB6DB61,
+    "pale_garden": 0x878D76,
+}
+WATER_COLORS = {
+    "swamp": 0x617B64,
+    "mangrove_swamp": 0x3A7A6A,
+    "warm_ocean": 0x43D5EE,
+    **dict.fromkeys(("lukewarm_ocean", "deep_lukewarm_ocean"), 0x45ADF2),
+    **dict.fromkeys(("cold_ocean", "deep_cold_ocean"), 0x3D57D6),
+    **dict.fromkeys(("frozen_ocean", "deep_frozen_ocean", "frozen_river"), 0x3938C9),
+    "meadow": 0x0E4ECF,
+    "cherry_grove": 0x5DB7EF,
+    "pale_garden": 0x76889D,
+}
+DEFAULT_WATER = 0x3F76E4
+# Used when a pack has no colormap.
+DEFAULT_GRASS = 0x91BD59
+DEFAULT_FOLIAGE = 0x77AB2F
+
+# Tint kind codes; fixed colours are interned after these. Code 0 is untinted.
+_KIND_CODES = {GRASS: 1, FOLIAGE: 2, WATER: 3}
+
+
+def block_tint(name: str) -> Optional[TintKind]:
+    """Return the tint kind of block ``name``'s tinted faces, or ``None``."""
+    return BLOCK_TINTS.get(name)
+
+
+def _rgb(color: int) -> Tuple[int, int, int]:
+    return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+
+
+def colormap_color(colormap: Optional[np.ndarray], temperature: np.ndarray, downfall: np.ndarray,
+                   default: int) -> np.ndarray:
+    """Look up ``(N, 3)`` uint8 colours in a 256x256 grass or foliage colormap.
+
+    Follows the game: both inputs are clamped to ``[0, 1]``, downfall is
+    scaled by temperature and the pixel at column ``(1 - t) * 255``, row
+    ``(1 - d * t) * 255`` is used. ``default`` fills in without a colormap.
+    """
+    t = np.clip(np.asarray(temperature, dtype=np.float64), 0.0, 1.0)
+    d = np.clip(np.asarray(downfall, dtype=np.float64), 0.0, 1.0) * t
+    if colormap is None or colormap.shape[0] < 256 or colormap.shape[1] < 256:
+        return np.tile(np.array(_rgb(default), dtype=np.uint8), (len(t), 1))
+    columns = ((1.0 - t) * 255.0).astype(np.int64)
+    rows = ((1.0 - d) * 255.0).astype(np.int64)
+    return colormap[rows, columns, :3]
+
+
+def chunk_biomes(sections: Iterable[Section]) -> Tuple[List[str], np.ndarray]:
+    """Stack section biomes into ``(biome names, [y, z, x] grid)``, one entry per 4^3 cell.
+
+    The grid covers the same rows as :func:`.mesher.chunk_states` for the
+    same sections and indexes the returned names; missing sections use
+    :data:`DEFAULT_BIOME`.
+    """
+    sections = list(sections)
+    if not sections:
+        return [], np.zeros((0, BIOME_SIDE, BIOME_SIDE), dtype=np.uint16)
+    names = {DEFAULT_BIOME: 0}
+    low = min(s.y for s in sections)
+    high = max(s.y for s in sections)
+    grid = np.zeros(((high - low + 1) * BIOME_SIDE, BIOME_SIDE, BIOME_SIDE), dtype=np.uint16)
+    for section in sections:
+        ids = np.array([names.setdefault(name, len(names)) for name in section.biome_palette] or [0],
+                       dtype=np.uint16)
+        y0 = (section.y - low) * BIOME_SIDE
+        grid[y0:y0 + BIOME_SIDE] = ids[section.biomes]
+    return list(names), grid
+
+
+def srgb_to_linear(rgb: np.ndarray) -> np.ndarray:
+    """Convert uint8 sRGB colours to linear float32, as colour attributes store them."""
+    c = np.asarray(rgb, dtype=np.float32) / 255.0
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+
+class BiomeTints:
+    """Resolves biome tints for the chunks meshed with one :class:`.mesher.BlockTable`.
+
+    Tint kinds are looked up per texture (``table.texture_tints``), so a
+    texture is tinted wherever a tinted model face uses it. Biome names are
+    interned into ids shared by every chunk of the import.
+
+    Args:
+        table: the block table the meshes' ``face_textures`` refer to.
+        grass, foliage: decoded ``(256, 256, 4)`` colormaps, or ``None`` to
+            use plains colours.
+    """
+
+    def __init__(self, table, grass: Optional[np.ndarray] = None, foliage: Optional[np.ndarray] = None):
+        self.table = table
+        self.grass = grass
+        self.foliage = foliage
+        self.biomes: Dict[str, int] = {}
+        self.biome_names: List[str] = []
+        self.fixed: Dict[int, int] = {}
+        self._codes = np.zeros(0, dtype=np.int32)
+        self._codes_for = None
+        self._colors = None
+        self.biome_id(DEFAULT_BIOME)
+
+    def biome_id(self, name: str) -> int:
+        bid = self.biomes.get(name)
+        if bid is None:
+            bid = self.biomes[name] = len(self.biome_names)
+            self.biome_names.append(name)
+            self._colors = None
+        return bid
+
+    def _kind_code(self, kind: TintKind) -> int:
+        code = _KIND_CODES.get(kind)
+        if code is None:
+            code = self.fixed.get(kind)
+            if code is None:
+                code = self.fixed[kind] = len(_KIND_CODES) + 1 + len(self.fixed)
+                self._colors = None
+        return code
+
+    def texture_codes(self) -> np.ndarray:
+        """Return the tint kind code of every table texture id (0: untinted)."""
+        table = self.table
+        state = (len(table.texture_names), len(table.texture_tints))
+        if state != self._codes_for:
+            codes = np.zeros(len(table.texture_names), dtype=np.int32)
+            for name, kind in table.texture_tints.items():
+                tid = table.textures.get(name)
+                if tid is not None:
+                    codes[tid] = self._kind_code(kind)
+            self._codes, self._codes_for = codes, state
+        return self._codes
+
+    def prototype_codes(self) -> np.ndarray:
+        """Return the tint kind code of every instancing prototype's tinted faces."""
+        codes = self.texture_codes()
+        table = self.table
+        result = np.zeros(len(table.prototype_models), dtype=np.int32)
+        for pid, model in enumerate(table.prototype_models):
+            tinted = [codes[table.textures[t]] for t, tint in zip(model.textures, model.tints.tolist()) if tint >= 0]
+            result[pid] = max(tinted, default=0)
+        return result
+
+    def colors(self) -> np.ndarray:
+        """Return the ``(biomes, kinds, 4)`` linear RGBA table; kind 0 is white."""
+        if self._colors is None:
+            names = [n.rpartition(":")[2] for n in self.biome_names]
+            climate = np.array([BIOME_CLIMATE.get(n, BIOME_CLIMATE["plains"]) for n in names], dtype=np.float64)
+            grass = colormap_color(self.grass, climate[:, 0], climate[:, 1], DEFAULT_GRASS).astype(np.int64)
+            foliage = colormap_color(self.foliage, climate[:, 0], climate[:, 1], DEFAULT_FOLIAGE)
+            for i, name in enumerate(names):
+                if name == "dark_forest":
+                    # Dark forest grass blends the colormap with a fixed dark green.
+                    grass[i] = ((grass[i] & 0xFE) + np.array(_rgb(0x28340A))) >> 1
+                if name in GRASS_COLORS:
+                    grass[i] = _rgb(GRASS_COLORS[name])
+                if name in FOLIAGE_COLORS:
+                    foliage[i] = _rgb(FOLIAGE_COLORS[name])
+            water = np.array([_rgb(WATER_COLORS.get(n, DEFAULT_WATER)) for n in names], dtype=np.uint8)
+            fixed = [np.tile(np.array(_rgb(color), dtype=np.uint8), (len(names), 1)) for color in self.fixed]
+            white = np.full((len(names), 3), 255, dtype=np.uint8)
+            rgb = np.stack([white, grass.astype(np.uint8), foliage, water, *fixed], axis=1)
+            self._colors = np.concatenate(
+                [srgb_to_linear(rgb), np.ones(rgb.shape[:2] + (1,), dtype=np.float32)], axis=2)
+        return self._colors
+
+    def biome_grid(self, names: List[str], grid: np.ndarray) -> np.ndarray:
+        """Map a :func:`chunk_biomes` grid to this import's biome ids."""
+        ids = np.array([self.biome_id(name) for name in names] or [0], dtype=np.int32)
+        return ids[grid]
+
+    def _lookup(self, blocks: np.ndarray, grid: np.ndarray, origin: Tuple[int, int, int],
+                codes: np.ndarray) -> np.ndarray:
+        # blocks (..., 3) Minecraft block coordinates; codes broadcast against blocks[..., 0].
+        cells = (blocks - np.asarray(origin, dtype=np.int64)) // (SECTION_SIDE // BIOME_SIDE)
+        y = np.clip(cells[..., 1], 0, len(grid) - 1)
+        z = np.clip(cells[..., 2], 0, BIOME_SIDE - 1)
+        x = np.clip(cells[..., 0], 0, BIOME_SIDE - 1)
+        return self.colors()[grid[y, z, x], codes]
+
+    def mesh_colors(self, mesh, grid: np.ndarray, origin: Tuple[int, int, int]) -> np.ndarray:
+        """Return ``(L, 4)`` per-loop tints for ``mesh`` (white where untinted).
+
+        Each corner samples the biome of the block it belongs to: halfway
+        towards its face centre and half a block behind the face, so merged
+        quads blend between the biome cells they span.
+        """
+        loops = len(mesh.loops)
+        codes = self.texture_codes()[mesh.face_textures] if len(mesh.face_textures) else np.zeros(0, np.int32)
+        if not codes.any() or not len(grid):
+            return np.ones((loops, 4), dtype=np.float32)
+        blender = mesh.vertices[mesh.loops].reshape(-1, 4, 3).astype(np.float64)
+        corners = np.stack([blender[..., 0], blender[..., 2], -blender[..., 1]], axis=-1)
+        normal = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        normal /= np.maximum(np.linalg.norm(normal, axis=1, keepdims=True), 1e-9)
+        centre = corners.mean(axis=1, keepdims=True)
+        samples = corners + (centre - corners) * 0.5 - 0.5 * normal[:, None, :]
+        blocks = np.floor(samples).astype(np.int64)
+        return self._lookup(blocks, grid, origin, codes[:, None]).reshape(loops, 4)
+
+    def point_colors(self, points, grid: np.ndarray, origin: Tuple[int, int, int]) -> np.ndarray:
+        """Return ``(N, 4)`` tints for instance points, by the prototype they place."""
+        if not len(points.prototypes) or not len(grid):
+            return np.ones((len(points.prototypes), 4), dtype=np.float32)
+        p = points.positions.astype(np.float64)
+        blocks = np.floor(np.stack([p[:, 0], p[:, 2], -p[:, 1]], axis=1)).astype(np.int64)
+        return self._lookup(blocks, grid, origin, self.prototype_codes()[points.prototypes])
+
+    def prototype_mask(self, mesh) -> np.ndarray:
+        """Return ``(L, 4)`` corner colours for a prototype mesh.
+
+        Prototypes are shared by every biome, so their tinted corners get
+        alpha 0 and take the tint of the instancing point instead.
+        """
+        colors = np.ones((len(mesh.loops), 4), dtype=np.float32)
+        if len(mesh.face_textures):
+            tinted = np.repeat(self.texture_codes()[mesh.face_textures] > 0, 4)
+            colors[tinted, 3] = 0.0
+        return colors
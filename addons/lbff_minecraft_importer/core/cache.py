@@ -0,0 +1,50 @@
+"""On-disk cache helpers shared by the LBFF Minecraft importer.
+
+Pack indexes, merged pack-stack indexes and atlases are all persisted under
+:func:`default_cache_dir`. Caches are an optimisation only: unreadable
+entries are treated as misses and write failures are reported but never
+raised.
+
+This module does not import ``bpy``.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+PathLike = Union[str, os.PathLike]
+
+
+def default_cache_dir() -> Path:
+    """Return the directory used for LBFF caches.
+
+    ``LBFF_CACHE_DIR`` overrides the default of ``$XDG_CACHE_HOME/lbff``
+    (``~/.cache/lbff`` when unset).
+    """
+    override = os.environ.get("LBFF_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "lbff"
+
+
+def write_json_atomic(path: Path, payload) -> None:
+    """Write ``payload`` as compact JSON, replacing ``path`` atomically."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[LBFF Minecraft Importer] Could not write cache file {path}: {e}")
+
+
+def read_json(path: Path):
+    """Return the decoded JSON at ``path`` or ``None`` if missing/corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
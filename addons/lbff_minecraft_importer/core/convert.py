@@ -0,0 +1,165 @@
+"""Headless conversion of worlds into chunk mesh artifacts.
+
+Usage::
+
+    python -m lbff_minecraft_importer.core WORLD --packs "pack.zip;client.jar"
+        [--output FOLDER] [--dimension overworld|nether|end]
+        [--box MIN_X MIN_Z MAX_X MAX_Z] [--workers N] [--no-greedy] [--no-instances]
+
+Run with the ``addons`` folder on ``PYTHONPATH``; only NumPy is needed.
+Regions are converted in a process pool, one region per task, and every
+worker meshes its chunks with its own :class:`.mesher.BlockTable`, writing
+one :mod:`.artifacts` file per chunk. Chunks whose artifact already has the
+current header timestamp are skipped, so repeated runs only convert what
+changed. ``--output`` defaults to the shared mesh cache, which the Blender
+importer reads on its own; other folders are picked as "Mesh Artifacts".
+
+This module does not import ``bpy``.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .artifacts import (
+    artifact_folder,
+    chunk_artifact,
+    default_artifact_dir,
+    load_artifact,
+    mesh_cache_key,
+    save_artifact,
+)
+from .biomes import chunk_biomes
+from .cache import PathLike
+from .manifest import chunk_digest
+from .mesher import BlockTable, chunk_states, instance_points, mesh_chunk, model_describer
+from .models import ModelResolver
+from .nbt import NBTError, parse_nbt
+from .palette import CHUNK_SELECT, iter_sections
+from .region import RegionError, RegionFile
+from .resource_pack import PackStack, ResourcePackError, parse_pack_stack
+from .spatial import DIMENSIONS, BoxArea, WorldIndex
+
+
+class ConvertOptions(NamedTuple):
+    """Meshing settings; they select the artifact folder (see :func:`.artifacts.mesh_cache_key`)."""
+
+    greedy: bool = True
+    instance: bool = True
+
+
+class ConvertStats(NamedTuple):
+    written: int
+    unchanged: int
+    failed: List[str]
+
+
+def convert_region(path: str, output: str, packs: Sequence[str], area: Optional[BoxArea],
+                   options: ConvertOptions) -> ConvertStats:
+    """Worker entry point: convert the changed chunks of one region file."""
+    written = unchanged = 0
+    failed = []
+    with PackStack(packs) as stack, RegionFile(path) as region:
+        resolver = ModelResolver(stack)
+        table = BlockTable(model_describer(resolver, instance=options.instance))
+        zs, xs = np.nonzero(WorldIndex.chunk_mask(region, area))
+        for lx, lz in zip(xs.tolist(), zs.tolist()):
+            x, z = region.rx * 32 + lx, region.rz * 32 + lz
+            timestamp = int(region.timestamps[lz, lx])
+            if load_artifact(output, x, z, timestamp) is not None:
+                unchanged += 1
+                continue
+            try:
+                chunk = region.read_chunk(lx, lz)
+                root = parse_nbt(chunk.nbt, CHUNK_SELECT)
+                sections = list(iter_sections(root))
+                low, states = chunk_states(sections, table)
+            except (RegionError, NBTError, ValueError, KeyError) as e:
+                failed.append(f"chunk {x}, {z}: {e}")
+                continue
+            origin = (x * 16, low * 16, z * 16)
+            mesh = mesh_chunk(states, table, origin, options.greedy)
+            points = instance_points(states, table, origin)
+            artifact = chunk_artifact(x, z, timestamp, chunk_digest(chunk.nbt), mesh, points, table, low,
+                                      chunk_biomes(sections))
+            if not save_artifact(output, artifact):
+                failed.append(f"chunk {x}, {z}: artifact not written")
+                continue
+            written += 1
+    return ConvertStats(written, unchanged, failed)
+
+
+def convert_world(world: PathLike, packs: Sequence[str], output: Optional[PathLike] = None,
+                  dimension: str = 'OVERWORLD', area: Optional[BoxArea] = None, workers: Optional[int] = None,
+                  options: ConvertOptions = ConvertOptions(), log=print) -> ConvertStats:
+    """Convert the chunks of ``world`` inside ``area`` into artifacts under ``output``.
+
+    ``output`` defaults to :func:`.artifacts.default_artifact_dir`; files go
+    into its :func:`.artifacts.mesh_cache_key` subfolder. ``workers``
+    defaults to one process per CPU; ``0`` converts serially.
+    """
+    folder = os.path.join(world, DIMENSIONS[dimension])
+    # Opening the stack once here writes its merged index cache before the
+    # workers start, so they only read it.
+    with PackStack(packs) as stack:
+        key = mesh_cache_key(stack.fingerprint, options.greedy, options.instance)
+    output = str(artifact_folder(output or default_artifact_dir(), key))
+    os.makedirs(output, exist_ok=True)
+    paths = [str(p) for p in WorldIndex(folder).region_paths(area)]
+    written = unchanged = 0
+    failed = []
+
+    def collect(path, stats):
+        nonlocal written, unchanged
+        written += stats.written
+        unchanged += stats.unchanged
+        failed.extend(stats.failed)
+        log(f"{os.path.basename(path)}: {stats.written} converted, {stats.unchanged} unchanged")
+
+    if workers == 0:
+        for path in paths:
+            collect(path, convert_region(path, output, packs, area, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            futures = {pool.submit(convert_region, path, output, list(packs), area, options): path
+                       for path in paths}
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+    return ConvertStats(written, unchanged, failed)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m lbff_minecraft_importer.core",
+        description="Convert a Minecraft world into chunk mesh artifacts for the LBFF importer.",
+    )
+    parser.add_argument("world", help="save folder containing level.dat")
+    parser.add_argument("--packs", required=True, help="';'-separated pack stack, highest priority first")
+    parser.add_argument("--output", help="artifact folder (default: the shared mesh cache)")
+    parser.add_argument("--dimension", choices=[d.lower() for d in DIMENSIONS], default="overworld")
+    parser.add_argument("--box", type=int, nargs=4, metavar=("MIN_X", "MIN_Z", "MAX_X", "MAX_Z"),
+                        help="only convert chunks overlapping this block-coordinate box")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU; 0: serial)")
+    parser.add_argument("--no-greedy", dest="greedy", action="store_false", help="do not merge coplanar faces")
+    parser.add_argument("--no-instances", dest="instance", action="store_false",
+                        help="mesh small models into the chunks instead of instancing them")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        stats = convert_world(
+            args.world, parse_pack_stack(args.packs), args.output, args.dimension.upper(),
+            BoxArea(*args.box) if args.box else None, args.workers, ConvertOptions(args.greedy, args.instance),
+        )
+    except (OSError, ResourcePackError, RegionError) as e:
+        print(f"error: {e}")
+        return 1
+    for line in stats.failed:
+        print(f"skipped {line}")
+    print(f"{stats.written} chunks converted, {stats.unchanged} unchanged, {len(stats.failed)} skipped "
+          f"in {time.perf_counter() - start:.2f}s")
+    return 0
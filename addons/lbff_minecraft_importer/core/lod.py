@@ -0,0 +1,207 @@
+"""Coarse level-of-detail meshes for distant chunks.
+
+Far terrain covers a few pixels on screen, so the world importer meshes it
+at reduced detail:
+
+* levels 1 and 2 downsample the chunk by 2x and 4x per axis, replacing each
+  cell with its dominant full-cube block (:func:`dominant_states`) and
+  greedy-meshing the coarse grid with :func:`.mesher.mesh_chunk`;
+* level 3 is a heightfield surface built from the chunk's ``Heightmaps``
+  data (:func:`surface_mesh`): one top quad per column plus the walls
+  between columns of different height.
+
+Both reductions are vectorized over the whole chunk.
+
+This module does not import ``bpy``.
+"""
+
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .mesher import BlockTable, MeshData, _assemble, mesh_chunk
+from .models import FACE_NORMALS, FACES
+from .palette import SECTION_SIDE, unpack_indices
+
+# Downsampling factor per level; the last level is the heightfield surface.
+LOD_FACTORS = (1, 2, 4)
+SURFACE_LOD = len(LOD_FACTORS)
+
+# Ignores plants and torches, which would poke single-block spikes.
+HEIGHTMAP = "MOTION_BLOCKING"
+# Extra NBT paths needed by :func:`surface_mesh`; add to ``CHUNK_SELECT``.
+LOD_SELECT = (f"Heightmaps.{HEIGHTMAP}", "yPos")
+
+_COLUMNS = SECTION_SIDE * SECTION_SIDE
+
+
+def lod_level(distance: float, thresholds: Sequence[float]) -> int:
+    """Return the detail level for a chunk ``distance`` blocks away.
+
+    ``thresholds`` are ascending distances at which each coarser level
+    starts; level 0 is full detail.
+    """
+    return int(np.searchsorted(np.asarray(thresholds, dtype=np.float64), distance, side="right"))
+
+
+# -- downsampling -------------------------------------------------------
+
+def dominant_states(states: np.ndarray, cube: np.ndarray, factor: int) -> np.ndarray:
+    """Reduce a ``[y, z, x]`` state array by ``factor`` along every axis.
+
+    Each ``factor``-sided cell becomes its most common full-cube state, or
+    air (0) when cubes fill less than half of it, which keeps thin walls
+    and floating blocks from swelling into solid cells.
+    """
+    height = -(-states.shape[0] // factor) * factor
+    padded = np.zeros((height,) + states.shape[1:], dtype=states.dtype)
+    padded[:states.shape[0]] = states
+    Y, Z, X = (n // factor for n in padded.shape)
+    cells = (padded.reshape(Y, factor, Z, factor, X, factor)
+             .transpose(0, 2, 4, 1, 3, 5)
+             .reshape(Y * Z * X, factor ** 3))
+    solid = cube[cells]
+    # counts[i, j]: how many solid blocks of cell i equal block j.
+    counts = ((cells[:, :, None] == cells[:, None, :]) & solid[:, None, :]).sum(axis=2)
+    counts[~solid] = 0
+    dominant = cells[np.arange(len(cells)), counts.argmax(axis=1)]
+    dominant[solid.sum(axis=1) * 2 < factor ** 3] = 0
+    return dominant.reshape(Y, Z, X)
+
+
+def downsampled_mesh(states: np.ndarray, table: BlockTable, factor: int,
+                     origin: Tuple[int, int, int] = (0, 0, 0), greedy: bool = True,
+                     atlas: Optional[Mapping[str, Tuple[int, float, float, float, float]]] = None) -> MeshData:
+    """Mesh ``states`` at ``1 / factor`` resolution; arguments as in :func:`.mesher.mesh_chunk`.
+
+    Coarse blocks are ``factor`` blocks wide, so their textures are
+    stretched by the same amount.
+    """
+    cube, _opaque, _faces = table.arrays()
+    data = mesh_chunk(dominant_states(states, cube, factor), table, (0, 0, 0), greedy, atlas)
+    ox, oy, oz = origin
+    return data._replace(
+        vertices=(data.vertices * factor + np.array([ox, -oz, oy], dtype=np.float32)).astype(np.float32),
+        face_blocks=(data.face_blocks * factor + np.array(origin)).astype(np.int32),
+    )
+
+
+# -- heightfield surface -------------------------------------------------
+
+def decode_heightmap(data: np.ndarray) -> np.ndarray:
+    """Unpack a ``Heightmaps`` long array into ``(16, 16)`` ``[z, x]`` values.
+
+    Entries never span two longs, so the entry width follows from the
+    array length (9 bits for 384-block-tall worlds). Values count blocks
+    above the world bottom: ``min_y + value - 1`` is the top block.
+    """
+    per_long = -(-_COLUMNS // len(data))
+    return unpack_indices(data, 64 // per_long, _COLUMNS).astype(np.int32).reshape(SECTION_SIDE, SECTION_SIDE)
+
+
+def surface_heights(root: Mapping[str, Any], states: np.ndarray, low: int, cube: np.ndarray) -> np.ndarray:
+    """Return the ``[z, x]`` Minecraft Y of each column's top block.
+
+    Uses the chunk heightmap when present, otherwise the highest full cube
+    in ``states``. Empty columns are below ``low * 16``.
+    """
+    data = root.get("Heightmaps", {}).get(HEIGHTMAP)
+    if data is not None and len(data):
+        bottom = root.get("yPos", low) * SECTION_SIDE
+        return decode_heightmap(data) + bottom - 1
+    solid = cube[states]
+    top = states.shape[0] - 1 - solid[::-1].argmax(axis=0)
+    return np.where(solid.any(axis=0), top, -1) + low * SECTION_SIDE
+
+
+# Side faces of a column: (face index, z step, x step).
+_SIDES = ((FACES.index("north"), -1, 0), (FACES.index("south"), 1, 0),
+          (FACES.index("west"), 0, -1), (FACES.index("east"), 0, 1))
+
+
+def _column_textures(states: np.ndarray, tops: np.ndarray, cube: np.ndarray,
+                     face_tex: np.ndarray, low: int) -> np.ndarray:
+    """Return ``(16, 16, 6)`` face textures of the highest cube at or below each top."""
+    ys = np.arange(states.shape[0])[:, None, None] + low * SECTION_SIDE
+    solid = cube[states] & (ys <= tops[None])
+    found = solid.any(axis=0)
+    index = states.shape[0] - 1 - solid[::-1].argmax(axis=0)
+    z, x = np.indices(tops.shape)
+    textures = face_tex[states[index, z, x]]
+    textures[~found] = -1
+    return textures
+
+
+def surface_mesh(root: Mapping[str, Any], states: np.ndarray, low: int, table: BlockTable,
+                 origin: Tuple[int, int, int] = (0, 0, 0),
+                 atlas: Optional[Mapping[str, Tuple[int, float, float, float, float]]] = None) -> MeshData:
+    """Mesh a chunk as a heightfield of its surface.
+
+    Args:
+        root: the parsed chunk, including :data:`LOD_SELECT` paths.
+        states, low: from :func:`.mesher.chunk_states`.
+        table: the :class:`.mesher.BlockTable` of ``states``.
+        origin: Minecraft ``(x, 0, z)`` of the chunk's north-west corner.
+        atlas: as in :func:`.mesher.mesh_chunk`.
+
+    Columns are textured with the faces of their highest full cube. Walls
+    on the chunk border reach down to the lowest column, hiding gaps
+    against neighbouring chunks at other detail levels.
+    """
+    cube, _opaque, face_tex = table.arrays()
+    tops = surface_heights(root, states, low, cube)
+    textures = _column_textures(states, tops, cube, face_tex, low)
+    valid = textures[:, :, 0] >= 0
+    if not valid.any():
+        return _assemble([], origin, table.texture_names, atlas)
+    floor = tops[valid].min() - 1
+    z, x = np.nonzero(valid)
+    y = tops[z, x] + 1
+
+    quads = []
+    corners = np.stack([
+        np.stack([x, y, z], axis=1),
+        np.stack([x, y, z + 1], axis=1),
+        np.stack([x + 1, y, z + 1], axis=1),
+        np.stack([x + 1, y, z], axis=1),
+    ], axis=1).astype(np.float32)
+    uvs = np.tile(np.array([(0, 1), (0, 0), (1, 0), (1, 1)], dtype=np.float32), (len(z), 1, 1))
+    quads.append((corners, uvs, textures[z, x, 0], np.stack([x, y - 1, z], axis=1)))
+
+    heights = np.where(valid, tops, floor)
+    padded = np.pad(heights, 1, constant_values=floor)
+    for d, dz, dx in _SIDES:
+        neighbour = padded[1 + dz:1 + dz + SECTION_SIDE, 1 + dx:1 + dx + SECTION_SIDE]
+        wz, wx = np.nonzero(valid & (neighbour < heights))
+        if not len(wz):
+            continue
+        y0 = (neighbour[wz, wx] + 1).astype(np.float32)
+        y1 = (heights[wz, wx] + 1).astype(np.float32)
+        if dz:
+            plane = wz + (dz > 0)
+            a, b = np.stack([wx, plane], axis=1), np.stack([wx + 1, plane], axis=1)
+        else:
+            plane = wx + (dx > 0)
+            a, b = np.stack([plane, wz], axis=1), np.stack([plane, wz + 1], axis=1)
+        # (x, z) footprints to (x, y, z) corners: bottom edge, then top edge.
+        corners = np.stack([
+            np.stack([a[:, 0], y0, a[:, 1]], axis=1),
+            np.stack([b[:, 0], y0, b[:, 1]], axis=1),
+            np.stack([b[:, 0], y1, b[:, 1]], axis=1),
+            np.stack([a[:, 0], y1, a[:, 1]], axis=1),
+        ], axis=1).astype(np.float32)
+        span = y1 - y0
+        zero, one = np.zeros_like(span), np.ones_like(span)
+        uvs = np.stack([np.stack([zero, zero], axis=1), np.stack([one, zero], axis=1),
+                        np.stack([one, span], axis=1), np.stack([zero, span], axis=1)], axis=1)
+        # Keep counter-clockwise winding seen from outside the column.
+        p, q, r = corners[0, 0], corners[0, 1], corners[0, 2]
+        if np.dot(np.cross(q - p, r - p), FACE_NORMALS[d]) < 0:
+            corners = corners[:, ::-1]
+            uvs = uvs[:, ::-1]
+        quads.append((corners, uvs, textures[wz, wx, d], np.stack([wx, heights[wz, wx], wz], axis=1)))
+
+    # Cubes without a texture on some face leave that face out.
+    quads = [tuple(part[tex >= 0] for part in (corners, uvs, tex, cells))
+             for corners, uvs, tex, cells in quads]
+    return _assemble(quads, origin, table.texture_names, atlas)
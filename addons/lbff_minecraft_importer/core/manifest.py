@@ -0,0 +1,113 @@
+"""Chunk manifest for incremental world re-imports.
+
+The manifest records, for every chunk of an imported world, the Anvil
+header timestamp and a digest of its decompressed NBT. A re-import reads
+only region headers at first: chunks whose timestamp matches the manifest
+are never decompressed. Chunks with a new timestamp are decoded and hashed,
+and re-meshed only if the digest changed too; chunks that disappeared from
+the headers are reported as removed. The detail level each chunk was meshed
+at is recorded as well, so chunks that move to another level are rebuilt.
+
+Everything that affects the generated geometry goes into
+:attr:`WorldManifest.settings_key`; a different key invalidates the whole
+manifest.
+
+This module does not import ``bpy``.
+"""
+
+import hashlib
+import json
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+MANIFEST_VERSION = 1
+
+ChunkKey = Tuple[int, int]
+
+
+class ChunkRecord(NamedTuple):
+    """What was imported for one chunk."""
+
+    timestamp: int
+    digest: str
+    lod: int = 0
+
+
+def chunk_digest(nbt: bytes) -> str:
+    """Return the content digest of a chunk's decompressed NBT."""
+    return hashlib.blake2b(nbt, digest_size=16).hexdigest()
+
+
+def settings_key(*parts) -> str:
+    """Combine import settings (pack fingerprint, mesher version, flags...) into a key."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:24]
+
+
+class WorldManifest:
+    """Per-chunk import records plus the settings they were made with.
+
+    Attributes:
+        settings_key: see :func:`settings_key`.
+        chunks: ``(chunk x, chunk z) -> ChunkRecord``.
+        prototypes: instancing prototype model names in index order, so
+            later imports keep existing point clouds valid.
+        prototype_collection: name of the prototype collection, if any.
+    """
+
+    def __init__(self, settings_key: str, chunks: Optional[Dict[ChunkKey, ChunkRecord]] = None,
+                 prototypes: Iterable[str] = (), prototype_collection: str = ""):
+        self.settings_key = settings_key
+        self.chunks: Dict[ChunkKey, ChunkRecord] = dict(chunks or {})
+        self.prototypes: List[str] = list(prototypes)
+        self.prototype_collection = prototype_collection
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": MANIFEST_VERSION,
+            "settings": self.settings_key,
+            "chunks": {f"{x},{z}": list(record) for (x, z), record in self.chunks.items()},
+            "prototypes": self.prototypes,
+            "prototype_collection": self.prototype_collection,
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: Optional[str]) -> Optional["WorldManifest"]:
+        """Parse a manifest; ``None`` for missing, corrupt or outdated data."""
+        try:
+            payload = json.loads(text)
+            if payload.get("version") != MANIFEST_VERSION:
+                return None
+            chunks = {}
+            for key, (timestamp, digest, *lod) in payload["chunks"].items():
+                x, z = key.split(",")
+                chunks[int(x), int(z)] = ChunkRecord(int(timestamp), digest, int(lod[0]) if lod else 0)
+            return cls(payload["settings"], chunks, payload.get("prototypes", ()),
+                       payload.get("prototype_collection", ""))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            return None
+
+    def needs_decode(self, key: ChunkKey, timestamp: int, lod: int = 0) -> bool:
+        """True unless ``key`` was imported with the same header timestamp and level."""
+        record = self.chunks.get(key)
+        return record is None or record.timestamp != timestamp or record.lod != lod
+
+    def needs_mesh(self, key: ChunkKey, digest: str, lod: int = 0) -> bool:
+        """True unless ``key`` was imported with the same content and level."""
+        record = self.chunks.get(key)
+        return record is None or record.digest != digest or record.lod != lod
+
+    def record(self, key: ChunkKey, timestamp: int, digest: str, lod: int = 0) -> None:
+        self.chunks[key] = ChunkRecord(timestamp, digest, lod)
+
+    def removed(self, present: Mapping[ChunkKey, int],
+                within: Optional[Callable[[ChunkKey], bool]] = None) -> Set[ChunkKey]:
+        """Return recorded chunks that are no longer in the region headers.
+
+        ``within`` limits the check to the imported area, so chunks outside
+        a partial import are kept.
+        """
+        gone = set(self.chunks) - set(present)
+        return gone if within is None else {key for key in gone if within(key)}
+
+    def forget(self, keys: Iterable[ChunkKey]) -> None:
+        for key in keys:
+            self.chunks.pop(key, None)
@@ -0,0 +1,616 @@
+"""Greedy chunk mesher for the LBFF Minecraft importer.
+
+Turns decoded chunk sections into quad geometry held in flat NumPy buffers
+ready for ``foreach_set``. Faces between opaque full blocks are culled, and
+coplanar faces sharing a texture are greedy-merged into larger quads whose
+UVs tile the texture. Every step is vectorized over the whole chunk: face
+visibility is a neighbour comparison, row runs come from boundary detection
+and runs are stacked into rectangles with a lexsort, so there is no per-block
+or per-face Python loop.
+
+Blocks are mapped to render data by a :class:`BlockTable`. Full cubes go
+through the greedy path; other blocks emit the quads of their baked model
+(see :mod:`.models`), dropping quads whose cullface touches an opaque
+neighbour.
+
+Coordinates: Minecraft is Y-up, Blender is Z-up. Output vertices are
+Minecraft ``(x, y, z)`` rotated to Blender ``(x, -z, y)``, so south (+Z)
+points along Blender's -Y.
+
+This module does not import ``bpy``.
+"""
+
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .atlas import remap_uvs
+from .biomes import TintKind, block_tint
+from .models import FACE_NORMALS, FACES, BakedModel, ModelError
+from .palette import SECTION_SIDE, Section
+
+# Bump when the generated geometry changes; cached meshes are keyed by it.
+MESHER_VERSION = 2
+
+# Face directions in Minecraft space, indexed as in BlockTable.face_textures.
+DIRECTIONS = FACES
+_NORMALS = {
+    "up": (1, +1), "down": (1, -1),       # (array axis of [y, z, x], sign)
+    "south": (2, +1), "north": (2, -1),
+    "east": (3, +1), "west": (3, -1),
+}
+
+# ``MeshData.materials`` entry naming an atlas page rather than a texture.
+ATLAS_PAGE_PREFIX = "atlas:"
+
+AIR_NAMES = frozenset(("minecraft:air", "minecraft:cave_air", "minecraft:void_air"))
+
+# Name fragments of blocks that are not full cubes, for guessing without models.
+_NON_CUBE_HINTS = (
+    "stairs", "slab", "fence", "wall", "door", "torch", "flower", "rail", "pane", "button",
+    "lever", "sign", "carpet", "short_grass", "tall_grass", "fern", "lantern", "chain", "bars",
+    "sapling", "vine", "water", "lava", "bed", "banner", "head", "skull", "pressure_plate",
+    "candle", "sea_pickle", "kelp", "seagrass", "mushroom", "ladder", "snow", "campfire",
+    "chest", "anvil", "cactus", "bamboo", "dripleaf", "azalea", "pot", "roots", "fungus",
+    "coral", "amethyst_cluster", "bud", "hopper", "cauldron", "lectern", "bell", "grindstone",
+)
+_TRANSPARENT_HINTS = ("glass", "leaves", "ice", "spawner", "slime_block", "honey_block")
+
+
+def block_key(entry: Mapping) -> str:
+    """Return a stable key for a palette entry: ``name[prop=value,...]``."""
+    props = entry.get("Properties")
+    if not props:
+        return entry["Name"]
+    return entry["Name"] + "[" + ",".join(f"{k}={props[k]}" for k in sorted(props)) + "]"
+
+
+class BlockFaces(NamedTuple):
+    """Render data for one block state.
+
+    ``cube`` blocks are greedy-meshed with one texture per ``DIRECTIONS``
+    entry; any other block renders ``model`` if given. ``opaque`` blocks
+    hide their neighbours' faces. Blocks with ``instances`` are not meshed
+    at all but placed as ``(model name, unrotated model, x, y)`` instances
+    (see :func:`instance_points`). ``tinted`` lists the textures drawn by
+    faces with a ``tintindex`` (see :mod:`.biomes`).
+    """
+
+    cube: bool
+    opaque: bool
+    textures: Tuple[Optional[str], ...]
+    model: Optional[BakedModel] = None
+    instances: Tuple[Tuple[str, BakedModel, int, int], ...] = ()
+    tinted: Tuple[str, ...] = ()
+
+
+def guess_block_faces(entry: Mapping) -> BlockFaces:
+    """Fallback block description from the block name alone.
+
+    Full cubes use ``<namespace>:block/<name>`` on every face; names that
+    look like non-cube blocks are not rendered.
+    """
+    name = entry["Name"]
+    if name in AIR_NAMES:
+        return BlockFaces(False, False, (None,) * 6)
+    namespace, _, path = name.rpartition(":")
+    if any(hint in path for hint in _NON_CUBE_HINTS):
+        return BlockFaces(False, False, (None,) * 6)
+    texture = f"{namespace or 'minecraft'}:block/{path}"
+    opaque = not any(hint in path for hint in _TRANSPARENT_HINTS)
+    return BlockFaces(True, opaque, (texture,) * 6)
+
+
+_UNIT_UVS = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float32)
+
+
+def faces_from_model(name: str, model: BakedModel) -> BlockFaces:
+    """Classify a baked model for the mesher.
+
+    A model with a full, culled face on all six sides is opaque (unless its
+    name marks it as see-through). If it is exactly those six faces with
+    unrotated full-texture UVs it is also a greedy-meshable cube.
+    """
+    if not model.textures:
+        return BlockFaces(False, False, (None,) * 6)
+    normals = FACE_NORMALS[np.argmax(model.face_normals() @ FACE_NORMALS.T, axis=1)]
+    directions = np.argmax(normals @ FACE_NORMALS.T, axis=1)
+    lo = model.positions.min(axis=1)
+    hi = model.positions.max(axis=1)
+    full = (
+        np.all(np.abs(lo - np.clip(normals, 0, None)) < 1e-6, axis=1)
+        & np.all(np.abs(hi - (1 + np.clip(normals, None, 0))) < 1e-6, axis=1)
+        & (model.cullfaces == directions)
+    )
+    tinted = tuple(sorted({t for t, tint in zip(model.textures, model.tints.tolist()) if tint >= 0}))
+    covered = set(directions[full].tolist())
+    if len(covered) < 6:
+        return BlockFaces(False, False, (None,) * 6, model, tinted=tinted)
+    opaque = not any(hint in name for hint in _TRANSPARENT_HINTS)
+    unit = np.all(np.abs(model.uvs - _UNIT_UVS) < 1e-6, axis=(1, 2))
+    if len(model.textures) == 6 and full.all() and unit.all():
+        textures = [None] * 6
+        for direction, texture in zip(directions.tolist(), model.textures):
+            textures[direction] = texture
+        return BlockFaces(True, opaque, tuple(textures), tinted=tinted)
+    return BlockFaces(False, opaque, (None,) * 6, model, tinted=tinted)
+
+
+def model_describer(resolver, fallback: Callable[[Mapping], BlockFaces] = guess_block_faces,
+                    instance: bool = False):
+    """Return a :class:`BlockTable` ``describe`` backed by a :class:`.models.ModelResolver`.
+
+    States whose blockstate or models cannot be resolved use ``fallback``.
+    With ``instance``, models that are never culled by their neighbours
+    (torches, plants, lanterns, chains...) are placed as instances of their
+    unrotated parts instead of being copied into the chunk mesh.
+    """
+    def describe(entry: Mapping) -> BlockFaces:
+        name = entry["Name"]
+        if name in AIR_NAMES:
+            return fallback(entry)
+        try:
+            model = resolver.resolve(name, entry.get("Properties") or {}, block_key(entry))
+        except (ModelError, KeyError, TypeError, ValueError) as e:
+            print(f"[LBFF Minecraft Importer] {name}: {e}; guessing its textures")
+            return fallback(entry)
+        faces = faces_from_model(name, model)
+        if instance and faces.model is not None and (faces.model.cullfaces < 0).all():
+            parts = resolver.resolve_parts(name, entry.get("Properties") or {})
+            faces = faces._replace(model=None, instances=tuple(
+                (model_name, resolver.bake_model(model_name), x, y) for model_name, x, y in parts))
+        return faces
+    return describe
+
+
+class BlockTable:
+    """Interns block states and textures into dense integer ids.
+
+    The mesher looks blocks up through NumPy arrays indexed by state id, so
+    the per-state Python work (``describe``) happens once per distinct block
+    state for the whole import, not once per block.
+
+    Args:
+        describe: ``describe(palette_entry) -> BlockFaces``; defaults to
+            :func:`guess_block_faces`. The model resolver supplies a precise
+            one.
+    """
+
+    def __init__(self, describe: Optional[Callable[[Mapping], BlockFaces]] = None):
+        self.describe = describe or guess_block_faces
+        self.states: Dict[str, int] = {}
+        self.entries: List[Mapping] = []
+        self.textures: Dict[str, int] = {}
+        self.texture_names: List[str] = []
+        self._cube: List[bool] = []
+        self._opaque: List[bool] = []
+        self._faces: List[Tuple[int, ...]] = []
+        # Per state: None or (positions, uvs, texture ids, cullfaces) of its model.
+        self.models: List[Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]] = []
+        # Instanced prototypes by model name, and per state None or
+        # (prototype ids (k,), Minecraft x/y rotations in degrees (k, 2)).
+        self.prototypes: Dict[str, int] = {}
+        self.prototype_models: List[BakedModel] = []
+        self.placements: List[Optional[Tuple[np.ndarray, np.ndarray]]] = []
+        # Tint kind of every texture drawn by a tinted face of a tinted block.
+        self.texture_tints: Dict[str, TintKind] = {}
+        self._arrays = None
+        self.state_id({"Name": "minecraft:air"})
+
+    def texture_id(self, name: str) -> int:
+        tid = self.textures.get(name)
+        if tid is None:
+            tid = self.textures[name] = len(self.texture_names)
+            self.texture_names.append(name)
+        return tid
+
+    def state_id(self, entry: Mapping) -> int:
+        key = block_key(entry)
+        sid = self.states.get(key)
+        if sid is None:
+            faces = self.describe(entry)
+            sid = self.states[key] = len(self.entries)
+            self.entries.append(entry)
+            self._cube.append(faces.cube)
+            self._opaque.append(faces.opaque)
+            self._faces.append(tuple(-1 if t is None else self.texture_id(t) for t in faces.textures))
+            model = None
+            if not faces.cube and faces.model is not None and faces.model.textures:
+                m = faces.model
+                tex_ids = np.array([self.texture_id(t) for t in m.textures], dtype=np.int32)
+                model = (m.positions, m.uvs, tex_ids, m.cullfaces.astype(np.int64))
+            self.models.append(model)
+            placement = None
+            if faces.instances:
+                ids = [self.add_prototype(model_name, prototype) for model_name, prototype, _, _ in faces.instances]
+                rotations = np.array([(x, y) for _, _, x, y in faces.instances], dtype=np.float32)
+                placement = (np.array(ids, dtype=np.int32), rotations)
+            self.placements.append(placement)
+            kind = block_tint(entry["Name"])
+            if kind is not None:
+                for texture in faces.tinted:
+                    self.texture_id(texture)
+                    self.texture_tints.setdefault(texture, kind)
+            self._arrays = None
+        return sid
+
+    def add_prototype(self, name: str, model: BakedModel) -> int:
+        """Return the prototype index of model ``name``, registering it if new.
+
+        Registering the previous import's prototypes first keeps their
+        indices stable across re-imports.
+        """
+        pid = self.prototypes.get(name)
+        if pid is None:
+            pid = self.prototypes[name] = len(self.prototype_models)
+            self.prototype_models.append(model)
+            for texture in model.textures:
+                self.texture_id(texture)
+        return pid
+
+    def palette_ids(self, palette: Sequence[Mapping]) -> np.ndarray:
+        """Map a section palette to state ids (``int32`` array)."""
+        return np.array([self.state_id(entry) for entry in palette] or [0], dtype=np.int32)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(cube, opaque, face_textures)`` lookup arrays by state id."""
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self._cube, dtype=bool),
+                np.array(self._opaque, dtype=bool),
+                np.array(self._faces, dtype=np.int32).reshape(-1, 6),
+            )
+        return self._arrays
+
+
+def chunk_states(sections: Iterable[Section], table: BlockTable) -> Tuple[int, np.ndarray]:
+    """Stack sections into one ``[y, z, x]`` state-id array.
+
+    Returns ``(min_section_y, states)``; missing sections are air.
+    """
+    sections = list(sections)
+    if not sections:
+        return 0, np.zeros((0, SECTION_SIDE, SECTION_SIDE), dtype=np.int32)
+    low = min(s.y for s in sections)
+    high = max(s.y for s in sections)
+    states = np.zeros(((high - low + 1) * SECTION_SIDE, SECTION_SIDE, SECTION_SIDE), dtype=np.int32)
+    for section in sections:
+        ids = table.palette_ids(section.palette)
+        y0 = (section.y - low) * SECTION_SIDE
+        states[y0:y0 + SECTION_SIDE] = ids[section.blocks]
+    return low, states
+
+
+class MeshData(NamedTuple):
+    """Flat mesh buffers, directly usable with ``foreach_set``.
+
+    ``vertices`` ``(V, 3)`` float32 in Blender space; ``loops`` ``(L,)`` int32
+    vertex indices (4 per quad); ``loop_starts`` ``(P,)`` int32; ``uvs``
+    ``(L, 2)`` float32; ``material_indices`` ``(P,)`` int32 into
+    ``materials``; ``face_textures`` ``(P,)`` int32 texture ids of the
+    source :class:`BlockTable`; ``face_blocks`` ``(P, 3)`` int32 Minecraft
+    ``(x, y, z)`` of the block each face belongs to (first cell of a merged
+    quad); ``colors`` optional ``(L, 4)`` float32 linear per-loop tints
+    (see :class:`.biomes.BiomeTints`).
+    """
+
+    vertices: np.ndarray
+    loops: np.ndarray
+    loop_starts: np.ndarray
+    uvs: np.ndarray
+    material_indices: np.ndarray
+    materials: List[str]
+    face_textures: np.ndarray
+    face_blocks: np.ndarray
+    colors: Optional[np.ndarray] = None
+
+    @property
+    def loop_totals(self) -> np.ndarray:
+        return np.full(len(self.loop_starts), 4, dtype=np.int32)
+
+
+def _row_runs(tex: np.ndarray):
+    """Find runs of equal, non-negative values along the last axis.
+
+    Returns ``(s, r, c0, c1, value)`` arrays, one entry per run.
+    """
+    S, R, C = tex.shape
+    padded = np.full((S, R, C + 2), -1, dtype=np.int32)
+    padded[:, :, 1:-1] = tex
+    change = padded[:, :, 1:] != padded[:, :, :-1]
+    s, r, c = np.nonzero(change)
+    if len(s) < 2:
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, empty, empty, empty
+    same_row = (s[:-1] == s[1:]) & (r[:-1] == r[1:])
+    s0, r0, c0 = s[:-1], r[:-1], c[:-1]
+    c1 = c[1:]
+    value = padded[s0, r0, c0 + 1]
+    keep = same_row & (value >= 0)
+    return s0[keep], r0[keep], c0[keep], c1[keep], value[keep]
+
+
+def _merge_rows(s, r, c0, c1, value):
+    """Stack identical runs on consecutive rows into rectangles.
+
+    Returns ``(s, r0, r1, c0, c1, value)``.
+    """
+    if len(s) == 0:
+        return s, r, r, c0, c1, value
+    order = np.lexsort((r, value, c1, c0, s))
+    s, r, c0, c1, value = s[order], r[order], c0[order], c1[order], value[order]
+    cont = np.zeros(len(s), dtype=bool)
+    cont[1:] = (
+        (s[1:] == s[:-1]) & (c0[1:] == c0[:-1]) & (c1[1:] == c1[:-1])
+        & (value[1:] == value[:-1]) & (r[1:] == r[:-1] + 1)
+    )
+    starts = np.flatnonzero(~cont)
+    ends = np.append(starts[1:], len(s))
+    return s[starts], r[starts], r[ends - 1] + 1, c0[starts], c1[starts], value[starts]
+
+
+def _direction_faces(tex: np.ndarray, greedy: bool):
+    """Quads ``(s, r0, r1, c0, c1, value)`` for one direction's ``(S, R, C)`` mask."""
+    if greedy:
+        return _merge_rows(*_row_runs(tex))
+    s, r, c = np.nonzero(tex >= 0)
+    value = tex[s, r, c]
+    return s, r, r + 1, c, c + 1, value
+
+
+def mesh_chunk(states: np.ndarray, table: BlockTable, origin: Tuple[int, int, int] = (0, 0, 0),
+               greedy: bool = True,
+               atlas: Optional[Mapping[str, Tuple[int, float, float, float, float]]] = None) -> MeshData:
+    """Mesh a ``[y, z, x]`` state-id array into quads.
+
+    Args:
+        states: block state ids from :func:`chunk_states`.
+        table: the :class:`BlockTable` the ids refer to.
+        origin: Minecraft ``(x, y, z)`` of ``states[0, 0, 0]``.
+        greedy: merge coplanar same-texture faces. Merged quads rely on
+            texture repeat, so atlas output always uses unmerged faces.
+        atlas: optional texture -> ``(page, u0, v0, u1, v1)`` table (see
+            :meth:`.atlas.AtlasLayout.uv_table`). When given, UVs are remapped
+            into atlas space and ``materials`` names atlas pages as
+            ``"atlas:<page>"``; textures absent from the table keep their
+            own material.
+
+    Returns:
+        :class:`MeshData`.
+    """
+    cube, opaque, face_tex = table.arrays()
+    if atlas is not None:
+        greedy = False
+    is_cube = cube[states]
+    is_opaque = opaque[states]
+
+    quads = []  # (corners (Q,4,3) xyz, uvs (Q,4,2), texture ids (Q,), blocks (Q,3) xyz)
+    occluded = []  # per direction: is the neighbour on that side opaque?
+    for d, direction in enumerate(DIRECTIONS):
+        axis, sign = _NORMALS[direction]
+        axis -= 1
+        # Neighbour states along the face normal; outside the array is air.
+        neighbour_opaque = np.zeros_like(is_opaque)
+        neighbour_state = np.full_like(states, -1)
+        src = [slice(None)] * 3
+        dst = [slice(None)] * 3
+        if sign > 0:
+            dst[axis], src[axis] = slice(0, -1), slice(1, None)
+        else:
+            dst[axis], src[axis] = slice(1, None), slice(0, -1)
+        neighbour_opaque[tuple(dst)] = is_opaque[tuple(src)]
+        neighbour_state[tuple(dst)] = states[tuple(src)]
+        occluded.append(neighbour_opaque)
+        # Transparent cubes (glass) also hide faces against the same block.
+        visible = is_cube & ~neighbour_opaque & (neighbour_state != states)
+        tex = np.where(visible, face_tex[states, d], -1).astype(np.int32)
+
+        # Rearrange to (S, R, C): slice along the normal, rows, columns.
+        if axis == 0:       # y: rows z, cols x
+            perm = (0, 1, 2)
+        elif axis == 1:     # z: rows y, cols x
+            perm = (1, 0, 2)
+        else:               # x: rows y, cols z
+            perm = (2, 0, 1)
+        s, r0, r1, c0, c1, value = _direction_faces(tex.transpose(perm), greedy)
+        if len(s) == 0:
+            continue
+        plane = s + (1 if sign > 0 else 0)
+        corners_src = np.stack([
+            np.stack([plane, r0, c0], axis=1),
+            np.stack([plane, r0, c1], axis=1),
+            np.stack([plane, r1, c1], axis=1),
+            np.stack([plane, r1, c0], axis=1),
+        ], axis=1)  # (Q, 4, 3) in (S, R, C)
+        yzx = np.empty_like(corners_src)
+        yzx[..., perm[0]] = corners_src[..., 0]
+        yzx[..., perm[1]] = corners_src[..., 1]
+        yzx[..., perm[2]] = corners_src[..., 2]
+        xyz = yzx[..., [2, 0, 1]].astype(np.float32)
+        cell = np.empty((len(s), 3), dtype=np.int64)
+        cell[:, perm[0]], cell[:, perm[1]], cell[:, perm[2]] = s, r0, c0
+
+        width = (c1 - c0).astype(np.float32)
+        height = (r1 - r0).astype(np.float32)
+        zero = np.zeros_like(width)
+        u = np.stack([zero, width, width, zero], axis=1)
+        v = np.stack([zero, zero, height, height], axis=1)
+        # Match Minecraft's face orientation: north/east textures run
+        # against the axis and top textures have north at the top.
+        if direction in ("north", "east"):
+            u = width[:, None] - u
+        elif direction == "up":
+            v = height[:, None] - v
+        uv = np.stack([u, v], axis=2)
+
+        # Keep counter-clockwise winding seen from outside the block.
+        a, b, c = xyz[0, 0], xyz[0, 1], xyz[0, 2]
+        if np.dot(np.cross(b - a, c - a), FACE_NORMALS[d]) < 0:
+            xyz = xyz[:, ::-1]
+            uv = uv[:, ::-1]
+        quads.append((xyz, uv, value, cell[:, [2, 0, 1]]))
+
+    for sid in np.unique(states).tolist():
+        model = table.models[sid]
+        if model is None:
+            continue
+        positions, model_uvs, model_tex, cullfaces = model
+        ys, zs, xs = np.nonzero(states == sid)
+        keep = np.ones((len(ys), len(model_tex)), dtype=bool)
+        for d in np.unique(cullfaces[cullfaces >= 0]).tolist():
+            keep[:, cullfaces == d] &= ~occluded[d][ys, zs, xs][:, None]
+        block, quad = np.nonzero(keep)
+        if len(block) == 0:
+            continue
+        cells = np.stack([xs, ys, zs], axis=1)[block]
+        quads.append((positions[quad] + cells[:, None, :].astype(np.float32), model_uvs[quad],
+                      model_tex[quad], cells))
+
+    return _assemble(quads, origin, table.texture_names, atlas)
+
+
+class InstancePoints(NamedTuple):
+    """Instance placements of one chunk.
+
+    ``positions`` ``(N, 3)`` Blender-space block centres, ``rotations``
+    ``(N, 3)`` Blender XYZ Euler angles in radians and ``prototypes``
+    ``(N,)`` indices into ``BlockTable.prototype_models``; ``colors``
+    optional ``(N, 4)`` float32 linear tints.
+    """
+
+    positions: np.ndarray
+    rotations: np.ndarray
+    prototypes: np.ndarray
+    colors: Optional[np.ndarray] = None
+
+
+def instance_points(states: np.ndarray, table: BlockTable,
+                    origin: Tuple[int, int, int] = (0, 0, 0)) -> InstancePoints:
+    """Collect the instance placements of the instanced states in ``states``."""
+    positions, rotations, prototypes = [], [], []
+    ox, oy, oz = origin
+    for sid in np.unique(states).tolist():
+        placement = table.placements[sid]
+        if placement is None:
+            continue
+        ids, angles = placement
+        ys, zs, xs = np.nonzero(states == sid)
+        centres = np.stack([xs + ox + 0.5, -(zs + oz + 0.5), ys + oy + 0.5], axis=1)
+        # Minecraft's clockwise variant rotations about X then Y become
+        # Blender's XYZ Euler (-x, 0, -y) since Minecraft Y maps to Blender Z.
+        euler = np.zeros((len(ids), 3), dtype=np.float32)
+        euler[:, 0] = -np.radians(angles[:, 0])
+        euler[:, 2] = -np.radians(angles[:, 1])
+        positions.append(np.repeat(centres, len(ids), axis=0))
+        rotations.append(np.tile(euler, (len(xs), 1)))
+        prototypes.append(np.tile(ids, len(xs)))
+    if not positions:
+        return InstancePoints(np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.float32),
+                              np.zeros(0, dtype=np.int32))
+    return InstancePoints(
+        np.concatenate(positions).astype(np.float32),
+        np.concatenate(rotations),
+        np.concatenate(prototypes).astype(np.int32),
+    )
+
+
+def prototype_mesh(table: BlockTable, prototype: int,
+                   atlas: Optional[Mapping[str, Tuple[int, float, float, float, float]]] = None) -> MeshData:
+    """Mesh one instancing prototype centred on the origin.
+
+    Instances are placed at block centres, so the prototype is shifted by
+    half a block; ``atlas`` works as in :func:`mesh_chunk`.
+    """
+    model = table.prototype_models[prototype]
+    textures = np.array([table.texture_id(t) for t in model.textures], dtype=np.int32)
+    cells = np.zeros((len(textures), 3), dtype=np.int64)
+    return _assemble([(model.positions, model.uvs, textures, cells)], (-0.5, -0.5, -0.5),
+                     table.texture_names, atlas)
+
+
+def placeholder_mesh(chunks: Iterable[Tuple[int, int]], height: int, texture: str) -> MeshData:
+    """Mesh one flat ``texture`` quad per chunk on top of block row ``height``.
+
+    Stands in for chunks that were culled from an import, so they still
+    catch light and cast a horizon without being decoded.
+    """
+    keys = np.array(sorted(chunks), dtype=np.int64).reshape(-1, 2)
+    if not len(keys):
+        return _assemble([], (0, 0, 0), [texture], None)
+    corners = np.zeros((len(keys), 4, 3), dtype=np.float64)
+    corners[:, :, 0] = keys[:, :1] * 16 + np.array([0, 0, 16, 16])
+    corners[:, :, 1] = height + 1
+    corners[:, :, 2] = keys[:, 1:] * 16 + np.array([0, 16, 16, 0])
+    uvs = np.tile(np.array([(0, 0), (0, 16), (16, 16), (16, 0)], dtype=np.float32), (len(keys), 1, 1))
+    cells = np.stack([keys[:, 0] * 16, np.full(len(keys), height), keys[:, 1] * 16], axis=1)
+    return _assemble([(corners, uvs, np.zeros(len(keys), dtype=np.int32), cells)], (0, 0, 0), [texture], None)
+
+
+def _assemble(quads, origin, texture_names: Sequence[str], atlas) -> MeshData:
+    """Concatenate per-group quads into deduplicated :class:`MeshData`.
+
+    ``quads`` holds ``(corners (Q, 4, 3), uvs (Q, 4, 2), texture ids (Q,),
+    blocks (Q, 3))`` groups in local Minecraft ``(x, y, z)``; ``origin`` is
+    added before converting to Blender axes.
+    """
+    if not quads:
+        empty_f = np.zeros((0, 3), dtype=np.float32)
+        empty_i = np.zeros(0, dtype=np.int32)
+        return MeshData(empty_f, empty_i, empty_i, np.zeros((0, 2), dtype=np.float32), empty_i, [],
+                        empty_i, np.zeros((0, 3), dtype=np.int32))
+
+    corners = np.concatenate([q[0] for q in quads]).reshape(-1, 3)   # (L, 3) local xyz
+    uvs = np.concatenate([q[1] for q in quads]).reshape(-1, 2).astype(np.float32)
+    values = np.concatenate([q[2] for q in quads]).astype(np.int32)
+    cells = np.concatenate([q[3] for q in quads])                     # (P, 3) local xyz
+
+    # Corners are exact block-grid (or baked, snapped) floats, so equal
+    # positions deduplicate exactly.
+    unique, loops = np.unique(corners, axis=0, return_inverse=True)
+    ox, oy, oz = origin
+    vertices = np.empty((len(unique), 3), dtype=np.float32)
+    vertices[:, 0] = unique[:, 0] + ox
+    vertices[:, 1] = -(unique[:, 2] + oz)
+    vertices[:, 2] = unique[:, 1] + oy
+    face_blocks = (cells + np.array(origin)).astype(np.int32)
+
+    used, material_indices = np.unique(values, return_inverse=True)
+    materials = [texture_names[i] for i in used]
+    data = MeshData(
+        vertices,
+        loops.reshape(-1).astype(np.int32),
+        np.arange(0, len(values) * 4, 4, dtype=np.int32),
+        uvs,
+        material_indices.reshape(-1).astype(np.int32),
+        materials,
+        values,
+        face_blocks,
+    )
+    return data if atlas is None else atlas_mesh(data, atlas)
+
+
+def atlas_mesh(data: MeshData, atlas: Mapping[str, Tuple[int, float, float, float, float]]) -> MeshData:
+    """Remap a mesh made without an atlas into ``atlas`` space (see :func:`mesh_chunk`).
+
+    Only UVs and materials change, so one cached mesh serves imports with
+    and without an atlas. Merged quads rely on texture repeat; ``data``
+    should come from unmerged meshing.
+    """
+    # Textures missing from the atlas (e.g. animated ones) keep tile UVs
+    # and their own material; codes >= 0 are pages, < 0 are ~material.
+    rect_table = np.tile(np.array([0, 0, 0, 1, 1], dtype=np.float32), (len(data.materials), 1))
+    codes = np.empty(len(data.materials), dtype=np.int64)
+    for i, name in enumerate(data.materials):
+        rect = atlas.get(name)
+        if rect is None:
+            codes[i] = ~i
+        else:
+            rect_table[i] = rect
+            codes[i] = rect[0]
+    uvs = remap_uvs(data.uvs, np.repeat(rect_table[data.material_indices, 1:], 4, axis=0))
+    used, material_indices = np.unique(codes[data.material_indices], return_inverse=True)
+    return data._replace(
+        uvs=uvs,
+        material_indices=material_indices.reshape(-1).astype(np.int32),
+        materials=[f"{ATLAS_PAGE_PREFIX}{c}" if c >= 0 else data.materials[~c] for c in used.tolist()],
+    )
@@ -0,0 +1,454 @@
+"""Blockstate and block model resolution for the LBFF Minecraft importer.
+
+A block state such as ``oak_stairs[facing=east,half=bottom,shape=straight]``
+is rendered by picking a variant (or the matching multipart rules) from
+``blockstates/oak_stairs.json``, then loading each referenced model from
+``models/`` with its ``parent`` chain merged and ``#texture`` variables
+followed to final texture paths. :class:`ModelResolver` does all of that once
+per distinct block state and bakes the result into a :class:`BakedModel`:
+flat quad arrays in block space with per-quad textures, cullfaces and tint
+indices, with element and variant rotations already applied.
+
+Parsed JSON, flattened models and baked states are memoized in LRUs, and
+baked states are persisted under the pack stack's fingerprint, so a
+re-import of the same stack skips model resolution entirely.
+
+``uvlock`` is not applied; rotated variants keep their model UVs.
+
+This module does not import ``bpy``.
+"""
+
+import json
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .cache import read_json, write_json_atomic
+
+# Bump when baking changes so persisted models are rebuilt.
+MODEL_CACHE_VERSION = 1
+
+# Face names in the order used for cullface indices (matches mesher.DIRECTIONS).
+FACES = ("up", "down", "north", "south", "west", "east")
+FACE_NORMALS = np.array([(0, 1, 0), (0, -1, 0), (0, 0, -1), (0, 0, 1), (-1, 0, 0), (1, 0, 0)], dtype=np.float32)
+
+# Parent chains longer than this are treated as cycles.
+_MAX_PARENTS = 32
+
+
+class ModelError(Exception):
+    """Raised when a blockstate or model file cannot be resolved."""
+
+
+class BakedModel(NamedTuple):
+    """Flattened quads of one block state in block space (``0..1``).
+
+    ``positions`` ``(Q, 4, 3)`` Minecraft ``(x, y, z)`` corners, wound
+    counter-clockwise seen from outside; ``uvs`` ``(Q, 4, 2)`` texture-local
+    UVs with V up; ``textures`` one resource location per quad;
+    ``cullfaces`` ``(Q,)`` index into :data:`FACES` or -1; ``tints``
+    ``(Q,)`` tint index or -1.
+    """
+
+    positions: np.ndarray
+    uvs: np.ndarray
+    textures: Tuple[str, ...]
+    cullfaces: np.ndarray
+    tints: np.ndarray
+
+    def to_json(self) -> dict:
+        return {
+            "positions": self.positions.round(6).ravel().tolist(),
+            "uvs": self.uvs.round(6).ravel().tolist(),
+            "textures": list(self.textures),
+            "cullfaces": self.cullfaces.tolist(),
+            "tints": self.tints.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict) -> "BakedModel":
+        return cls(
+            np.array(payload["positions"], dtype=np.float32).reshape(-1, 4, 3),
+            np.array(payload["uvs"], dtype=np.float32).reshape(-1, 4, 2),
+            tuple(payload["textures"]),
+            np.array(payload["cullfaces"], dtype=np.int8),
+            np.array(payload["tints"], dtype=np.int16),
+        )
+
+    def face_normals(self) -> np.ndarray:
+        """Return the ``(Q, 3)`` unit normals of the quads."""
+        p = self.positions
+        n = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+        return n / np.maximum(np.linalg.norm(n, axis=1, keepdims=True), 1e-12)
+
+
+EMPTY_MODEL = BakedModel(
+    np.zeros((0, 4, 3), dtype=np.float32), np.zeros((0, 4, 2), dtype=np.float32), (),
+    np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int16),
+)
+
+
+class FlatModel(NamedTuple):
+    """A model with its parent chain merged: resolved textures and elements."""
+
+    textures: Dict[str, str]
+    elements: List[dict]
+
+
+class LRU:
+    """Small ``OrderedDict`` backed least-recently-used mapping."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.data: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+def _location(name: str) -> Tuple[str, str]:
+    namespace, _, path = name.rpartition(":")
+    return namespace or "minecraft", path
+
+
+def blockstate_member(block: str) -> str:
+    """``minecraft:oak_stairs`` -> ``assets/minecraft/blockstates/oak_stairs.json``."""
+    namespace, path = _location(block)
+    return f"assets/{namespace}/blockstates/{path}.json"
+
+
+def model_member(model: str) -> str:
+    """``minecraft:block/stone`` -> ``assets/minecraft/models/block/stone.json``."""
+    namespace, path = _location(model)
+    return f"assets/{namespace}/models/{path}.json"
+
+
+def canonical(name: str) -> str:
+    """Return ``name`` with an explicit namespace."""
+    namespace, path = _location(name)
+    return f"{namespace}:{path}"
+
+
+# -- state matching ----------------------------------------------------
+
+def _variant_matches(key: str, props: Mapping[str, str]) -> bool:
+    if not key:
+        return True
+    for condition in key.split(","):
+        name, _, value = condition.partition("=")
+        if str(props.get(name, "")) != value:
+            return False
+    return True
+
+
+def _when_matches(when: Optional[Mapping], props: Mapping[str, str]) -> bool:
+    if not when:
+        return True
+    if "OR" in when:
+        return any(_when_matches(w, props) for w in when["OR"])
+    if "AND" in when:
+        return all(_when_matches(w, props) for w in when["AND"])
+    for name, allowed in when.items():
+        if str(props.get(name, "")) not in str(allowed).split("|"):
+            return False
+    return True
+
+
+def _first(apply):
+    # Weighted random variants: always use the first for a stable import.
+    return apply[0] if isinstance(apply, list) else apply
+
+
+def select_models(blockstate: Mapping, props: Mapping[str, str]) -> List[dict]:
+    """Return the ``{"model", "x", "y", "uvlock"}`` entries for a state."""
+    if "variants" in blockstate:
+        for key, apply in blockstate["variants"].items():
+            if _variant_matches(key, props):
+                return [_first(apply)]
+        return []
+    return [_first(part["apply"]) for part in blockstate.get("multipart", ())
+            if _when_matches(part.get("when"), props)]
+
+
+# -- geometry ----------------------------------------------------------
+
+def _face_quad(face: str, lo, hi) -> np.ndarray:
+    """Corners of ``face`` of box ``lo..hi`` as bottom-left, bottom-right,
+    top-right, top-left of the face texture (so counter-clockwise from outside)."""
+    fx, fy, fz = lo
+    tx, ty, tz = hi
+    corners = {
+        "north": ((tx, fy, fz), (fx, fy, fz), (fx, ty, fz), (tx, ty, fz)),
+        "south": ((fx, fy, tz), (tx, fy, tz), (tx, ty, tz), (fx, ty, tz)),
+        "east": ((tx, fy, tz), (tx, fy, fz), (tx, ty, fz), (tx, ty, tz)),
+        "west": ((fx, fy, fz), (fx, fy, tz), (fx, ty, tz), (fx, ty, fz)),
+        "up": ((fx, ty, tz), (tx, ty, tz), (tx, ty, fz), (fx, ty, fz)),
+        "down": ((fx, fy, fz), (tx, fy, fz), (tx, fy, tz), (fx, fy, tz)),
+    }[face]
+    return np.array(corners, dtype=np.float64)
+
+
+def _default_uv(face: str, lo, hi) -> Tuple[float, float, float, float]:
+    """Minecraft's default ``[u0, v0, u1, v1]`` (pixels, V down) for a face."""
+    fx, fy, fz = (v * 16 for v in lo)
+    tx, ty, tz = (v * 16 for v in hi)
+    return {
+        "up": (fx, fz, tx, tz),
+        "down": (fx, 16 - tz, tx, 16 - fz),
+        "north": (16 - tx, 16 - ty, 16 - fx, 16 - fy),
+        "south": (fx, 16 - ty, tx, 16 - fy),
+        "west": (fz, 16 - ty, tz, 16 - fy),
+        "east": (16 - tz, 16 - ty, 16 - fz, 16 - fy),
+    }[face]
+
+
+def _rotation(axis: str, degrees: float) -> np.ndarray:
+    """Right-handed rotation matrix about a Minecraft axis."""
+    a = math.radians(degrees)
+    c, s = math.cos(a), math.sin(a)
+    if axis == "x":
+        return np.array([(1, 0, 0), (0, c, -s), (0, s, c)])
+    if axis == "y":
+        return np.array([(c, 0, s), (0, 1, 0), (-s, 0, c)])
+    return np.array([(c, -s, 0), (s, c, 0), (0, 0, 1)])
+
+
+def _nearest_face(normal: np.ndarray) -> int:
+    return int(np.argmax(FACE_NORMALS @ normal))
+
+
+def resolve_texture(textures: Mapping[str, str], ref: str) -> Optional[str]:
+    """Follow ``#variable`` references to a texture resource location."""
+    for _ in range(_MAX_PARENTS):
+        if not ref.startswith("#"):
+            return canonical(ref)
+        ref = textures.get(ref[1:])
+        if ref is None:
+            return None
+    return None
+
+
+def bake_elements(flat: FlatModel, x: int = 0, y: int = 0) -> BakedModel:
+    """Bake a flattened model, applying a variant's ``x``/``y`` rotation."""
+    positions, uvs, textures, cullfaces, tints = [], [], [], [], []
+    # Minecraft's variant rotations are clockwise looking down the axis.
+    variant = _rotation("y", -y) @ _rotation("x", -x)
+    center = np.array((0.5, 0.5, 0.5))
+    for element in flat.elements:
+        lo = np.array(element["from"], dtype=np.float64) / 16
+        hi = np.array(element["to"], dtype=np.float64) / 16
+        rotation = element.get("rotation")
+        for face, spec in element.get("faces", {}).items():
+            if face not in FACES:
+                continue
+            texture = resolve_texture(flat.textures, spec.get("texture", ""))
+            if texture is None:
+                continue
+            quad = _face_quad(face, lo, hi)
+            if rotation:
+                origin = np.array(rotation.get("origin", (8, 8, 8)), dtype=np.float64) / 16
+                angle = float(rotation.get("angle", 0))
+                matrix = _rotation(rotation.get("axis", "y"), angle)
+                if rotation.get("rescale"):
+                    scale = 1.0 / max(math.cos(math.radians(angle)), 1e-6)
+                    stretch = np.full(3, scale)
+                    stretch["xyz".index(rotation.get("axis", "y"))] = 1.0
+                    matrix = matrix @ np.diag(stretch)
+                quad = (quad - origin) @ matrix.T + origin
+            quad = (quad - center) @ variant.T + center
+
+            u0, v0, u1, v1 = spec.get("uv") or _default_uv(face, lo, hi)
+            # Bottom-left, bottom-right, top-right, top-left; Blender V is up.
+            corners = np.array([(u0, v1), (u1, v1), (u1, v0), (u0, v0)], dtype=np.float64) / 16
+            corners[:, 1] = 1.0 - corners[:, 1]
+            turns = int(spec.get("rotation", 0)) // 90 % 4
+            corners = np.roll(corners, -turns, axis=0)
+
+            cull = spec.get("cullface")
+            if cull in FACES:
+                cull_normal = FACE_NORMALS[FACES.index(cull)] @ variant.T
+                cull_index = _nearest_face(cull_normal)
+            else:
+                cull_index = -1
+            positions.append(quad)
+            uvs.append(corners)
+            textures.append(texture)
+            cullfaces.append(cull_index)
+            tints.append(int(spec.get("tintindex", -1)))
+    if not positions:
+        return EMPTY_MODEL
+    # Snap rounding noise from the rotations so coincident corners match exactly.
+    return BakedModel(
+        np.round(np.array(positions), 6).astype(np.float32),
+        np.array(uvs, dtype=np.float32),
+        tuple(textures),
+        np.array(cullfaces, dtype=np.int8),
+        np.array(tints, dtype=np.int16),
+    )
+
+
+def merge_baked(models: List[BakedModel]) -> BakedModel:
+    """Concatenate the quads of several baked models (multipart)."""
+    models = [m for m in models if len(m.textures)]
+    if not models:
+        return EMPTY_MODEL
+    if len(models) == 1:
+        return models[0]
+    return BakedModel(
+        np.concatenate([m.positions for m in models]),
+        np.concatenate([m.uvs for m in models]),
+        sum((m.textures for m in models), ()),
+        np.concatenate([m.cullfaces for m in models]),
+        np.concatenate([m.tints for m in models]),
+    )
+
+
+# -- resolver ----------------------------------------------------------
+
+class ModelResolver:
+    """Resolves block states to :class:`BakedModel` through a pack stack.
+
+    Args:
+        stack: an open :class:`.resource_pack.PackStack`.
+        maxsize: LRU capacity for baked states and for parsed/flattened
+            model files.
+        persist: load and save baked states under the stack's cache
+            directory, keyed by its fingerprint.
+
+    Call :meth:`save` after an import to persist newly baked states.
+    """
+
+    def __init__(self, stack, maxsize: int = 4096, persist: bool = True):
+        self.stack = stack
+        self.baked = LRU(maxsize)
+        self._json = LRU(maxsize)
+        self._flat = LRU(maxsize)
+        self._parts = LRU(maxsize)
+        self._stored: Dict[str, dict] = {}
+        self._dirty = False
+        self.persist = persist
+        if persist:
+            payload = read_json(self.cache_path())
+            if (isinstance(payload, dict) and payload.get("version") == MODEL_CACHE_VERSION
+                    and payload.get("fingerprint") == stack.fingerprint):
+                self._stored = payload.get("states", {})
+
+    def cache_path(self) -> Path:
+        """Return the persisted baked-state file for this pack stack."""
+        return Path(self.stack.cache_dir) / "models" / f"{self.stack.fingerprint[:20]}.json"
+
+    def save(self) -> None:
+        """Write baked states to disk if any were added."""
+        if self.persist and self._dirty:
+            write_json_atomic(self.cache_path(), {
+                "version": MODEL_CACHE_VERSION,
+                "fingerprint": self.stack.fingerprint,
+                "states": self._stored,
+            })
+            self._dirty = False
+
+    def _load_json(self, member: str) -> Optional[dict]:
+        value = self._json.get(member, False)
+        if value is False:
+            value = None
+            if member in self.stack:
+                try:
+                    value = json.loads(self.stack.read(member))
+                except ValueError as e:
+                    raise ModelError(f"invalid JSON in {member}: {e}") from e
+            self._json.put(member, value)
+        return value
+
+    def flat_model(self, model: str) -> FlatModel:
+        """Return ``model`` with its parent chain merged (memoized)."""
+        model = canonical(model)
+        flat = self._flat.get(model)
+        if flat is not None:
+            return flat
+        chain = []
+        name = model
+        while name is not None:
+            if len(chain) >= _MAX_PARENTS:
+                raise ModelError(f"parent chain of {model} is too deep or cyclic")
+            if name.startswith("builtin/") or name.startswith("minecraft:builtin/"):
+                break
+            payload = self._load_json(model_member(name))
+            if payload is None:
+                raise ModelError(f"missing model {name}")
+            chain.append(payload)
+            parent = payload.get("parent")
+            name = canonical(parent) if parent else None
+        textures: Dict[str, str] = {}
+        elements: List[dict] = []
+        # Root first so children override inherited textures; the nearest
+        # model that defines elements wins outright.
+        for payload in reversed(chain):
+            textures.update(payload.get("textures", {}))
+            if "elements" in payload:
+                elements = payload["elements"]
+        flat = FlatModel(textures, elements)
+        self._flat.put(model, flat)
+        return flat
+
+    def resolve(self, name: str, props: Optional[Mapping[str, str]] = None, key: Optional[str] = None) -> BakedModel:
+        """Return the baked model for block ``name`` with ``props``.
+
+        ``key`` is the memo key (defaults to ``name[props]``); pass the
+        mesher's block key to share it.
+        """
+        props = props or {}
+        if key is None:
+            key = name + "[" + ",".join(f"{k}={props[k]}" for k in sorted(props)) + "]" if props else name
+        baked = self.baked.get(key)
+        if baked is not None:
+            return baked
+        stored = self._stored.get(key)
+        if stored is not None:
+            baked = BakedModel.from_json(stored)
+        else:
+            baked = merge_baked([self.bake_model(*part) for part in self.resolve_parts(name, props)])
+            self._stored[key] = baked.to_json()
+            self._dirty = True
+        self.baked.put(key, baked)
+        return baked
+
+    def resolve_parts(self, name: str, props: Optional[Mapping[str, str]] = None) -> List[Tuple[str, int, int]]:
+        """Return the ``(model, x, y)`` parts a block state renders.
+
+        One part for variants, one per matching rule for multipart.
+        """
+        blockstate = self._load_json(blockstate_member(name))
+        if blockstate is None:
+            raise ModelError(f"missing blockstate for {name}")
+        return [(canonical(entry["model"]), int(entry.get("x", 0)), int(entry.get("y", 0)))
+                for entry in select_models(blockstate, props or {})]
+
+    def bake_model(self, model: str, x: int = 0, y: int = 0) -> BakedModel:
+        """Return ``model`` baked with a variant rotation (memoized)."""
+        key = (model, x, y)
+        baked = self._parts.get(key)
+        if baked is None:
+            baked = bake_elements(self.flat_model(model), x, y)
+            self._parts.put(key, baked)
+        return baked
@@ -0,0 +1,224 @@
+"""Lazy NBT decoder for the LBFF Minecraft importer.
+
+Chunks, ``level.dat`` and schematics are all NBT. This decoder returns
+``TAG_Byte_Array``, ``TAG_Int_Array`` and ``TAG_Long_Array`` payloads as
+big-endian NumPy views over the source buffer, so a 4,096 entry block-state
+array costs one ``np.frombuffer`` call instead of thousands of Python ints.
+
+Parsing can be restricted to selected paths, e.g.::
+
+    parse_nbt(data, select=["sections[*].block_states", "DataVersion"])
+
+Everything outside the selection is skipped by length without being
+materialized; entities, tile entities and other unused compounds never
+become Python objects.
+
+This module does not import ``bpy``.
+"""
+
+import gzip
+import struct
+import zlib
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from .cache import PathLike
+
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_SCALARS = {
+    TAG_BYTE: struct.Struct(">b"),
+    TAG_SHORT: struct.Struct(">h"),
+    TAG_INT: struct.Struct(">i"),
+    TAG_LONG: struct.Struct(">q"),
+    TAG_FLOAT: struct.Struct(">f"),
+    TAG_DOUBLE: struct.Struct(">d"),
+}
+_SCALAR_SIZES = {tag: s.size for tag, s in _SCALARS.items()}
+_ARRAYS = {
+    TAG_BYTE_ARRAY: np.dtype("i1"),
+    TAG_INT_ARRAY: np.dtype(">i4"),
+    TAG_LONG_ARRAY: np.dtype(">i8"),
+}
+_USHORT = struct.Struct(">H")
+_INT = struct.Struct(">i")
+
+# Selection tree leaf meaning "parse everything below here".
+ALL = True
+Selection = Union[bool, Dict[str, Any]]
+
+
+class NBTError(Exception):
+    """Raised for malformed NBT data."""
+
+
+def compile_selection(paths: Iterable[str]) -> Selection:
+    """Build a selection tree from dotted paths.
+
+    ``"a.b"`` selects key ``b`` of compound ``a``; ``"a[*].b"`` selects key
+    ``b`` of every compound in list ``a``. A path that is a prefix of another
+    selects the whole subtree.
+    """
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        keys = []
+        for part in path.split("."):
+            if part.endswith("[*]"):
+                keys.extend((part[:-3], "*"))
+            else:
+                keys.append(part)
+        node = tree
+        for key in keys[:-1]:
+            child = node.get(key)
+            if child is ALL:
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[keys[-1]] = ALL
+    return tree
+
+
+class _Reader:
+    """Cursor over an NBT buffer; one instance per parse."""
+
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+    def string(self) -> str:
+        (length,) = _USHORT.unpack_from(self.buf, self.pos)
+        start = self.pos + 2
+        self.pos = start + length
+        # Java's modified UTF-8 differs only for NUL and astral characters.
+        return bytes(self.buf[start:self.pos]).decode("utf-8", errors="replace")
+
+    def payload(self, tag: int, select: Selection) -> Any:
+        scalar = _SCALARS.get(tag)
+        if scalar is not None:
+            (value,) = scalar.unpack_from(self.buf, self.pos)
+            self.pos += scalar.size
+            return value
+        if tag == TAG_COMPOUND:
+            return self.compound(select)
+        if tag == TAG_STRING:
+            return self.string()
+        dtype = _ARRAYS.get(tag)
+        if dtype is not None:
+            (count,) = _INT.unpack_from(self.buf, self.pos)
+            start = self.pos + 4
+            self.pos = start + count * dtype.itemsize
+            return np.frombuffer(self.buf, dtype=dtype, count=count, offset=start)
+        if tag == TAG_LIST:
+            item_tag = self.buf[self.pos]
+            (count,) = _INT.unpack_from(self.buf, self.pos + 1)
+            self.pos += 5
+            # "list[*].key" and the lenient "list.key" both apply per item.
+            item_select = select if select is ALL else select.get("*", select)
+            return [self.payload(item_tag, item_select) for _ in range(count)]
+        raise NBTError(f"unknown tag type {tag} at offset {self.pos}")
+
+    def compound(self, select: Selection) -> Dict[str, Any]:
+        out = {}
+        buf = self.buf
+        while True:
+            tag = buf[self.pos]
+            self.pos += 1
+            if tag == TAG_END:
+                return out
+            name = self.string()
+            if select is ALL:
+                out[name] = self.payload(tag, ALL)
+                continue
+            child = select.get(name)
+            if child is None:
+                self.skip(tag)
+            else:
+                out[name] = self.payload(tag, child)
+
+    def skip(self, tag: int) -> None:
+        """Advance past a payload without building Python objects."""
+        size = _SCALAR_SIZES.get(tag)
+        if size is not None:
+            self.pos += size
+        elif tag == TAG_STRING:
+            (length,) = _USHORT.unpack_from(self.buf, self.pos)
+            self.pos += 2 + length
+        elif tag in _ARRAYS:
+            (count,) = _INT.unpack_from(self.buf, self.pos)
+            self.pos += 4 + count * _ARRAYS[tag].itemsize
+        elif tag == TAG_LIST:
+            item_tag = self.buf[self.pos]
+            (count,) = _INT.unpack_from(self.buf, self.pos + 1)
+            self.pos += 5
+            size = _SCALAR_SIZES.get(item_tag)
+            if size is not None:
+                self.pos += count * size
+            else:
+                for _ in range(count):
+                    self.skip(item_tag)
+        elif tag == TAG_COMPOUND:
+            buf = self.buf
+            while True:
+                item_tag = buf[self.pos]
+                self.pos += 1
+                if item_tag == TAG_END:
+                    return
+                (length,) = _USHORT.unpack_from(buf, self.pos)
+                self.pos += 2 + length
+                self.skip(item_tag)
+        elif tag != TAG_END:
+            raise NBTError(f"unknown tag type {tag} at offset {self.pos}")
+
+
+def parse_nbt(data, select: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Decode uncompressed NBT ``data`` and return its root compound.
+
+    Args:
+        data: bytes-like object. Array tags are returned as views into it,
+            so it must stay alive (NumPy keeps a reference automatically).
+        select: optional dotted paths (see :func:`compile_selection`);
+            everything else is skipped.
+
+    Raises:
+        NBTError: if the data is malformed or the root is not a compound.
+    """
+    reader = _Reader(data)
+    try:
+        tag = data[0]
+        if tag != TAG_COMPOUND:
+            raise NBTError(f"root tag is {tag}, expected a compound")
+        reader.pos = 1
+        reader.string()  # root name, usually empty
+        return reader.compound(ALL if select is None else compile_selection(select))
+    except (IndexError, struct.error, ValueError) as e:
+        raise NBTError(f"truncated or corrupt NBT near offset {reader.pos}: {e}") from e
+
+
+def decompress_nbt(data: bytes) -> bytes:
+    """Return ``data`` decompressed if it is gzip or zlib wrapped."""
+    if data[:2] == b"\x1f\x8b":
+        return gzip.decompress(data)
+    if data[:1] == b"\x78":
+        return zlib.decompress(data)
+    return data
+
+
+def load_nbt_file(path: PathLike, select: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Read and decode an NBT file such as ``level.dat`` (gzip detected)."""
+    with open(path, "rb") as fh:
+        return parse_nbt(decompress_nbt(fh.read()), select)
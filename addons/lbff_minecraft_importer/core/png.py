@@ -0,0 +1,245 @@
+"""Minimal NumPy PNG decoder for Minecraft textures.
+
+Decodes non-interlaced PNGs of every colour type and bit depth into an
+``(height, width, 4)`` ``uint8`` RGBA array using only ``zlib`` and NumPy.
+
+Most encoders pick the Average or Paeth filter for most rows, and those
+depend on the reconstructed left neighbour. Small images reverse them byte
+by byte in Python; from :data:`WAVEFRONT_PIXELS` on, all rows are reversed
+together along anti-diagonals. Either way the work holds the GIL, so
+batches are decoded in worker processes (see :mod:`.textures`), not threads.
+
+This module does not import ``bpy``.
+"""
+
+import hashlib
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+class PNGError(Exception):
+    """Raised when a PNG cannot be decoded."""
+
+
+# From this many pixels on, images with Average or Paeth rows are
+# unfiltered along anti-diagonals (:func:`_unfilter_wavefront`); smaller
+# ones are quicker byte by byte.
+WAVEFRONT_PIXELS = 4096
+
+
+def _unfilter_row(ftype: int, line: np.ndarray, prior: np.ndarray, bpp: int) -> np.ndarray:
+    """Reverse the filter of one scanline given the reconstructed ``prior`` one."""
+    if ftype == 0:
+        return line
+    if ftype == 1:
+        # Sub is a running sum per channel; uint8 cumsum wraps mod 256.
+        stride = len(line)
+        pad = (-stride) % bpp
+        padded = np.concatenate((line, np.zeros(pad, dtype=np.uint8))) if pad else line
+        return np.cumsum(padded.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)[:stride]
+    if ftype == 2:
+        return line + prior
+    # Average and Paeth depend on the reconstructed left neighbour, so they
+    # run byte by byte.
+    buf = bytearray(line.tobytes())
+    up = prior.tobytes()
+    if ftype == 3:
+        for i in range(bpp):
+            buf[i] = (buf[i] + (up[i] >> 1)) & 0xFF
+        for i in range(bpp, len(buf)):
+            buf[i] = (buf[i] + ((buf[i - bpp] + up[i]) >> 1)) & 0xFF
+    else:
+        for i in range(bpp):
+            buf[i] = (buf[i] + up[i]) & 0xFF
+        for i in range(bpp, len(buf)):
+            a, b, c = buf[i - bpp], up[i], up[i - bpp]
+            pa, pb, pc = abs(b - c), abs(a - c), abs(a + b - c - c)
+            buf[i] = (buf[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+    return np.frombuffer(bytes(buf), dtype=np.uint8)
+
+
+def _unfilter_wavefront(rows: np.ndarray, stride: int, bpp: int) -> np.ndarray:
+    """Reverse every filter at once, one anti-diagonal of pixels per step.
+
+    Pixel ``(y, x)`` depends only on ``(y, x - 1)``, ``(y - 1, x)`` and
+    ``(y - 1, x - 1)``, so all pixels with the same ``x + y`` can be
+    reconstructed together. The image is sheared so that each anti-diagonal
+    is a column, which keeps every step to plain slices.
+    """
+    height, width = rows.shape[0], stride // bpp
+    filters = rows[:, 0]
+    ys = np.arange(height)[:, None]
+    shear = ys + np.arange(width)
+    line = np.zeros((height, height + width, bpp), dtype=np.int16)
+    line[ys, shear] = rows[:, 1:].reshape(height, width, bpp)
+    # Row 0 and column 0 are the zero neighbours above and left of the image.
+    out = np.zeros((height + 1, height + width + 1, bpp), dtype=np.int16)
+    sub, up, average, paeth = ((filters == f).astype(np.int16)[:, None] for f in (1, 2, 3, 4))
+    for d in range(height + width - 1):
+        y0, y1 = max(0, d - width + 1), min(height, d + 1)
+        a = out[y0 + 1:y1 + 1, d]
+        b = out[y0:y1, d]
+        c = out[y0:y1, d - 1] if d else np.zeros_like(b)
+        pa, pb, pc = np.abs(b - c), np.abs(a - c), np.abs(a + b - c - c)
+        nearest = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+        predicted = (sub[y0:y1] * a + up[y0:y1] * b + average[y0:y1] * ((a + b) >> 1)
+                     + paeth[y0:y1] * nearest)
+        out[y0 + 1:y1 + 1, d + 1] = (line[y0:y1, d] + predicted) & 0xFF
+    return out[1:, 1:][ys, shear].astype(np.uint8).reshape(height, stride)
+
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> np.ndarray:
+    """Reverse the per-scanline PNG filters; returns ``(height, stride)`` uint8."""
+    rows = np.frombuffer(raw, dtype=np.uint8, count=height * (stride + 1)).reshape(height, stride + 1)
+    filters = rows[:, 0]
+    if filters.max(initial=0) > 4:
+        y = int(np.argmax(filters > 4))
+        raise PNGError(f"invalid filter type {filters[y]} on row {y}")
+    if height * (stride // bpp) >= WAVEFRONT_PIXELS and (filters >= 3).any():
+        return _unfilter_wavefront(rows, stride, bpp)
+    out = np.empty((height, stride), dtype=np.uint8)
+    prior = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        out[y] = _unfilter_row(filters[y], rows[y, 1:], prior, bpp)
+        prior = out[y]
+    return out
+
+
+def _unpack_samples(data: np.ndarray, width: int, channels: int, depth: int) -> np.ndarray:
+    """Convert unfiltered scanlines into ``(height, width, channels)`` samples."""
+    height = data.shape[0]
+    if depth == 8:
+        return data.reshape(height, width, channels)
+    if depth == 16:
+        return data.view(">u2").reshape(height, width, channels)
+    # Sub-byte depths: 1, 2 or 4 bits per sample, single channel.
+    shifts = np.arange(8 - depth, -1, -depth, dtype=np.uint8)
+    samples = (data[:, :, None] >> shifts) & ((1 << depth) - 1)
+    return samples.reshape(height, -1)[:, :width].reshape(height, width, 1)
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """Decode ``data`` into an ``(height, width, 4)`` uint8 RGBA array.
+
+    Rows are ordered top to bottom as stored in the file.
+
+    Raises:
+        PNGError: for malformed, interlaced or otherwise unsupported files.
+    """
+    if data[:8] != PNG_SIGNATURE:
+        raise PNGError("not a PNG file")
+    pos = 8
+    header = None
+    palette = None
+    trns = None
+    idat = []
+    while pos + 8 <= len(data):
+        length, ctype = struct.unpack_from(">I4s", data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if ctype == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif ctype == b"PLTE":
+            palette = np.frombuffer(body, dtype=np.uint8).reshape(-1, 3)
+        elif ctype == b"tRNS":
+            trns = body
+        elif ctype == b"IDAT":
+            idat.append(body)
+        elif ctype == b"IEND":
+            break
+    if header is None or not idat:
+        raise PNGError("missing IHDR or IDAT chunk")
+
+    width, height, depth, color_type, _, _, interlace = header
+    if color_type not in _CHANNELS:
+        raise PNGError(f"invalid colour type {color_type}")
+    if interlace:
+        raise PNGError("interlaced PNGs are not supported")
+    channels = _CHANNELS[color_type]
+    bits = channels * depth
+    stride = (width * bits + 7) // 8
+    bpp = max(1, bits // 8)
+
+    try:
+        raw = zlib.decompress(b"".join(idat))
+    except zlib.error as e:
+        raise PNGError(f"corrupt image data: {e}") from e
+    if len(raw) < height * (stride + 1):
+        raise PNGError("truncated image data")
+    samples = _unpack_samples(_unfilter(raw, height, stride, bpp), width, channels, depth)
+
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    if color_type == 3:
+        if palette is None:
+            raise PNGError("palette image without PLTE chunk")
+        lut = np.full((256, 4), 255, dtype=np.uint8)
+        lut[:len(palette), :3] = palette
+        if trns is not None:
+            lut[:len(trns), 3] = np.frombuffer(trns, dtype=np.uint8)
+        return lut[samples[:, :, 0]]
+
+    if depth == 16:
+        scaled = (samples >> 8).astype(np.uint8)
+    elif depth < 8:
+        scaled = (samples * (255 // ((1 << depth) - 1))).astype(np.uint8)
+    else:
+        scaled = samples
+    if color_type in (0, 4):
+        rgba[:, :, :3] = scaled[:, :, :1]
+    else:
+        rgba[:, :, :3] = scaled[:, :, :3]
+    if color_type in (4, 6):
+        rgba[:, :, 3] = scaled[:, :, -1]
+    else:
+        rgba[:, :, 3] = 255
+        if trns is not None:
+            # Colour-key transparency compares raw samples, before scaling.
+            key = np.array(struct.unpack(f">{len(trns) // 2}H", trns), dtype=samples.dtype)
+            rgba[(samples == key).all(axis=2), 3] = 0
+    return rgba
+
+
+def blender_pixels(rgba: np.ndarray) -> np.ndarray:
+    """Return ``rgba`` as the flat float32 buffer ``Image.pixels`` expects.
+
+    Blender stores rows bottom to top with channels in ``[0, 1]``.
+    """
+    flipped = rgba[::-1].reshape(-1)
+    return np.multiply(flipped, 1.0 / 255.0, dtype=np.float32)
+
+
+def pixel_hash(rgba: np.ndarray) -> str:
+    """Return a content hash of decoded pixels, independent of PNG encoding.
+
+    Two files that decode to the same pixels (re-saved, re-compressed or
+    copied into another pack) hash identically.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{rgba.shape[0]}x{rgba.shape[1]}x{rgba.shape[2]}".encode("ascii"))
+    digest.update(np.ascontiguousarray(rgba, dtype=np.uint8).data)
+    return digest.hexdigest()
+
+
+def _chunk(ctype: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + ctype + body + struct.pack(">I", zlib.crc32(ctype + body))
+
+
+def encode_png(rgba: np.ndarray, level: int = 6) -> bytes:
+    """Encode an ``(h, w, 4)`` uint8 array (top row first) as an RGBA PNG."""
+    height, width = rgba.shape[:2]
+    rows = np.empty((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 0] = 0  # filter type None
+    rows[:, 1:] = np.ascontiguousarray(rgba, dtype=np.uint8).reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join((
+        PNG_SIGNATURE,
+        _chunk(b"IHDR", header),
+        _chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+        _chunk(b"IEND", b""),
+    ))
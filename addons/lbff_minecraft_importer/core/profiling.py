@@ -0,0 +1,232 @@
+"""Per-stage profiling of import pipelines.
+
+Operators wrap their ``execute`` in :func:`profiled` and their phases
+(read, decode, mesh, bpy write, material build, ...) in :func:`stage`::
+
+    with stage("decode") as s:
+        rgba = decode_png(data)
+        s.items = 1
+
+While :data:`PROFILER` is enabled each stage becomes a :class:`StageRecord`
+with its wall time, item count and how much the process's resident set
+size changed from its start to its end, kept in a fixed-size ring buffer. Disabled, :func:`stage` hands back a
+shared do-nothing context, so instrumented code pays one attribute check.
+Set ``LBFF_PROFILE=1`` to start enabled, e.g. for headless runs. History
+exports as plain JSON or as a Chrome trace (``chrome://tracing``,
+Perfetto).
+
+This module does not import ``bpy``.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple
+
+from .cache import PathLike
+
+DEFAULT_CAPACITY = 2048
+
+
+class StageRecord(NamedTuple):
+    """One timed stage. Times are ``perf_counter_ns`` values; sizes are bytes.
+
+    ``rss_delta`` is the change in the whole process's resident set size over
+    the stage, so it includes other threads' work and is negative when the
+    stage freed more than it kept.
+    """
+
+    operation: str
+    stage: str
+    start_ns: int
+    duration_ns: int
+    items: int
+    rss_delta: int
+    thread: int
+
+
+def current_rss() -> int:
+    """Return the process's current resident set size in bytes, or 0 if unknown."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "rb") as fh:
+                return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return 0
+    if sys.platform == "darwin":
+        import ctypes
+
+        class BasicInfo(ctypes.Structure):  # mach_task_basic_info
+            _fields_ = [("virtual_size", ctypes.c_uint64), ("resident_size", ctypes.c_uint64),
+                        ("resident_size_max", ctypes.c_uint64), ("times", ctypes.c_int32 * 4),
+                        ("policy", ctypes.c_int32), ("suspend_count", ctypes.c_int32)]
+
+        libc = ctypes.CDLL(None)
+        info = BasicInfo()
+        count = ctypes.c_uint(ctypes.sizeof(info) // 4)
+        task = ctypes.c_uint.in_dll(libc, "mach_task_self_")
+        # 20 is MACH_TASK_BASIC_INFO; 0 is KERN_SUCCESS.
+        if libc.task_info(task, 20, ctypes.byref(info), ctypes.byref(count)) == 0:
+            return info.resident_size
+        return 0
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return 0
+
+
+class _NullStage:
+    """What :meth:`Profiler.stage` returns while disabled; ``items`` is accepted and dropped."""
+
+    __slots__ = ("items",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "operation", "name", "items", "start", "rss")
+
+    def __init__(self, profiler, operation, name, items):
+        self.profiler = profiler
+        self.operation = operation
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.rss = current_rss()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.profiler.records.append(StageRecord(
+            self.operation, self.name, self.start, end - self.start, self.items, current_rss() - self.rss,
+            threading.get_ident(),
+        ))
+        return False
+
+
+class Profiler:
+    """Ring buffer of :class:`StageRecord` filled by :meth:`stage` while ``enabled``.
+
+    ``operation`` names the :meth:`run` in progress; stages entered on worker
+    threads during a run are attributed to it too. Stages that outlive the
+    run, such as those of a modal operator, pass their operation explicitly.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = False):
+        self.enabled = enabled
+        self.records = deque(maxlen=capacity)
+        self.operation = ""
+
+    def stage(self, name: str, items: int = 0, operation: str = ""):
+        """Return a context manager timing stage ``name``; set ``.items`` on it to count work.
+
+        The stage belongs to ``operation``, or to the current :meth:`run`.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, operation or self.operation, name, items)
+
+    def run(self, operation: str):
+        """Like :meth:`stage`, for a whole operation: stages inside it are attributed to ``operation``."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Run(self, operation)
+
+    def history(self) -> List[StageRecord]:
+        """Return the recorded stages, oldest first."""
+        return list(self.records)
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+class _Run(_Stage):
+    __slots__ = ("outer",)
+
+    def __init__(self, profiler, operation):
+        super().__init__(profiler, operation, operation, 0)
+
+    def __enter__(self):
+        self.outer = self.profiler.operation
+        self.profiler.operation = self.operation
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        self.profiler.operation = self.outer
+        return super().__exit__(*exc)
+
+
+PROFILER = Profiler(enabled=os.environ.get("LBFF_PROFILE", "") not in ("", "0"))
+
+
+def stage(name: str, items: int = 0, operation: str = ""):
+    """Shorthand for ``PROFILER.stage(name, items, operation)``."""
+    return PROFILER.stage(name, items, operation)
+
+
+def profiled(execute):
+    """Decorate an operator's ``execute`` so each call is one :meth:`Profiler.run` named by ``bl_idname``."""
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        with PROFILER.run(self.bl_idname):
+            return execute(self, context)
+    return wrapper
+
+
+def history_json(records: List[StageRecord]) -> dict:
+    """Return ``records`` as a JSON-ready dict."""
+    return {"stages": [record._asdict() for record in records]}
+
+
+def chrome_trace(records: List[StageRecord]) -> dict:
+    """Return ``records`` in the Chrome trace event format (complete events, microseconds)."""
+    pid = os.getpid()
+    return {
+        "displayTimeUnit": "ms",
+        "traceEvents": [
+            {
+                "name": record.stage,
+                "cat": record.operation,
+                "ph": "X",
+                "ts": record.start_ns / 1000,
+                "dur": record.duration_ns / 1000,
+                "pid": pid,
+                "tid": record.thread,
+                "args": {"items": record.items, "rss_delta": record.rss_delta},
+            }
+            for record in records
+        ],
+    }
+
+
+def save_profile(path: PathLike, records: List[StageRecord], trace: bool = False) -> None:
+    """Write ``records`` to ``path`` as :func:`history_json`, or :func:`chrome_trace` when ``trace``."""
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(chrome_trace(records) if trace else history_json(records), fh, indent=1)
@@ -0,0 +1,344 @@
+"""Anvil region (``r.X.Z.mca``) reader for the LBFF Minecraft importer.
+
+Each region file starts with an 8 KiB header: 1024 big-endian location
+entries (3-byte sector offset, 1-byte sector count) followed by 1024
+timestamps. The header is parsed into NumPy arrays straight from a memory
+map; chunk payloads are only touched when a chunk is actually read.
+
+:func:`iter_chunks` decompresses payloads in a process pool and yields
+chunks as a stream with a bounded number in flight, so callers never hold a
+whole region (or world) in memory.
+
+This module does not import ``bpy``.
+"""
+
+import gzip
+import mmap
+import os
+import re
+import struct
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .cache import PathLike
+
+SECTOR_BYTES = 4096
+CHUNKS_PER_REGION = 1024
+
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+COMPRESSION_LZ4 = 4
+# High bit of the compression byte: payload lives in an external c.X.Z.mcc file.
+EXTERNAL_FLAG = 0x80
+
+_REGION_NAME = re.compile(r"^r\.(-?\d+)\.(-?\d+)\.mca$")
+
+
+class RegionError(Exception):
+    """Raised when a region file or chunk payload cannot be read."""
+
+
+class ChunkData(NamedTuple):
+    """One decompressed chunk: absolute chunk coords, timestamp and NBT bytes."""
+
+    x: int
+    z: int
+    timestamp: int
+    nbt: bytes
+
+
+def region_coords(path: PathLike) -> Tuple[int, int]:
+    """Return the ``(rx, rz)`` region coordinates encoded in ``r.X.Z.mca``."""
+    match = _REGION_NAME.match(os.path.basename(path))
+    if not match:
+        raise RegionError(f"not a region file name: {path}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def region_files(folder: PathLike) -> List[Path]:
+    """Return the region files in ``folder`` sorted by region coordinates."""
+    paths = [p for p in Path(folder).iterdir() if _REGION_NAME.match(p.name)]
+    return sorted(paths, key=region_coords)
+
+
+# -- LZ4 ---------------------------------------------------------------
+
+def _lz4_block_decompress(src: bytes, size: int) -> bytes:
+    """Decompress one raw LZ4 block of known uncompressed ``size``."""
+    try:
+        import lz4.block
+    except ImportError:
+        pass
+    else:
+        return lz4.block.decompress(src, uncompressed_size=size)
+
+    out = bytearray()
+    pos = 0
+    end = len(src)
+    while pos < end:
+        token = src[pos]
+        pos += 1
+        literal = token >> 4
+        if literal == 15:
+            while True:
+                extra = src[pos]
+                pos += 1
+                literal += extra
+                if extra != 255:
+                    break
+        out += src[pos:pos + literal]
+        pos += literal
+        if pos >= end:
+            break
+        offset = src[pos] | (src[pos + 1] << 8)
+        pos += 2
+        match = token & 0x0F
+        if match == 15:
+            while True:
+                extra = src[pos]
+                pos += 1
+                match += extra
+                if extra != 255:
+                    break
+        match += 4
+        start = len(out) - offset
+        if offset >= match:
+            out += out[start:start + match]
+        else:
+            # Overlapping copy repeats the last ``offset`` bytes.
+            for i in range(match):
+                out.append(out[start + i])
+    if len(out) != size:
+        raise RegionError(f"LZ4 block decoded to {len(out)} bytes, expected {size}")
+    return bytes(out)
+
+
+def lz4_java_decompress(data: bytes) -> bytes:
+    """Decompress an ``LZ4BlockOutputStream`` stream as written by Minecraft."""
+    out = []
+    pos = 0
+    while pos < len(data):
+        if data[pos:pos + 8] != b"LZ4Block":
+            raise RegionError("bad LZ4 block magic")
+        token = data[pos + 8]
+        compressed, original, _checksum = struct.unpack_from("<iii", data, pos + 9)
+        pos += 21
+        body = data[pos:pos + compressed]
+        pos += compressed
+        method = token & 0xF0
+        if original == 0:
+            break  # end-of-stream marker
+        if method == 0x10:
+            out.append(body)
+        elif method == 0x20:
+            out.append(_lz4_block_decompress(body, original))
+        else:
+            raise RegionError(f"unknown LZ4 block method {method:#x}")
+    return b"".join(out)
+
+
+def decompress_payload(compression: int, payload: bytes) -> bytes:
+    """Decompress a chunk payload given its compression byte (without 0x80)."""
+    try:
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(payload)
+        if compression == COMPRESSION_GZIP:
+            return gzip.decompress(payload)
+        if compression == COMPRESSION_NONE:
+            return payload
+        if compression == COMPRESSION_LZ4:
+            return lz4_java_decompress(payload)
+    except (zlib.error, OSError, EOFError, IndexError, struct.error) as e:
+        raise RegionError(f"corrupt chunk payload: {e}") from e
+    raise RegionError(f"unsupported chunk compression {compression}")
+
+
+# -- region files ------------------------------------------------------
+
+class RegionFile:
+    """Memory-mapped region file with its header parsed into arrays.
+
+    Attributes:
+        offsets: ``(32, 32)`` int array of payload sector offsets, indexed
+            ``[local_z, local_x]``; 0 means the chunk is absent.
+        sectors: ``(32, 32)`` sector counts.
+        timestamps: ``(32, 32)`` last-modified epoch seconds.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.rx, self.rz = region_coords(self.path)
+        self._file = None
+        self._mmap = None
+        self.offsets = np.zeros((32, 32), dtype=np.int64)
+        self.sectors = np.zeros((32, 32), dtype=np.int64)
+        self.timestamps = np.zeros((32, 32), dtype=np.int64)
+
+    def open(self) -> "RegionFile":
+        """Map the file and parse its location and timestamp tables."""
+        if self._mmap is not None:
+            return self
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < 2 * SECTOR_BYTES:
+            # Empty or truncated regions contain no chunks.
+            self._file.close()
+            self._file = None
+            return self
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        locations = np.frombuffer(self._mmap, dtype=">u4", count=CHUNKS_PER_REGION).astype(np.int64)
+        self.offsets = (locations >> 8).reshape(32, 32)
+        self.sectors = (locations & 0xFF).reshape(32, 32)
+        self.timestamps = np.frombuffer(
+            self._mmap, dtype=">u4", count=CHUNKS_PER_REGION, offset=SECTOR_BYTES
+        ).astype(np.int64).reshape(32, 32)
+        return self
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RegionFile":
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def present(self) -> List[Tuple[int, int]]:
+        """Return ``(local_x, local_z)`` of every chunk with a payload."""
+        zs, xs = np.nonzero(self.offsets)
+        return list(zip(xs.tolist(), zs.tolist()))
+
+    def raw_chunk(self, local_x: int, local_z: int) -> Optional[Tuple[int, bytes]]:
+        """Return ``(compression byte, payload)`` or ``None`` if absent.
+
+        External (``.mcc``) payloads are resolved here.
+        """
+        offset = int(self.offsets[local_z, local_x])
+        if offset == 0 or self._mmap is None:
+            return None
+        start = offset * SECTOR_BYTES
+        length, compression = struct.unpack_from(">IB", self._mmap, start)
+        if compression & EXTERNAL_FLAG:
+            cx, cz = self.rx * 32 + local_x, self.rz * 32 + local_z
+            external = self.path.with_name(f"c.{cx}.{cz}.mcc")
+            try:
+                payload = external.read_bytes()
+            except OSError as e:
+                raise RegionError(f"missing external chunk {external}: {e}") from e
+            return compression & ~EXTERNAL_FLAG, payload
+        if length < 1 or start + 4 + length > len(self._mmap):
+            raise RegionError(f"chunk ({local_x}, {local_z}) in {self.path} overruns the file")
+        return compression, self._mmap[start + 5:start + 4 + length]
+
+    def read_chunk(self, local_x: int, local_z: int) -> Optional[ChunkData]:
+        """Decompress and return one chunk, or ``None`` if absent."""
+        raw = self.raw_chunk(local_x, local_z)
+        if raw is None:
+            return None
+        return ChunkData(
+            self.rx * 32 + local_x,
+            self.rz * 32 + local_z,
+            int(self.timestamps[local_z, local_x]),
+            decompress_payload(*raw),
+        )
+
+
+def chunk_timestamps(paths: Iterable[PathLike]) -> Dict[Tuple[int, int], int]:
+    """Return ``(chunk x, chunk z) -> timestamp`` for every present chunk.
+
+    Only region headers are read.
+    """
+    stamps = {}
+    for path in paths:
+        with RegionFile(path) as region:
+            zs, xs = np.nonzero(region.offsets)
+            for lx, lz in zip(xs.tolist(), zs.tolist()):
+                stamps[region.rx * 32 + lx, region.rz * 32 + lz] = int(region.timestamps[lz, lx])
+    return stamps
+
+
+# -- parallel streaming ------------------------------------------------
+
+def _read_chunks(path: str, locals_: List[Tuple[int, int]]) -> List[ChunkData]:
+    """Worker entry point: decompress a batch of chunks from one region.
+
+    Only the path and local coords cross the process boundary on the way
+    in; each worker maps the file itself.
+    """
+    with RegionFile(path) as region:
+        chunks = []
+        for lx, lz in locals_:
+            chunk = region.read_chunk(lx, lz)
+            if chunk is not None:
+                chunks.append(chunk)
+        return chunks
+
+
+def chunk_jobs(paths: Iterable[PathLike], batch: int = 32,
+               select=None) -> Iterator[Tuple[str, List[Tuple[int, int]]]]:
+    """Yield ``(region path, [(local_x, local_z), ...])`` batches to decode.
+
+    Only headers are read here. ``select(region, local_x, local_z)`` may
+    filter chunks before any payload is touched.
+    """
+    for path in paths:
+        with RegionFile(path) as region:
+            present = region.present()
+            if select is not None:
+                present = [(lx, lz) for lx, lz in present if select(region, lx, lz)]
+        for i in range(0, len(present), batch):
+            yield str(path), present[i:i + batch]
+
+
+def iter_chunks(paths: Iterable[PathLike], workers: Optional[int] = None, batch: int = 32,
+                max_in_flight: Optional[int] = None, select=None) -> Iterator[ChunkData]:
+    """Stream decompressed chunks from ``paths`` using a process pool.
+
+    Args:
+        paths: region files to read.
+        workers: pool size (default: ``os.cpu_count()``); ``0`` decodes
+            serially in the calling process.
+        batch: chunks per worker task, amortising inter-process overhead.
+        max_in_flight: cap on submitted-but-unconsumed tasks (default:
+            ``2 * workers``); bounds peak memory.
+        select: optional ``select(region, local_x, local_z) -> bool`` filter
+            applied to headers before decoding.
+
+    Yields:
+        :class:`ChunkData` in completion order.
+
+    Note:
+        Workers import this module by name. Where the platform spawns rather
+        than forks workers, that import must not pull in ``bpy``.
+    """
+    jobs = chunk_jobs(paths, batch, select)
+    if workers == 0:
+        for path, locals_ in jobs:
+            yield from _read_chunks(path, locals_)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    limit = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for path, locals_ in jobs:
+            pending.add(pool.submit(_read_chunks, path, locals_))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
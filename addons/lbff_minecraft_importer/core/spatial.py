@@ -0,0 +1,209 @@
+"""Spatial index over a world's regions and chunk headers.
+
+A world folder is indexed by region coordinates from the ``r.X.Z.mca``
+file names alone. Selective imports test an area (a block-coordinate box
+or a radius) against each region's footprint first, so region files
+outside it are never opened. Inside the remaining regions the 32x32
+location table is tested in one vectorized step: absent chunks (zero
+offsets) and chunks outside the area are dropped before any payload is
+read.
+
+Camera culling uses the same interface: :class:`FrustumArea` tests chunk
+columns (full world height) against the planes of a camera frustum, pushed
+outwards by a margin so nearby shadow casters survive.
+
+The player position for radius imports comes from ``level.dat``.
+
+This module does not import ``bpy``.
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cache import PathLike
+from .nbt import NBTError, load_nbt_file
+from .region import RegionFile, region_coords, region_files
+
+CHUNK_BLOCKS = 16
+REGION_CHUNKS = 32
+REGION_BLOCKS = CHUNK_BLOCKS * REGION_CHUNKS
+# Region folder of each dimension inside a world save.
+DIMENSIONS = {
+    'OVERWORLD': "region",
+    'NETHER': os.path.join("DIM-1", "region"),
+    'END': os.path.join("DIM1", "region"),
+}
+
+# Overworld build limits; chunk columns are tested over this height.
+WORLD_MIN_Y = -64
+WORLD_MAX_Y = 320
+
+
+class BoxArea(NamedTuple):
+    """Inclusive block-coordinate rectangle on the X/Z plane."""
+
+    min_x: int
+    min_z: int
+    max_x: int
+    max_z: int
+
+    def overlaps(self, x0, z0, x1, z1):
+        """Vectorized test against half-open block boxes ``[x0, x1) x [z0, z1)``."""
+        lo_x, hi_x = sorted((self.min_x, self.max_x))
+        lo_z, hi_z = sorted((self.min_z, self.max_z))
+        return (x0 <= hi_x) & (x1 > lo_x) & (z0 <= hi_z) & (z1 > lo_z)
+
+
+class RadiusArea(NamedTuple):
+    """Blocks within ``radius`` of ``(x, z)`` on the X/Z plane."""
+
+    x: float
+    z: float
+    radius: float
+
+    def overlaps(self, x0, z0, x1, z1):
+        """Vectorized test against half-open block boxes ``[x0, x1) x [z0, z1)``."""
+        dx = np.maximum(np.maximum(x0 - self.x, self.x - x1), 0)
+        dz = np.maximum(np.maximum(z0 - self.z, self.z - z1), 0)
+        return dx * dx + dz * dz <= self.radius * self.radius
+
+
+class FrustumArea(NamedTuple):
+    """Chunk columns intersecting a convex volume bounded by planes.
+
+    ``planes`` are ``(a, b, c, d)`` in Minecraft ``(x, y, z)`` with inward
+    normals: a point is inside when ``a*x + b*y + c*z + d >= 0`` for every
+    plane. Columns span ``min_y..max_y``.
+    """
+
+    planes: Tuple[Tuple[float, float, float, float], ...]
+    min_y: float = WORLD_MIN_Y
+    max_y: float = WORLD_MAX_Y
+
+    def overlaps(self, x0, z0, x1, z1):
+        """Vectorized test against block columns ``[x0, x1) x [z0, z1)``.
+
+        Uses the corner furthest along each plane normal, so the test is
+        conservative: a box straddling two planes near a frustum corner may
+        pass without being visible.
+        """
+        inside = True
+        for a, b, c, d in self.planes:
+            px = x1 if a >= 0 else x0
+            py = self.max_y if b >= 0 else self.min_y
+            pz = z1 if c >= 0 else z0
+            inside = inside & (a * px + b * py + c * pz + d >= 0)
+        return inside
+
+
+def frustum_planes(view_projection: Sequence[Sequence[float]], margin: float = 0.0):
+    """Extract the six frustum planes of a Blender view-projection matrix.
+
+    ``view_projection`` is the 4x4 ``projection @ view`` matrix (OpenGL
+    clip conventions) in Blender space. Planes are normalised, moved
+    ``margin`` blocks outwards and converted to Minecraft axes, ready for
+    :class:`FrustumArea`.
+    """
+    m = np.asarray(view_projection, dtype=np.float64).reshape(4, 4)
+    planes = []
+    for row, sign in ((0, 1), (0, -1), (1, 1), (1, -1), (2, 1), (2, -1)):
+        a, b, c, d = m[3] + sign * m[row]
+        length = float(np.sqrt(a * a + b * b + c * c)) or 1.0
+        # Blender (x, y, z) = Minecraft (x, -z, y).
+        planes.append((a / length, c / length, -b / length, d / length + margin))
+    return tuple(planes)
+
+
+Area = Union[BoxArea, RadiusArea, FrustumArea]
+
+# Chunk offsets within a region, indexed [local_z, local_x] like the header.
+_LOCAL_Z, _LOCAL_X = np.mgrid[0:REGION_CHUNKS, 0:REGION_CHUNKS]
+
+
+class WorldIndex:
+    """Region/chunk lookup for one dimension's ``region`` folder.
+
+    Args:
+        folder: the dimension's region folder.
+    """
+
+    def __init__(self, folder: PathLike):
+        self.folder = Path(folder)
+        self.regions: Dict[Tuple[int, int], Path] = {region_coords(p): p for p in region_files(folder)}
+
+    def region_paths(self, area: Optional[Area] = None) -> List[Path]:
+        """Return region files whose footprint intersects ``area`` (all if ``None``)."""
+        if area is None:
+            return list(self.regions.values())
+        return [path for (rx, rz), path in self.regions.items()
+                if area.overlaps(rx * REGION_BLOCKS, rz * REGION_BLOCKS,
+                                 (rx + 1) * REGION_BLOCKS, (rz + 1) * REGION_BLOCKS)]
+
+    @staticmethod
+    def chunk_mask(region: RegionFile, area: Optional[Area] = None) -> np.ndarray:
+        """Return the ``(32, 32)`` ``[local_z, local_x]`` mask of present chunks in ``area``."""
+        mask = region.offsets != 0
+        if area is not None:
+            x0 = (region.rx * REGION_CHUNKS + _LOCAL_X) * CHUNK_BLOCKS
+            z0 = (region.rz * REGION_CHUNKS + _LOCAL_Z) * CHUNK_BLOCKS
+            mask &= area.overlaps(x0, z0, x0 + CHUNK_BLOCKS, z0 + CHUNK_BLOCKS)
+        return mask
+
+    def chunk_timestamps(self, area: Optional[Area] = None) -> Dict[Tuple[int, int], int]:
+        """Return ``(chunk x, chunk z) -> header timestamp`` for present chunks in ``area``."""
+        stamps = {}
+        for path in self.region_paths(area):
+            with RegionFile(path) as region:
+                zs, xs = np.nonzero(self.chunk_mask(region, area))
+                for lx, lz, ts in zip(xs.tolist(), zs.tolist(), region.timestamps[zs, xs].tolist()):
+                    stamps[region.rx * REGION_CHUNKS + lx, region.rz * REGION_CHUNKS + lz] = ts
+        return stamps
+
+    def contains(self, area: Optional[Area]) -> Callable[[Tuple[int, int]], bool]:
+        """Return a ``(chunk x, chunk z) -> bool`` test for ``area``."""
+        if area is None:
+            return lambda key: True
+
+        def test(key):
+            x0, z0 = key[0] * CHUNK_BLOCKS, key[1] * CHUNK_BLOCKS
+            return bool(area.overlaps(x0, z0, x0 + CHUNK_BLOCKS, z0 + CHUNK_BLOCKS))
+        return test
+
+
+class PlayerPosition(NamedTuple):
+    """Player (or world spawn) position from ``level.dat``."""
+
+    x: float
+    y: float
+    z: float
+    dimension: str
+
+
+_LEVEL_SELECT = ("Data.Player.Pos", "Data.Player.Dimension", "Data.SpawnX", "Data.SpawnY", "Data.SpawnZ")
+
+
+def player_position(world: PathLike) -> Optional[PlayerPosition]:
+    """Return the single-player position from ``world/level.dat``.
+
+    Server worlds have no player entry; their spawn point is returned
+    instead. ``None`` if ``level.dat`` is missing or unreadable.
+    """
+    try:
+        data = load_nbt_file(os.path.join(world, "level.dat"), _LEVEL_SELECT).get("Data", {})
+    except (OSError, NBTError, EOFError) as e:
+        print(f"[LBFF Minecraft Importer] Could not read level.dat: {e}")
+        return None
+    player = data.get("Player")
+    if player and len(player.get("Pos", ())) == 3:
+        x, y, z = player["Pos"]
+        dimension = player.get("Dimension", "minecraft:overworld")
+        if isinstance(dimension, int):  # pre-1.16 numeric ids
+            dimension = {-1: "minecraft:the_nether", 1: "minecraft:the_end"}.get(dimension, "minecraft:overworld")
+        return PlayerPosition(float(x), float(y), float(z), dimension)
+    if "SpawnX" in data:
+        return PlayerPosition(float(data["SpawnX"]), float(data.get("SpawnY", 64)), float(data.get("SpawnZ", 0)),
+                              "minecraft:overworld")
+    return None
@@ -0,0 +1,128 @@
+"""Batch decoding of pack textures in worker processes.
+
+:func:`decode_texture` turns the bytes of a texture and its optional
+``.mcmeta`` animation sidecar into RGBA pixels, a content hash and the
+animation metadata. Most encoders emit Average and Paeth filtered rows,
+whose reconstruction (see :mod:`.png`) is Python and small-array NumPy work
+that holds the GIL, so threads would decode one texture at a time;
+:func:`decode_textures` spreads a batch over a process pool instead. Members
+are read from the pack stack on the calling thread, one window ahead of the
+workers, and results come back in order.
+
+This module does not import ``bpy``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .animation import AnimationMeta, parse_mcmeta
+from .png import PNGError, decode_png, pixel_hash
+from .profiling import stage
+from .resource_pack import ResourcePackError
+
+# Textures per read-ahead window, and the batch size below which the pool
+# costs more to start than it saves.
+DECODE_WINDOW = 256
+POOL_MIN_TEXTURES = 16
+
+
+class DecodedTexture(NamedTuple):
+    """Result of :func:`decode_texture`; ``error`` is set when reading or decoding failed."""
+
+    member: str
+    rgba: Optional[np.ndarray]
+    digest: Optional[str]
+    meta: Optional[AnimationMeta]
+    error: Optional[Exception]
+
+
+def decode_texture(member: str, data: bytes, sidecar: Optional[bytes] = None) -> DecodedTexture:
+    """Decode and hash one texture; failures are returned rather than raised."""
+    try:
+        rgba = decode_png(data)
+        meta = None
+        if sidecar is not None:
+            meta = parse_mcmeta(sidecar, rgba.shape[1], rgba.shape[0])
+        return DecodedTexture(member, rgba, pixel_hash(rgba), meta, None)
+    except (PNGError, ValueError, KeyError) as e:
+        return DecodedTexture(member, None, None, None, e)
+
+
+def read_texture(stack, member: str) -> Tuple[str, bytes, Optional[bytes]]:
+    """Return ``(member, data, sidecar)`` from ``stack``; raises like ``stack.read``."""
+    sidecar = member + ".mcmeta"
+    with stage("read", 1):
+        return member, stack.read(member), stack.read(sidecar) if sidecar in stack else None
+
+
+def load_texture(stack, member: str) -> DecodedTexture:
+    """Read and decode one texture on the calling thread."""
+    try:
+        read = read_texture(stack, member)
+    except (OSError, ResourcePackError, KeyError) as e:
+        return DecodedTexture(member, None, None, None, e)
+    with stage("decode", 1):
+        return decode_texture(*read)
+
+
+def _decode_read(read) -> DecodedTexture:
+    # Worker entry point; read errors are passed through as results.
+    return read if isinstance(read, DecodedTexture) else decode_texture(*read)
+
+
+def _read_window(stack, members: Sequence[str]):
+    reads = []
+    for member in members:
+        try:
+            reads.append(read_texture(stack, member))
+        except (OSError, ResourcePackError, KeyError) as e:
+            reads.append(DecodedTexture(member, None, None, None, e))
+    return reads
+
+
+def _timed(results) -> Iterator[DecodedTexture]:
+    # Times the wait for each decoded texture.
+    while True:
+        with stage("decode", 1):
+            tex = next(results, None)
+        if tex is None:
+            return
+        yield tex
+
+
+def decode_textures(stack, members: Sequence[str], workers: Optional[int] = None) -> Iterator[DecodedTexture]:
+    """Yield a :class:`DecodedTexture` for every member, in order.
+
+    Args:
+        stack: an open :class:`.resource_pack.PackStack`.
+        members: texture member names.
+        workers: decode processes (default: ``os.cpu_count()``). One
+            process, ``0``, or fewer than :data:`POOL_MIN_TEXTURES` members
+            decode serially on the calling thread.
+
+    Note:
+        Workers import this module by name. Where the platform spawns rather
+        than forks workers, that import must not pull in ``bpy``.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(members) < POOL_MIN_TEXTURES:
+        for member in members:
+            yield load_texture(stack, member)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = None
+        for start in range(0, len(members), DECODE_WINDOW):
+            reads = _read_window(stack, members[start:start + DECODE_WINDOW])
+            # This window was read while the workers decoded the previous
+            # one; submit it before handing that one out to keep them busy.
+            results = pool.map(_decode_read, reads, chunksize=8)
+            if pending is not None:
+                yield from _timed(pending)
+            pending = results
+        if pending is not None:
+            yield from _timed(pending)
@@ -0,0 +1,288 @@
+"""Blender datablock helpers for the LBFF Minecraft importer.
+
+Everything here runs on Blender's main thread. Pixel data arrives already
+decoded (see :mod:`.core.png`) and is handed to ``Image.pixels`` in one bulk
+``foreach_set`` call.
+
+:class:`DatablockCache` deduplicates by content: images are keyed by a hash
+of their decoded pixels and materials by ``(image hash, shader settings)``.
+The keys are stored as custom properties on the datablocks, so re-imports
+and imports of packs that share textures with vanilla reuse what is already
+in the .blend instead of creating ``.001`` copies.
+
+Animated textures either keep their frame strip as one image and animate a
+Mapping node's offset (:func:`add_frame_offset_animation`), or, when frames
+must be blended, use an image sequence of pre-rendered frames.
+
+Chunk meshes from :mod:`.core.mesher` are written with :func:`mesh_from_data`,
+which fills vertices, loops, polygons and UVs with one ``foreach_set`` per
+attribute instead of ``from_pydata``'s per-element Python lists.
+
+Biome tints (see :mod:`.core.biomes`) are a face-corner colour attribute;
+materials built with ``MaterialSettings(tint=True)`` multiply their texture
+by it, so one material per texture serves every biome.
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import bpy
+import numpy as np
+
+from .core.mesher import MeshData
+from .core.png import blender_pixels, pixel_hash
+
+# Custom property names used as cache keys on datablocks.
+IMAGE_HASH_PROP = "lbff_pixel_hash"
+MATERIAL_KEY_PROP = "lbff_material_key"
+# JSON texture -> (page, u0, v0, u1, v1) table stored on atlas materials.
+ATLAS_UV_TABLE_PROP = "lbff_atlas_uv_table"
+# Face-corner (meshes) and point (instance clouds) tint colour attribute.
+TINT_ATTRIBUTE = "lbff_tint"
+
+
+class MaterialSettings(NamedTuple):
+    """Shader settings that distinguish otherwise identical materials."""
+
+    interpolation: str = 'Closest'
+    blend_method: str = 'CLIP'
+    tint: bool = False
+
+    def key(self) -> str:
+        key = f"{self.interpolation}/{self.blend_method}"
+        return key + "/tint" if self.tint else key
+
+
+def image_from_rgba(name: str, rgba: np.ndarray, digest: Optional[str] = None) -> bpy.types.Image:
+    """Create a packed image datablock from an ``(h, w, 4)`` uint8 array.
+
+    ``digest`` (see :func:`.core.png.pixel_hash`) is stored on the image so later
+    imports can find it.
+    """
+    height, width = rgba.shape[:2]
+    image = bpy.data.images.new(name, width, height, alpha=True)
+    image.pixels.foreach_set(blender_pixels(rgba))
+    # Generated images are lost on save unless packed.
+    image.pack()
+    if digest is not None:
+        image[IMAGE_HASH_PROP] = digest
+    return image
+
+
+def build_material(name: str, image: bpy.types.Image,
+                   settings: MaterialSettings = MaterialSettings()) -> bpy.types.Material:
+    """Create a Principled BSDF material sampling ``image``."""
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    bsdf = nodes.get("Principled BSDF")
+    tex = nodes.new("ShaderNodeTexImage")
+    tex.image = image
+    # Minecraft textures are pixel art; linear filtering blurs them.
+    tex.interpolation = settings.interpolation
+    tex.location = (-400, 300)
+    links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
+    links.new(tex.outputs["Alpha"], bsdf.inputs["Alpha"])
+    mat.blend_method = settings.blend_method
+    if settings.tint:
+        _add_tint(mat, tex, bsdf)
+    return mat
+
+
+def _add_tint(mat: bpy.types.Material, tex, bsdf) -> None:
+    """Multiply the base colour by the :data:`TINT_ATTRIBUTE` colour.
+
+    Chunk meshes carry the tint with alpha 1. Instancing prototypes are
+    shared between biomes, so their tinted corners have alpha 0 and take
+    the colour of the instancing point through the Instancer attribute.
+    """
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    corner = nodes.new("ShaderNodeAttribute")
+    corner.attribute_name = TINT_ATTRIBUTE
+    corner.location = (-700, 0)
+    instancer = nodes.new("ShaderNodeAttribute")
+    instancer.attribute_type = 'INSTANCER'
+    instancer.attribute_name = TINT_ATTRIBUTE
+    instancer.location = (-700, -200)
+    pick = nodes.new("ShaderNodeMixRGB")
+    pick.location = (-400, 0)
+    links.new(corner.outputs["Alpha"], pick.inputs["Fac"])
+    links.new(instancer.outputs["Color"], pick.inputs["Color1"])
+    links.new(corner.outputs["Color"], pick.inputs["Color2"])
+    multiply = nodes.new("ShaderNodeMixRGB")
+    multiply.blend_type = 'MULTIPLY'
+    multiply.inputs["Fac"].default_value = 1.0
+    multiply.location = (-200, 300)
+    links.new(tex.outputs["Color"], multiply.inputs["Color1"])
+    links.new(pick.outputs["Color"], multiply.inputs["Color2"])
+    links.new(multiply.outputs["Color"], bsdf.inputs["Base Color"])
+
+
+def _image_node(mat: bpy.types.Material) -> bpy.types.ShaderNodeTexImage:
+    return next(node for node in mat.node_tree.nodes if node.type == 'TEX_IMAGE')
+
+
+def add_frame_offset_animation(mat: bpy.types.Material, strip_size: Tuple[int, int],
+                               frame_size: Tuple[int, int],
+                               keys: Sequence[Tuple[int, int, int]]) -> None:
+    """Show one frame of a strip image and step through frames over time.
+
+    A Mapping node scales UVs down to one frame; its location is keyed with
+    constant interpolation at every scene frame where the displayed strip
+    frame changes. Keyframes are written in bulk with ``foreach_set``.
+
+    Args:
+        mat: material created by :func:`build_material` on the strip image.
+        strip_size: strip ``(width, height)`` in pixels.
+        frame_size: frame ``(width, height)`` in pixels.
+        keys: ``(scene frame, x, y)`` top-left pixel of the displayed frame.
+    """
+    width, height = strip_size
+    frame_w, frame_h = frame_size
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    tex = _image_node(mat)
+    coords = nodes.new("ShaderNodeTexCoord")
+    coords.location = (-900, 300)
+    mapping = nodes.new("ShaderNodeMapping")
+    mapping.location = (-700, 300)
+    mapping.inputs["Scale"].default_value = (frame_w / width, frame_h / height, 1.0)
+    links.new(coords.outputs["UV"], mapping.inputs["Vector"])
+    links.new(mapping.outputs["Vector"], tex.inputs["Vector"])
+
+    # Blender UVs start at the bottom-left; strip pixels at the top-left.
+    offsets = np.array(
+        [(frame, x / width, 1.0 - (y + frame_h) / height) for frame, x, y in keys],
+        dtype=np.float32,
+    )
+    if len(offsets) == 0:
+        return
+    mapping.inputs["Location"].default_value = (offsets[0, 1], offsets[0, 2], 0.0)
+    tree = mat.node_tree
+    anim = tree.animation_data or tree.animation_data_create()
+    anim.action = bpy.data.actions.new(f"{mat.name}_frames")
+    data_path = mapping.inputs["Location"].path_from_id("default_value")
+    constant = [0] * len(offsets)  # 'CONSTANT' is the first interpolation enum item
+    for axis in (0, 1):
+        fcurve = anim.action.fcurves.new(data_path, index=axis)
+        fcurve.keyframe_points.add(len(offsets))
+        fcurve.keyframe_points.foreach_set("co", offsets[:, [0, axis + 1]].ravel())
+        fcurve.keyframe_points.foreach_set("interpolation", constant)
+        fcurve.update()
+
+
+def use_image_sequence(mat: bpy.types.Material, frame_count: int) -> None:
+    """Make ``mat``'s image node play its sequence image from scene frame 1.
+
+    Sequence files are numbered by scene frame, so frame ``n`` shows file
+    ``n``; frames after the last file hold the final frame.
+    """
+    user = _image_node(mat).image_user
+    user.frame_start = 1
+    user.frame_offset = 0
+    user.frame_duration = frame_count
+    user.use_auto_refresh = True
+
+
+def mesh_from_data(name: str, data: MeshData,
+                   materials: Sequence[bpy.types.Material] = ()) -> bpy.types.Mesh:
+    """Create a mesh datablock from :class:`.core.mesher.MeshData` buffers.
+
+    ``materials`` are appended as slots in the order of ``data.materials``;
+    ``data.colors`` becomes the :data:`TINT_ATTRIBUTE` corner colours.
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(data.vertices))
+    mesh.vertices.foreach_set("co", data.vertices.ravel())
+    mesh.loops.add(len(data.loops))
+    mesh.loops.foreach_set("vertex_index", data.loops)
+    mesh.polygons.add(len(data.loop_starts))
+    mesh.polygons.foreach_set("loop_start", data.loop_starts)
+    try:
+        mesh.polygons.foreach_set("loop_total", data.loop_totals)
+    except (AttributeError, RuntimeError, TypeError):
+        pass  # read-only since Blender 4.0, derived from loop_start
+    mesh.polygons.foreach_set("material_index", data.material_indices)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", data.uvs.ravel())
+    if data.colors is not None:
+        tint = mesh.attributes.new(TINT_ATTRIBUTE, 'FLOAT_COLOR', 'CORNER')
+        tint.data.foreach_set("color", data.colors.ravel())
+    for mat in materials:
+        mesh.materials.append(mat)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+class DatablockCache:
+    """Content-addressed lookup of images and materials in ``bpy.data``.
+
+    The existing datablocks are scanned once on construction; create one
+    cache per import rather than keeping it across undo steps, which may
+    invalidate the stored references.
+    """
+
+    def __init__(self):
+        self.images: Dict[str, bpy.types.Image] = {}
+        self.materials: Dict[str, bpy.types.Material] = {}
+        self.reused = 0
+        self.created = 0
+        for image in bpy.data.images:
+            digest = image.get(IMAGE_HASH_PROP)
+            if digest:
+                self.images.setdefault(digest, image)
+        for mat in bpy.data.materials:
+            key = mat.get(MATERIAL_KEY_PROP)
+            if key:
+                self.materials.setdefault(key, mat)
+
+    def image(self, name: str, rgba: np.ndarray, digest: Optional[str] = None) -> bpy.types.Image:
+        """Return the image with ``rgba``'s content, creating it if needed."""
+        if digest is None:
+            digest = pixel_hash(rgba)
+        image = self.images.get(digest)
+        if image is not None:
+            self.reused += 1
+            return image
+        image = image_from_rgba(name, rgba, digest)
+        self.images[digest] = image
+        self.created += 1
+        return image
+
+    def sequence_image(self, digest: str, first_frame: str) -> bpy.types.Image:
+        """Return the image sequence stored under ``digest``, loading it if needed.
+
+        ``first_frame`` is the path of the first file of the sequence.
+        """
+        image = self.images.get(digest)
+        if image is not None:
+            self.reused += 1
+            return image
+        image = bpy.data.images.load(first_frame)
+        image.source = 'SEQUENCE'
+        image[IMAGE_HASH_PROP] = digest
+        self.images[digest] = image
+        self.created += 1
+        return image
+
+    def material_for_key(self, key: str, factory: Callable[[], bpy.types.Material]) -> bpy.types.Material:
+        """Return the material stored under ``key``, calling ``factory`` if missing."""
+        mat = self.materials.get(key)
+        if mat is not None:
+            self.reused += 1
+            return mat
+        mat = factory()
+        mat[MATERIAL_KEY_PROP] = key
+        self.materials[key] = mat
+        self.created += 1
+        return mat
+
+    def material(self, name: str, image: bpy.types.Image,
+                 settings: MaterialSettings = MaterialSettings()) -> bpy.types.Material:
+        """Return the material for ``(image hash, settings)``, creating it if needed.
+
+        Images without a content hash are keyed by datablock name instead.
+        """
+        key = f"{image.get(IMAGE_HASH_PROP) or 'name:' + image.name}|{settings.key()}"
+        return self.material_for_key(key, lambda: build_material(name, image, settings))
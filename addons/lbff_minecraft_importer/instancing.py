@@ -0,0 +1,135 @@
+"""Geometry Nodes instancing for repeated block models.
+
+Small models such as torches, plants and lanterns appear tens of thousands
+of times in a world. Instead of copying their quads into every chunk mesh,
+each unique model becomes one prototype object in a hidden collection, and
+each chunk gets a vertex-only point cloud carrying per-point
+``lbff_model`` (prototype index) and ``lbff_rotation`` (Euler) attributes.
+A shared node group instances the prototypes onto those points, so vertex
+memory and .blend size scale with the number of unique models.
+
+The generated node group uses the Named Attribute node (Blender 3.2+).
+"""
+
+from typing import Sequence
+
+import bpy
+
+from .datablocks import TINT_ATTRIBUTE, mesh_from_data
+from .core.mesher import InstancePoints, MeshData
+
+MODEL_ATTRIBUTE = "lbff_model"
+ROTATION_ATTRIBUTE = "lbff_rotation"
+NODE_GROUP_NAME = "LBFF Block Instances"
+# Custom property naming the prototype collection a node group instances.
+PROTOTYPES_PROP = "lbff_prototypes"
+
+
+def prototype_collection(name: str) -> bpy.types.Collection:
+    """Create the (unlinked) collection that holds the prototype objects.
+
+    It is not linked to the scene; prototypes only render through
+    instances, and the node group referencing it keeps it saved.
+    """
+    return bpy.data.collections.new(name)
+
+
+def add_prototype(collection: bpy.types.Collection, index: int, data: MeshData,
+                  materials: Sequence[bpy.types.Material] = ()) -> bpy.types.Object:
+    """Add prototype ``index`` to ``collection``.
+
+    Collection Info orders separated children by name, so objects are named
+    with zero-padded indices to keep ``lbff_model`` values aligned.
+    """
+    mesh = mesh_from_data(f"{collection.name}_{index:05d}", data, materials)
+    obj = bpy.data.objects.new(mesh.name, mesh)
+    collection.objects.link(obj)
+    return obj
+
+
+def point_cloud_mesh(name: str, points: InstancePoints) -> bpy.types.Mesh:
+    """Create a vertex-only mesh with the instance attributes written in bulk.
+
+    Point tints become a :data:`.datablocks.TINT_ATTRIBUTE` point attribute,
+    which instancing copies onto the instances for the shader to read.
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points.positions))
+    mesh.vertices.foreach_set("co", points.positions.ravel())
+    model = mesh.attributes.new(MODEL_ATTRIBUTE, 'INT', 'POINT')
+    model.data.foreach_set("value", points.prototypes)
+    rotation = mesh.attributes.new(ROTATION_ATTRIBUTE, 'FLOAT_VECTOR', 'POINT')
+    rotation.data.foreach_set("vector", points.rotations.ravel())
+    if points.colors is not None:
+        tint = mesh.attributes.new(TINT_ATTRIBUTE, 'FLOAT_COLOR', 'POINT')
+        tint.data.foreach_set("color", points.colors.ravel())
+    mesh.update()
+    return mesh
+
+
+def _new_socket(group, in_out: str, name: str, socket_type: str) -> None:
+    try:
+        group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    except AttributeError:
+        # Blender 3.x
+        sockets = group.inputs if in_out == 'INPUT' else group.outputs
+        sockets.new(socket_type, name)
+
+
+def _attribute_output(node):
+    # 3.x exposes one "Attribute" output per data type; only the active one is enabled.
+    return next(s for s in node.outputs if s.enabled)
+
+
+def instancing_node_group(prototypes: bpy.types.Collection) -> bpy.types.NodeTree:
+    """Return the node group instancing ``prototypes`` children onto points.
+
+    A group made for the same collection by an earlier import is reused.
+    """
+    for group in bpy.data.node_groups:
+        if group.get(PROTOTYPES_PROP) == prototypes.name:
+            return group
+    group = bpy.data.node_groups.new(NODE_GROUP_NAME, 'GeometryNodeTree')
+    _new_socket(group, 'INPUT', "Geometry", 'NodeSocketGeometry')
+    _new_socket(group, 'OUTPUT', "Geometry", 'NodeSocketGeometry')
+    nodes = group.nodes
+    links = group.links
+
+    group_in = nodes.new("NodeGroupInput")
+    group_in.location = (-600, 0)
+    group_out = nodes.new("NodeGroupOutput")
+    group_out.location = (400, 0)
+
+    info = nodes.new("GeometryNodeCollectionInfo")
+    info.location = (-400, -200)
+    info.transform_space = 'ORIGINAL'
+    info.inputs["Collection"].default_value = prototypes
+    info.inputs["Separate Children"].default_value = True
+    info.inputs["Reset Children"].default_value = True
+
+    model = nodes.new("GeometryNodeInputNamedAttribute")
+    model.location = (-400, -400)
+    model.data_type = 'INT'
+    model.inputs["Name"].default_value = MODEL_ATTRIBUTE
+    rotation = nodes.new("GeometryNodeInputNamedAttribute")
+    rotation.location = (-400, -550)
+    rotation.data_type = 'FLOAT_VECTOR'
+    rotation.inputs["Name"].default_value = ROTATION_ATTRIBUTE
+
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    instance.location = (100, 0)
+    instance.inputs["Pick Instance"].default_value = True
+    links.new(group_in.outputs[0], instance.inputs["Points"])
+    links.new(info.outputs[0], instance.inputs["Instance"])
+    links.new(_attribute_output(model), instance.inputs["Instance Index"])
+    links.new(_attribute_output(rotation), instance.inputs["Rotation"])
+    links.new(instance.outputs["Instances"], group_out.inputs[0])
+    group[PROTOTYPES_PROP] = prototypes.name
+    return group
+
+
+def add_instancing_modifier(obj: bpy.types.Object, group: bpy.types.NodeTree) -> bpy.types.Modifier:
+    """Add a Geometry Nodes modifier running ``group`` to ``obj``."""
+    modifier = obj.modifiers.new("LBFF Instances", 'NODES')
+    modifier.node_group = group
+    return modifier
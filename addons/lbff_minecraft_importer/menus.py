@@ -1,10 +1,16 @@
 """Menus for the LBFF Minecraft importer addon.
 
-Provides a small submenu that exposes the importer operator.
+Provides a small submenu that exposes the importer operators and the
+scene's resource-pack stack.
 """
 
 import bpy
-from .operators import LBFF_OT_import_minecraft_texture
+from .operators import (
+    LBFF_OT_add_minecraft_area,
+    LBFF_OT_import_minecraft_block_textures,
+    LBFF_OT_import_minecraft_texture,
+    LBFF_OT_import_minecraft_world,
+)
 
 
 class LBFF_MT_minecraft_importer_menu(bpy.types.Menu):
@@ -13,7 +19,17 @@ class LBFF_MT_minecraft_importer_menu(bpy.types.Menu):
 
     def draw(self, context):
         layout = self.layout
+        settings = context.scene.lbff_minecraft
+        layout.prop(settings, "pack_stack")
+        layout.prop(settings, "use_atlas")
+        layout.prop(settings, "use_biome_tint")
+        layout.separator()
         layout.operator(LBFF_OT_import_minecraft_texture.bl_idname)
+        layout.operator(LBFF_OT_import_minecraft_block_textures.bl_idname)
+        layout.operator(LBFF_OT_import_minecraft_world.bl_idname)
+        op = layout.operator(LBFF_OT_import_minecraft_world.bl_idname, text="Import Minecraft World (Background)")
+        op.background = True
+        layout.operator(LBFF_OT_add_minecraft_area.bl_idname)
 
 
 classes = [LBFF_MT_minecraft_importer_menu]
@@ -1,26 +1,1212 @@
 """Operators used by the LBFF Minecraft importer.
 
-These operators are intentionally small in the template repository; they
-provide a clear spot where the actual importer logic should be implemented.
+Every texture lookup goes through the scene's resource-pack stack
+(:func:`.properties.scene_pack_stack`), so overrides are resolved once per
+import and members are read straight out of archives without extracting
+them to disk.
+
+World import streams chunks from the region files (:mod:`.core.region`), meshes
+them with :mod:`.core.mesher` and creates one object per chunk.
 """
 
+import hashlib
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import Iterator, NamedTuple, Optional, Tuple
+
 import bpy
+import numpy as np
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, IntVectorProperty, StringProperty
+
+from .core.animation import AnimatedTexture, frame_origin, scene_schedule
+from .core.atlas import atlas_cache_key, build_atlas, json_uv_table, load_cached_atlas, save_cached_atlas
+from .datablocks import (
+    ATLAS_UV_TABLE_PROP,
+    DatablockCache,
+    MaterialSettings,
+    add_frame_offset_animation,
+    build_material,
+    mesh_from_data,
+    use_image_sequence,
+)
+from .instancing import (
+    add_instancing_modifier,
+    add_prototype,
+    instancing_node_group,
+    point_cloud_mesh,
+    prototype_collection,
+)
+from .core.artifacts import (
+    artifact_folder,
+    chunk_artifact,
+    default_artifact_dir,
+    load_artifact,
+    mesh_cache_key,
+    save_artifact,
+)
+from .core.biomes import COLORMAPS, FOLIAGE, GRASS, BiomeTints, chunk_biomes
+from .core.lod import LOD_FACTORS, LOD_SELECT, SURFACE_LOD, downsampled_mesh, lod_level, surface_mesh
+from .core.manifest import WorldManifest, chunk_digest, settings_key
+from .core.mesher import (
+    ATLAS_PAGE_PREFIX,
+    MESHER_VERSION,
+    BlockTable,
+    InstancePoints,
+    MeshData,
+    atlas_mesh,
+    chunk_states,
+    instance_points,
+    mesh_chunk,
+    model_describer,
+    placeholder_mesh,
+    prototype_mesh,
+)
+from .core.models import ModelResolver
+from .core.nbt import NBTError, parse_nbt
+from .core.palette import CHUNK_SELECT, iter_sections
+from .core.png import PNGError, decode_png, encode_png
+from .core.profiling import PROFILER, profiled, save_profile, stage
+from .properties import scene_pack_stack
+from .core.region import RegionError, iter_chunks
+from .core.spatial import DIMENSIONS, BoxArea, FrustumArea, RadiusArea, WorldIndex, frustum_planes, player_position
+from .core.resource_pack import ResourcePackError, member_texture, texture_folder, texture_member
+from .core.textures import DecodedTexture, decode_textures, load_texture
+
+
+def _texture_name(member: str) -> str:
+    return os.path.splitext(os.path.basename(member))[0]
+
+
+def _import_animated(scene, stack, tex: DecodedTexture, cache: DatablockCache,
+                     settings: MaterialSettings = MaterialSettings()) -> bpy.types.Material:
+    """Create (or reuse) the material for an animated texture.
+
+    Only the scene's frame range is considered. Without interpolation the
+    strip stays one image and a Mapping node steps through frame offsets, so
+    no frame is copied. With interpolation the blended frames for the range
+    are rendered lazily into a cached PNG sequence.
+    """
+    name = _texture_name(tex.member)
+    meta = tex.meta
+    fps = scene.render.fps / scene.render.fps_base
+    start, end = scene.frame_start, scene.frame_end
+
+    if not meta.interpolate:
+        image = cache.image(name, tex.rgba, tex.digest)
+        keys = []
+        shown = None
+        for frame, index, _, _ in scene_schedule(meta, fps, start, end):
+            if index != shown:
+                keys.append((frame, *frame_origin(meta, tex.rgba.shape[1], index)))
+                shown = index
+        schedule = hashlib.sha1(repr((meta.frame_width, meta.frame_height, keys)).encode("ascii")).hexdigest()[:16]
+
+        def factory():
+            mat = build_material(name, image, settings)
+            strip_size = (tex.rgba.shape[1], tex.rgba.shape[0])
+            add_frame_offset_animation(mat, strip_size, (meta.frame_width, meta.frame_height), keys)
+            return mat
+
+        return cache.material_for_key(f"{tex.digest}|frames:{schedule}|{settings.key()}", factory)
+
+    key = hashlib.sha1(repr((tex.digest, meta, fps, start, end)).encode("ascii")).hexdigest()[:24]
+    folder = stack.cache_dir / "animation" / key
+    first = folder / f"{name}_{start:04d}.png"
+    if not (folder / "complete").exists():
+        folder.mkdir(parents=True, exist_ok=True)
+        for frame, rgba in AnimatedTexture(tex.rgba, meta).frames_for_range(fps, start, end):
+            (folder / f"{name}_{frame:04d}.png").write_bytes(encode_png(rgba))
+        (folder / "complete").touch()
+    image = cache.sequence_image(f"seq:{key}", str(first))
+
+    def factory():
+        mat = build_material(name, image, settings)
+        use_image_sequence(mat, end)
+        return mat
+
+    return cache.material_for_key(f"seq:{key}|{settings.key()}", factory)
+
+
+def _load_atlas(stack, members, settings, decoded, failed):
+    """Return ``(layout, pages)`` for the static textures among ``members``.
+
+    Animated textures are left out so their frames can play. Atlases are
+    cached per pack stack; ``decoded(stack, members)`` yields
+    :class:`.core.textures.DecodedTexture` results when one has to be built.
+    """
+    static = [m for m in members if m + ".mcmeta" not in stack]
+    names = [member_texture(m) for m in static]
+    key = atlas_cache_key(stack.fingerprint, names, settings.atlas_max_size, settings.atlas_padding)
+    cached = load_cached_atlas(stack.cache_dir, key)
+    if cached is not None:
+        return cached
+    images = {}
+    complete = True
+    for tex in decoded(stack, static):
+        if tex.error is not None:
+            failed.append(f"{tex.member}: {tex.error}")
+            complete = False
+            continue
+        images[member_texture(tex.member)] = tex.rgba
+    with stage("atlas", len(images)):
+        layout, pages = build_atlas(images, settings.atlas_max_size, settings.atlas_padding)
+    # Only complete atlases are cached so failed textures are retried.
+    if complete:
+        save_cached_atlas(stack.cache_dir, key, layout, pages)
+    return layout, pages
+
+
+def _atlas_materials(layout, pages, cache: DatablockCache, settings: MaterialSettings = MaterialSettings()):
+    """Return one material per atlas page, each carrying the UV table."""
+    uv_table = json_uv_table(layout)
+    materials = []
+    for i, page in enumerate(pages):
+        name = f"LBFF_Atlas_{i}"
+        mat = cache.material(name, cache.image(name, page), settings)
+        mat[ATLAS_UV_TABLE_PROP] = uv_table
+        materials.append(mat)
+    return materials
 
 
 class LBFF_OT_import_minecraft_texture(bpy.types.Operator):
     """Import a single Minecraft texture and create a Blender material.
 
-    The operator currently implements a no-op placeholder. Implementations
-    should locate the texture file, create an image datablock and construct
-    a material using appropriate shader nodes.
+    The texture is resolved through the scene's pack stack, so the highest
+    priority pack that provides it wins. Images and materials whose content
+    already exists in the .blend are reused. Animated textures play over the
+    scene's frame range.
     """
     bl_idname = "lbff.import_minecraft_texture"
     bl_label = "Import Minecraft Texture"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    texture: StringProperty(
+        name="Texture",
+        description="Texture resource location, e.g. minecraft:block/stone",
+        default="minecraft:block/stone",
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    @profiled
+    def execute(self, context):
+        stack = scene_pack_stack(context)
+        if not stack.paths:
+            self.report({'ERROR'}, "Set the Minecraft pack stack first")
+            return {'CANCELLED'}
+        member = texture_member(self.texture)
+        cache = DatablockCache()
+        try:
+            with stack:
+                if member not in stack:
+                    self.report({'ERROR'}, f"{member} not found in the pack stack")
+                    return {'CANCELLED'}
+                tex = load_texture(stack, member)
+                if tex.error is not None:
+                    self.report({'ERROR'}, f"Could not read {member}: {tex.error}")
+                    return {'CANCELLED'}
+                if tex.meta is not None:
+                    with stage("materials", 1):
+                        _import_animated(context.scene, stack, tex, cache)
+                else:
+                    name = _texture_name(member)
+                    with stage("bpy_write", 1):
+                        image = cache.image(name, tex.rgba, tex.digest)
+                    with stage("materials", 1):
+                        cache.material(name, image)
+        except (OSError, ResourcePackError) as e:
+            self.report({'ERROR'}, f"Could not read the pack stack: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Imported {member}" + (" (reused existing datablocks)" if cache.reused else ""))
+        return {'FINISHED'}
+
+
+class LBFF_OT_import_minecraft_block_textures(bpy.types.Operator):
+    """Import every texture in a pack-stack folder in one invocation.
+
+    PNG decoding runs in a process pool (see :mod:`.core.textures`); the
+    main thread reads textures from the pack stack ahead of the workers and
+    creates image datablocks (one bulk ``pixels.foreach_set`` each) and
+    materials as decoded results arrive, reusing datablocks with identical
+    content. The whole batch is one undo step.
+
+    With the scene's atlas setting enabled the textures are packed into
+    atlas pages instead (see :mod:`.core.atlas`), each with a single material
+    carrying the texture -> UV rect table. Animated textures always keep
+    their own material so their frames can play.
+    """
+    bl_idname = "lbff.import_minecraft_block_textures"
+    bl_label = "Import All Block Textures"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    folder: StringProperty(
+        name="Folder",
+        description="Texture folder resource location, e.g. minecraft:block",
+        default="minecraft:block",
+    )
+    workers: IntProperty(
+        name="Workers",
+        description="Decode processes (0 uses one per CPU)",
+        default=0,
+        min=0,
+    )
+    create_materials: BoolProperty(
+        name="Create Materials",
+        description="Create a material for every imported texture",
+        default=True,
+    )
+
+    def _decoded(self, stack, members):
+        """Yield :class:`.core.textures.DecodedTexture` results in order, decoding in a process pool."""
+        return decode_textures(stack, members, self.workers or None)
+
+    def _import_one(self, scene, stack, tex, cache):
+        if tex.meta is not None:
+            _import_animated(scene, stack, tex, cache)
+            return
+        name = _texture_name(tex.member)
+        image = cache.image(name, tex.rgba, tex.digest)
+        if self.create_materials:
+            cache.material(name, image)
+
+    def _import_separate(self, scene, stack, members, cache, failed):
+        imported = 0
+        for tex in self._decoded(stack, members):
+            if tex.error is not None:
+                failed.append(f"{tex.member}: {tex.error}")
+                continue
+            self._import_one(scene, stack, tex, cache)
+            imported += 1
+        return imported
+
+    def _import_atlas(self, scene, stack, members, settings, cache, failed):
+        animated = [m for m in members if m + ".mcmeta" in stack]
+        imported = self._import_separate(scene, stack, animated, cache, failed)
+        layout, pages = _load_atlas(stack, members, settings, self._decoded, failed)
+        if self.create_materials:
+            _atlas_materials(layout, pages, cache)
+        else:
+            for i, page in enumerate(pages):
+                cache.image(f"LBFF_Atlas_{i}", page)
+        return imported + len(layout.rects)
+
+    @profiled
+    def execute(self, context):
+        settings = context.scene.lbff_minecraft
+        stack = scene_pack_stack(context)
+        if not stack.paths:
+            self.report({'ERROR'}, "Set the Minecraft pack stack first")
+            return {'CANCELLED'}
+
+        start = time.perf_counter()
+        failed = []
+        cache = DatablockCache()
+        try:
+            with stack:
+                prefix = texture_folder(self.folder)
+                members = sorted(m for m in stack.names(prefix) if m.endswith(".png"))
+                if settings.use_atlas:
+                    imported = self._import_atlas(context.scene, stack, members, settings, cache, failed)
+                else:
+                    imported = self._import_separate(context.scene, stack, members, cache, failed)
+        except (OSError, ResourcePackError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not import {self.folder}: {e}")
+            return {'CANCELLED'}
+
+        elapsed = time.perf_counter() - start
+        for line in failed:
+            print(f"[LBFF Minecraft Importer] Skipped {line}")
+        rate = imported / elapsed if elapsed > 0 else 0.0
+        self.report(
+            {'WARNING'} if failed else {'INFO'},
+            f"Imported {imported} textures in {elapsed:.2f}s ({rate:.1f} textures/s), "
+            f"{cache.created} datablocks created, {cache.reused} reused"
+            + (f", {len(failed)} failed" if failed else ""),
+        )
+        return {'FINISHED'}
+
+
+def _missing_material(cache: DatablockCache) -> bpy.types.Material:
+    """Return the shared magenta material used for textures not in the stack."""
+    def factory():
+        mat = bpy.data.materials.new("LBFF_Missing")
+        mat.diffuse_color = (1.0, 0.0, 1.0, 1.0)
+        return mat
+    return cache.material_for_key("missing", factory)
+
+
+def _colormap(stack, name: str) -> Optional[np.ndarray]:
+    """Decode a biome colormap texture, or return ``None`` if the stack lacks it."""
+    member = texture_member(name)
+    if member not in stack:
+        return None
+    try:
+        return decode_png(stack.read(member))
+    except (OSError, PNGError, ResourcePackError, ValueError) as e:
+        print(f"[LBFF Minecraft Importer] Skipped {member}: {e}")
+        return None
+
+
+# Custom properties linking generated datablocks back to the import.
+WORLD_PROP = "lbff_world"
+MANIFEST_PROP = "lbff_manifest"
+CHUNK_PROP = "lbff_chunk"
+PLACEHOLDER_PROP = "lbff_placeholders"
+LOD_PROP = "lbff_lod"
+PLACEHOLDER_TEXTURE = "minecraft:block/stone"
+
+
+def _chunk_objects(collection: bpy.types.Collection):
+    """Map ``(chunk x, chunk z)`` to the objects generated for it."""
+    objects = {}
+    for obj in collection.all_objects:
+        key = obj.get(CHUNK_PROP)
+        if key:
+            x, z = key.split(",")
+            objects.setdefault((int(x), int(z)), []).append(obj)
+    return objects
+
+
+def _remove_objects(objects) -> None:
+    """Delete generated objects and their meshes once unused."""
+    for obj in list(objects):
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+# Errors that abort a world import with a report instead of a traceback.
+IMPORT_ERRORS = (OSError, ResourcePackError, RegionError, ValueError)
+
+# Finished chunks the background import may hold before waiting for the
+# main thread, and the modal timer interval in seconds.
+MODAL_QUEUE_SIZE = 32
+MODAL_TICK = 0.05
+
+
+class ChunkResult(NamedTuple):
+    """One chunk processed by :meth:`_WorldImport.results`.
+
+    ``mesh`` is ``None`` when the content is unchanged (or on ``error``);
+    ``prototypes`` holds ``(index, mesh)`` of instancing prototypes first
+    used by this chunk.
+    """
+
+    key: Tuple[int, int]
+    timestamp: int
+    digest: str
+    lod: int
+    mesh: Optional[MeshData] = None
+    points: Optional[InstancePoints] = None
+    prototypes: Tuple[Tuple[int, MeshData], ...] = ()
+    error: Optional[str] = None
+
+
+class _WorldImport:
+    """One run of :class:`LBFF_OT_import_minecraft_world`.
+
+    Split so the same import can run to completion in ``execute()`` or be
+    driven by the modal timer: :meth:`results` does the heavy work
+    (decompression in a process pool, NBT parsing and meshing) without
+    touching ``bpy``, so it may run on a background thread, while
+    :meth:`open`, :meth:`apply` and :meth:`finish` create and link
+    datablocks on the main thread. Operator settings are copied here
+    because RNA properties must not be read from other threads.
+
+    Stages are profiled under the operator's ``bl_idname`` explicitly, as
+    the modal import outlives the profiled ``execute()``.
+    """
+
+    def __init__(self, op, context, stack, world: str, folder: str, area):
+        self.op = op
+        self.operation = op.bl_idname
+        self.scene = context.scene
+        self.stack = stack
+        self.world = world
+        self.folder = folder
+        self.area = area
+        self.greedy = op.greedy
+        self.workers = op.workers or None
+        self.thresholds = sorted(op.lod_distances) if op.use_lod else None
+        self.center = op._lod_center(context, world) if op.use_lod else (0.0, 0.0)
+        self.collection = op._world_collection(context, world)
+        self.start = time.perf_counter()
+        self.failed = []
+        self.cache = DatablockCache()
+        self.materials = {}
+        self.chunks = 0
+        self.unchanged = 0
+        self.faces = 0
+        self.instances = 0
+        self.total = 0
+
+    def open(self) -> None:
+        """Open the pack stack, reconcile the manifest and list the chunks to read."""
+        self.stack.open()
+        try:
+            self._prepare()
+        except BaseException:
+            self.stack.close()
+            raise
+
+    def close(self) -> None:
+        self.stack.close()
+
+    def _prepare(self) -> None:
+        settings = self.scene.lbff_minecraft
+        stack = self.stack
+        op = self.op
+        self.existing = _chunk_objects(self.collection)
+        self.resolver = ModelResolver(stack)
+        key = settings_key(
+            stack.fingerprint, MESHER_VERSION, op.greedy, op.instance_models,
+            settings.use_atlas and (settings.atlas_max_size, settings.atlas_padding), settings.use_biome_tint,
+        )
+        manifest = WorldManifest.from_json(self.collection.get(MANIFEST_PROP))
+        prototypes = None
+        if manifest is not None and manifest.prototype_collection:
+            prototypes = bpy.data.collections.get(manifest.prototype_collection)
+        if manifest is None or manifest.settings_key != key or (manifest.prototypes and prototypes is None):
+            # Different settings or pack stack: rebuild every chunk.
+            for objects in self.existing.values():
+                _remove_objects(objects)
+            self.existing = {}
+            manifest = WorldManifest(key)
+            prototypes = None
+
+        group = None
+        if op.instance_models:
+            if prototypes is None:
+                prototypes = prototype_collection(f"{self.collection.name} Prototypes")
+                manifest.prototypes = []
+            try:
+                group = instancing_node_group(prototypes)
+            except (RuntimeError, KeyError, StopIteration) as e:
+                # Older Blender without the Named Attribute node.
+                op.report({'WARNING'}, f"Instancing unavailable, meshing all models: {e}")
+                bpy.data.collections.remove(prototypes)
+                prototypes = None
+        manifest.prototype_collection = prototypes.name if group is not None else ""
+        self.manifest = manifest
+        self.prototypes = prototypes
+        self.group = group
+        self.instancing = group is not None
+        self.table = BlockTable(model_describer(self.resolver, instance=self.instancing))
+        for model_name in manifest.prototypes:
+            self.table.add_prototype(model_name, self.resolver.bake_model(model_name))
+        # Prototypes listed by an interrupted import may still lack objects.
+        self.meshed_prototypes = len(prototypes.objects) if self.instancing else 0
+        self.tints = None
+        if settings.use_biome_tint:
+            grass, foliage = (_colormap(stack, COLORMAPS[kind]) for kind in (GRASS, FOLIAGE))
+            self.tints = BiomeTints(self.table, grass, foliage)
+        self.material_settings = MaterialSettings(tint=settings.use_biome_tint)
+
+        # Artifacts are meshed without the atlas, which is applied on load,
+        # so atlas and material settings do not invalidate them.
+        mesh_key = mesh_cache_key(stack.fingerprint, op.greedy and not settings.use_atlas, self.instancing)
+        self.mesh_cache = artifact_folder(default_artifact_dir(), mesh_key) if op.mesh_cache else None
+        self.artifact_folders = []
+        if op.artifacts:
+            folder = artifact_folder(bpy.path.abspath(op.artifacts), mesh_key)
+            if folder.is_dir():
+                self.artifact_folders.append(folder)
+            else:
+                op.report({'WARNING'}, f"No mesh artifacts for these settings in {op.artifacts}; ignoring it")
+        if self.mesh_cache is not None:
+            self.artifact_folders.append(self.mesh_cache)
+
+        self.uv_table = None
+        if settings.use_atlas:
+            members = sorted(m for m in stack.names(texture_folder("minecraft:block")) if m.endswith(".png"))
+            layout, pages = _load_atlas(stack, members, settings, decode_textures, self.failed)
+            self.uv_table = layout.uv_table()
+            for i, mat in enumerate(_atlas_materials(layout, pages, self.cache, self.material_settings)):
+                self.materials[f"{ATLAS_PAGE_PREFIX}{i}"] = mat
+
+        self.index = WorldIndex(self.folder)
+        self.paths = self.index.region_paths(self.area)
+        self.present = self.index.chunk_timestamps(self.area)
+        self.removed = manifest.removed(self.present, within=self.index.contains(self.area))
+        for chunk_key in self.removed:
+            _remove_objects(self.existing.pop(chunk_key, ()))
+        manifest.forget(self.removed)
+        self.total = sum(1 for chunk_key, timestamp in self.present.items()
+                         if manifest.needs_decode(chunk_key, timestamp, self.lod_of(chunk_key)))
+
+    def _stage(self, name: str, items: int = 0):
+        return stage(name, items, self.operation)
+
+    def lod_of(self, chunk_key) -> int:
+        if self.thresholds is None:
+            return 0
+        dx = chunk_key[0] * 16 + 8 - self.center[0]
+        dz = chunk_key[1] * 16 + 8 - self.center[1]
+        return lod_level((dx * dx + dz * dz) ** 0.5, self.thresholds)
+
+    def _wanted(self, region, lx, lz) -> bool:
+        chunk_key = (region.rx * 32 + lx, region.rz * 32 + lz)
+        timestamp = self.present.get(chunk_key)
+        return timestamp is not None and self.manifest.needs_decode(chunk_key, timestamp, self.lod_of(chunk_key))
+
+    def results(self, cancel: Optional[threading.Event] = None) -> Iterator[ChunkResult]:
+        """Decode and mesh the chunks that changed; never touches ``bpy``.
+
+        Full-detail chunks with an up-to-date artifact (see
+        :mod:`.core.artifacts`) are loaded instead of decoded.
+        """
+        loaded = set()
+        for chunk_key, timestamp in self.present.items() if self.artifact_folders else ():
+            if cancel is not None and cancel.is_set():
+                return
+            if self.lod_of(chunk_key) != 0 or not self.manifest.needs_decode(chunk_key, timestamp):
+                continue
+            for folder in self.artifact_folders:
+                with self._stage("read", 1):
+                    artifact = load_artifact(folder, *chunk_key, timestamp)
+                if artifact is not None:
+                    loaded.add(chunk_key)
+                    yield self._from_artifact(artifact)
+                    break
+
+        def wanted(region, lx, lz):
+            return (region.rx * 32 + lx, region.rz * 32 + lz) not in loaded and self._wanted(region, lx, lz)
+
+        chunks = iter_chunks(self.paths, workers=self.workers, select=wanted)
+        while True:
+            # Region reads and decompression run in a process pool; this
+            # times the wait for the next chunk.
+            with self._stage("read", 1):
+                chunk = next(chunks, None)
+            if chunk is None or (cancel is not None and cancel.is_set()):
+                return
+            yield self._process(chunk)
+
+    def _with_instances(self, result: ChunkResult, mesh: MeshData, points: InstancePoints) -> ChunkResult:
+        # Prototypes are discovered as new block states appear.
+        first, self.meshed_prototypes = self.meshed_prototypes, len(self.table.prototype_models)
+        prototypes = []
+        for i in range(first, self.meshed_prototypes):
+            proto = prototype_mesh(self.table, i, self.uv_table)
+            if self.tints is not None:
+                proto = proto._replace(colors=self.tints.prototype_mask(proto))
+            prototypes.append((i, proto))
+        return result._replace(mesh=mesh, points=points, prototypes=tuple(prototypes))
+
+    def _complete(self, result: ChunkResult, mesh: MeshData, points: InstancePoints, grid,
+                  origin) -> ChunkResult:
+        """Tint a full-detail chunk, apply the atlas and attach its instances."""
+        # Counted as mesh time; the chunk itself is counted where it was meshed or loaded.
+        with self._stage("mesh"):
+            if self.tints is not None:
+                mesh = mesh._replace(colors=self.tints.mesh_colors(mesh, grid, origin))
+            if self.uv_table is not None:
+                mesh = atlas_mesh(mesh, self.uv_table)
+            if not self.instancing:
+                return result._replace(mesh=mesh)
+            if self.tints is not None:
+                points = points._replace(colors=self.tints.point_colors(points, grid, origin))
+            return self._with_instances(result, mesh, points)
+
+    def _from_artifact(self, artifact) -> ChunkResult:
+        chunk_key = (artifact.x, artifact.z)
+        result = ChunkResult(chunk_key, artifact.timestamp, artifact.digest, 0)
+        if not self.manifest.needs_mesh(chunk_key, artifact.digest):
+            return result
+        # Artifact texture and prototype ids are local to the chunk; map them by name.
+        ids = np.array([self.table.texture_id(name) for name in artifact.textures] or [0], dtype=np.int32)
+        mesh = artifact.mesh._replace(face_textures=ids[artifact.mesh.face_textures])
+        for name, kind in artifact.tints.items():
+            self.table.texture_tints.setdefault(name, kind)
+        points = artifact.points
+        if self.instancing:
+            ids = np.array([self.table.add_prototype(name, self.resolver.bake_model(name))
+                            for name in artifact.prototypes] or [0], dtype=np.int32)
+            points = points._replace(prototypes=ids[points.prototypes])
+        grid = None if self.tints is None else self.tints.biome_grid(artifact.biomes, artifact.biome_grid)
+        return self._complete(result, mesh, points, grid, (artifact.x * 16, artifact.low * 16, artifact.z * 16))
+
+    def _process(self, chunk) -> ChunkResult:
+        chunk_key = (chunk.x, chunk.z)
+        lod = self.lod_of(chunk_key)
+        digest = chunk_digest(chunk.nbt)
+        result = ChunkResult(chunk_key, chunk.timestamp, digest, lod)
+        if not self.manifest.needs_mesh(chunk_key, digest, lod):
+            return result
+        try:
+            with self._stage("decode", 1):
+                root = parse_nbt(chunk.nbt, CHUNK_SELECT + LOD_SELECT if lod == SURFACE_LOD else CHUNK_SELECT)
+                sections = list(iter_sections(root))
+                low, states = chunk_states(sections, self.table)
+                biomes = chunk_biomes(sections)
+        except (NBTError, ValueError, KeyError) as e:
+            return result._replace(error=f"chunk {chunk.x}, {chunk.z}: {e}")
+        origin = (chunk.x * 16, low * 16, chunk.z * 16)
+        grid = None if self.tints is None else self.tints.biome_grid(*biomes)
+        if lod:
+            with self._stage("mesh", 1):
+                if lod == SURFACE_LOD:
+                    mesh = surface_mesh(root, states, low, self.table, (chunk.x * 16, 0, chunk.z * 16),
+                                        self.uv_table)
+                else:
+                    mesh = downsampled_mesh(states, self.table, LOD_FACTORS[lod], origin, self.greedy, self.uv_table)
+                if self.tints is not None:
+                    mesh = mesh._replace(colors=self.tints.mesh_colors(mesh, grid, origin))
+            return result._replace(mesh=mesh)
+        with self._stage("mesh", 1):
+            mesh = mesh_chunk(states, self.table, origin, self.greedy and self.uv_table is None)
+            points = instance_points(states, self.table, origin)
+        if self.mesh_cache is not None:
+            artifact = chunk_artifact(chunk.x, chunk.z, chunk.timestamp, digest, mesh, points, self.table,
+                                      low, biomes)
+            if not save_artifact(self.mesh_cache, artifact):
+                self.mesh_cache = None  # reported once; keep importing without it
+        return self._complete(result, mesh, points, grid, origin)
+
+    def _material(self, texture: str) -> bpy.types.Material:
+        return self.op._texture_material(self.scene, self.stack, texture, self.cache, self.materials,
+                                         self.material_settings)
+
+    def apply(self, result: ChunkResult) -> None:
+        """Create, replace and link the objects of one processed chunk."""
+        if result.error is not None:
+            self.failed.append(result.error)
+            return
+        if result.mesh is None:
+            self.manifest.record(result.key, result.timestamp, result.digest, result.lod)
+            self.unchanged += 1
+            return
+        data = result.mesh
+        with self._stage("materials") as timed:
+            materials = [self._material(tex) for tex in data.materials] if len(data.loop_starts) else []
+            prototype_materials = [[self._material(tex) for tex in proto.materials] for _, proto in result.prototypes]
+            timed.items = len(materials) + sum(map(len, prototype_materials))
+        with self._stage("bpy_write", 1):
+            _remove_objects(self.existing.pop(result.key, ()))
+            x, z = result.key
+            name = f"chunk_{x}_{z}"
+            created = []
+            if len(data.loop_starts):
+                mesh = mesh_from_data(name, data, materials)
+                created.append(bpy.data.objects.new(mesh.name, mesh))
+                self.faces += len(data.loop_starts)
+            for (i, proto), mats in zip(result.prototypes, prototype_materials):
+                add_prototype(self.prototypes, i, proto, mats)
+            points = result.points
+            if points is not None and len(points.prototypes):
+                cloud = bpy.data.objects.new(f"{name}_instances", point_cloud_mesh(f"{name}_instances", points))
+                add_instancing_modifier(cloud, self.group)
+                created.append(cloud)
+                self.instances += len(points.prototypes)
+            target = self.op._lod_collection(self.collection, result.lod)
+            for obj in created:
+                obj[CHUNK_PROP] = f"{x},{z}"
+                target.objects.link(obj)
+        self.manifest.record(result.key, result.timestamp, result.digest, result.lod)
+        self.chunks += 1
+
+    def finish(self, cancelled: bool = False):
+        """Save the caches and manifest; returns ``(report type, message)``."""
+        with self._stage("bpy_write") as timed:
+            placeholders = self.op._placeholders(self.scene, self.collection, self.index, self.manifest.chunks,
+                                                 self.stack, self.cache, self.materials)
+            timed.items = placeholders
+        with self._stage("save"):
+            self.resolver.save()
+            self.manifest.prototypes = list(self.table.prototypes)
+            self.collection[MANIFEST_PROP] = self.manifest.to_json()
+
+        elapsed = time.perf_counter() - self.start
+        for line in self.failed:
+            print(f"[LBFF Minecraft Importer] Skipped {line}")
+        rate = self.chunks / elapsed if elapsed > 0 else 0.0
+        skipped = len(self.present) - self.chunks - len(self.failed)
+        message = (
+            f"Imported {self.chunks} chunks ({self.faces} faces, {self.instances} instances) in {elapsed:.2f}s "
+            f"({rate:.1f} chunks/s), {skipped} unchanged ({self.unchanged} re-read), {len(self.removed)} removed"
+            + (f", {placeholders} placeholders" if placeholders else "")
+            + (f", {len(self.failed)} skipped" if self.failed else "")
+        )
+        if cancelled:
+            return {'WARNING'}, f"Import cancelled. {message}"
+        return ({'WARNING'} if self.failed else {'INFO'}), message
+
+
+class LBFF_OT_import_minecraft_world(bpy.types.Operator):
+    """Import the blocks of a Minecraft world save as chunk meshes.
+
+    Region files are decompressed in a process pool; sections are decoded,
+    hidden faces culled and coplanar faces greedy-merged on the main thread,
+    and each chunk becomes one mesh object written with bulk ``foreach_set``
+    calls. Block models and textures are resolved through the scene's pack
+    stack, once per distinct block state, and with the atlas setting enabled
+    every chunk samples the shared atlas pages instead of per-texture
+    materials.
+
+    With instancing enabled, models that never touch a neighbour's face
+    (torches, plants, lanterns...) are not copied into the chunk meshes;
+    each chunk gets a point cloud instancing one shared prototype per
+    unique model through a Geometry Nodes modifier (see :mod:`.instancing`).
+
+    With biome tint enabled, grass, leaves, vines and water are coloured per
+    biome from the pack's colormaps (see :mod:`.core.biomes`) through a
+    face-corner colour attribute, keeping one material per texture.
+
+    Re-importing the same world updates it in place: a manifest on the
+    world collection records every chunk's header timestamp and content
+    digest (see :mod:`.core.manifest`), so only chunks whose timestamp and
+    content changed are decoded and re-meshed, and objects of chunks that
+    no longer exist are removed.
+
+    Imports can be limited to a block-coordinate box, a radius around the
+    player position from ``level.dat`` or a named scene area. The limit is
+    applied through :class:`.core.spatial.WorldIndex`, so region files outside
+    the area are never opened, and chunks outside it are left untouched
+    by the re-import. The camera area keeps only chunks inside the scene
+    camera's frustum (plus a margin for shadow casters); culled chunks
+    within the far clip distance can get flat placeholder quads instead.
+
+    With distance LOD enabled, chunks beyond the configured distances from
+    the camera (or player) are meshed coarser: 2x and 4x downsampled, then
+    as a heightfield surface (see :mod:`.core.lod`). Each level goes into its
+    own child collection of the world collection.
+
+    Full-detail chunk meshes are cached on disk as memory-mapped artifacts
+    keyed by chunk timestamp, pack stack and mesher version (see
+    :mod:`.core.artifacts`). A chunk found in the cache is not decoded at
+    all, so importing an unchanged world into a new scene, or with other
+    atlas or material settings, costs little more than creating the
+    datablocks.
+
+    Run in the background, the import is modal: a worker thread streams
+    chunks from the decompression pool, parses and meshes them into a
+    bounded queue, and a timer drains a few finished chunks per tick into
+    Blender, with progress in the status bar. Esc cancels, keeping the
+    chunks imported so far.
+    """
+    bl_idname = "lbff.import_minecraft_world"
+    bl_label = "Import Minecraft World"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    directory: StringProperty(
+        name="World Folder",
+        description="Minecraft save folder (the one containing level.dat)",
+        subtype='DIR_PATH',
+    )
+    dimension: EnumProperty(
+        name="Dimension",
+        items=[
+            ('OVERWORLD', "Overworld", ""),
+            ('NETHER', "Nether", ""),
+            ('END', "The End", ""),
+        ],
+        default='OVERWORLD',
+    )
+    workers: IntProperty(
+        name="Workers",
+        description="Chunk decompression processes (0 uses one per CPU)",
+        default=0,
+        min=0,
+    )
+    greedy: BoolProperty(
+        name="Merge Faces",
+        description="Merge coplanar faces with the same texture into larger quads (ignored with the atlas)",
+        default=True,
+    )
+    area: EnumProperty(
+        name="Area",
+        items=[
+            ('ALL', "Whole World", "Import every chunk"),
+            ('BOX', "Box", "Import the chunks overlapping a block-coordinate box"),
+            ('PLAYER', "Around Player", "Import chunks within a radius of the player position in level.dat"),
+            ('NAMED', "Named Area", "Import one of the scene's named areas"),
+            ('CAMERA', "Camera View", "Import the chunks inside the scene camera's frustum"),
+        ],
+        default='ALL',
+    )
+    box_min: IntVectorProperty(name="Box Min", description="Minimum block X, Z", size=2, default=(-256, -256))
+    box_max: IntVectorProperty(name="Box Max", description="Maximum block X, Z", size=2, default=(255, 255))
+    radius: IntProperty(
+        name="Radius",
+        description="Import radius around the player in blocks",
+        default=256,
+        min=16,
+    )
+    area_name: StringProperty(name="Area Name", description="Name of a scene import area")
+    camera_margin: FloatProperty(
+        name="Camera Margin",
+        description="Widen the camera frustum by this many blocks to keep nearby shadow casters",
+        default=32.0,
+        min=0.0,
+    )
+    placeholders: BoolProperty(
+        name="Placeholders",
+        description="Cover chunks culled by the camera (within its clip distance) with flat placeholder quads",
+        default=False,
+    )
+    placeholder_height: IntProperty(
+        name="Placeholder Height",
+        description="Block row the placeholder quads sit on",
+        default=62,
+    )
+    use_lod: BoolProperty(
+        name="Distance LOD",
+        description="Mesh distant chunks at reduced detail",
+        default=False,
+    )
+    lod_distances: IntVectorProperty(
+        name="LOD Distances",
+        description=(
+            "Distances in blocks from the camera (or player) beyond which chunks are "
+            "2x downsampled, 4x downsampled and reduced to a heightfield surface"
+        ),
+        size=3,
+        default=(256, 512, 1024),
+        min=16,
+    )
+    artifacts: StringProperty(
+        name="Mesh Artifacts",
+        description=(
+            "Extra folder of chunk meshes pre-built by 'python -m lbff_minecraft_importer.core "
+            "--output'; chunks found there are loaded instead of decoded"
+        ),
+        subtype='DIR_PATH',
+    )
+    mesh_cache: BoolProperty(
+        name="Cache Chunk Meshes",
+        description=(
+            "Keep every meshed chunk in the shared LBFF cache folder, so re-imports and "
+            "imports into other scenes load unchanged chunks without decoding them"
+        ),
+        default=True,
+    )
+    background: BoolProperty(
+        name="Run in Background",
+        description="Import with a modal timer so Blender stays responsive (Esc cancels)",
+        default=False,
+    )
+    chunks_per_tick: IntProperty(
+        name="Chunks per Tick",
+        description="Finished chunks added to the scene per timer tick in background imports",
+        default=4,
+        min=1,
+    )
+    instance_models: BoolProperty(
+        name="Instance Small Models",
+        description=(
+            "Place torches, plants and similar models as Geometry Nodes instances of one "
+            "prototype per model instead of copying their geometry into every chunk"
+        ),
+        default=True,
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def _texture_material(self, scene, stack, name, cache, materials, settings=MaterialSettings()):
+        mat = materials.get(name)
+        if mat is not None:
+            return mat
+        member = texture_member(name)
+        if member not in stack:
+            mat = _missing_material(cache)
+        else:
+            tex = load_texture(stack, member)
+            if tex.error is not None:
+                print(f"[LBFF Minecraft Importer] Skipped {member}: {tex.error}")
+                mat = _missing_material(cache)
+            elif tex.meta is not None:
+                mat = _import_animated(scene, stack, tex, cache, settings)
+            else:
+                tex_name = _texture_name(member)
+                mat = cache.material(tex_name, cache.image(tex_name, tex.rgba, tex.digest), settings)
+        materials[name] = mat
+        return mat
+
+    def _world_collection(self, context, world: str) -> bpy.types.Collection:
+        """Return the collection of a previous import of this world, or a new one."""
+        key = f"{os.path.normcase(os.path.abspath(world))}|{self.dimension}"
+        for collection in bpy.data.collections:
+            if collection.get(WORLD_PROP) == key:
+                return collection
+        collection = bpy.data.collections.new(f"LBFF {os.path.basename(os.path.normpath(world))}")
+        collection[WORLD_PROP] = key
+        context.scene.collection.children.link(collection)
+        return collection
+
+    def _area(self, context, world: str):
+        """Return the selected area, or raise ``ValueError`` with a user message."""
+        if self.area == 'BOX':
+            return BoxArea(self.box_min[0], self.box_min[1], self.box_max[0], self.box_max[1])
+        if self.area == 'PLAYER':
+            position = player_position(world)
+            if position is None:
+                raise ValueError("level.dat has no player or spawn position")
+            return RadiusArea(position.x, position.z, self.radius)
+        if self.area == 'NAMED':
+            named = context.scene.lbff_minecraft.areas.get(self.area_name)
+            if named is None:
+                raise ValueError(f"No import area named '{self.area_name}'")
+            return named.box()
+        if self.area == 'CAMERA':
+            camera = context.scene.camera
+            if camera is None:
+                raise ValueError("The scene has no camera")
+            render = context.scene.render
+            projection = camera.calc_matrix_camera(
+                context.evaluated_depsgraph_get(),
+                x=render.resolution_x, y=render.resolution_y,
+                scale_x=render.pixel_aspect_x, scale_y=render.pixel_aspect_y,
+            )
+            view_projection = projection @ camera.matrix_world.inverted()
+            return FrustumArea(frustum_planes([list(row) for row in view_projection], self.camera_margin))
+        return None
+
+    def _lod_center(self, context, world: str):
+        """Return the Minecraft ``(x, z)`` that LOD distances are measured from."""
+        camera = context.scene.camera
+        if camera is not None:
+            x, y, _z = camera.matrix_world.translation
+            return x, -y
+        position = player_position(world)
+        return (position.x, position.z) if position is not None else (0.0, 0.0)
+
+    def _lod_collection(self, collection, level: int) -> bpy.types.Collection:
+        """Return the child collection holding detail ``level`` (0 is ``collection`` itself)."""
+        if level == 0:
+            return collection
+        for child in collection.children:
+            if child.get(LOD_PROP) == level:
+                return child
+        child = bpy.data.collections.new(f"{collection.name} LOD{level}")
+        child[LOD_PROP] = level
+        collection.children.link(child)
+        return child
+
+    def _placeholders(self, scene, collection, index, imported, stack, cache, materials) -> int:
+        """Rebuild the placeholder quads for culled chunks; returns their count."""
+        _remove_objects([obj for obj in collection.objects if obj.get(PLACEHOLDER_PROP)])
+        if self.area != 'CAMERA' or not self.placeholders:
+            return 0
+        camera = scene.camera
+        x, y, _z = camera.matrix_world.translation
+        reach = camera.data.clip_end + self.camera_margin
+        # Blender (x, y) is Minecraft (x, -z).
+        culled = set(index.chunk_timestamps(RadiusArea(x, -y, reach))) - set(imported)
+        if not culled:
+            return 0
+        data = placeholder_mesh(culled, self.placeholder_height, PLACEHOLDER_TEXTURE)
+        # Untinted, in case the shared stone material multiplies by the tint.
+        data = data._replace(colors=np.ones((len(data.loops), 4), dtype=np.float32))
+        mats = [self._texture_material(scene, stack, tex, cache, materials) for tex in data.materials]
+        mesh = mesh_from_data(f"{collection.name} Placeholders", data, mats)
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        obj[PLACEHOLDER_PROP] = True
+        collection.objects.link(obj)
+        return len(culled)
+
+    @profiled
+    def execute(self, context):
+        stack = scene_pack_stack(context)
+        if not stack.paths:
+            self.report({'ERROR'}, "Set the Minecraft pack stack first")
+            return {'CANCELLED'}
+        world = bpy.path.abspath(self.directory)
+        folder = os.path.join(world, DIMENSIONS[self.dimension])
+        if not os.path.isdir(folder):
+            self.report({'ERROR'}, f"No region folder at {folder}")
+            return {'CANCELLED'}
+        try:
+            area = self._area(context, world)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        job = _WorldImport(self, context, stack, world, folder, area)
+        try:
+            job.open()
+        except IMPORT_ERRORS as e:
+            self.report({'ERROR'}, f"Could not import {world}: {e}")
+            return {'CANCELLED'}
+        if self.background and not bpy.app.background:
+            return self._start_modal(context, job)
+        try:
+            for result in job.results():
+                job.apply(result)
+            level, message = job.finish()
+        except IMPORT_ERRORS as e:
+            self.report({'ERROR'}, f"Could not import {world}: {e}")
+            return {'CANCELLED'}
+        finally:
+            job.close()
+        self.report(level, message)
+        return {'FINISHED'}
+
+    # -- modal import ----------------------------------------------------
+
+    def _start_modal(self, context, job):
+        self._job = job
+        self._queue = queue.Queue(maxsize=MODAL_QUEUE_SIZE)
+        self._cancel = threading.Event()
+        self._applied = 0
+        self._thread = threading.Thread(target=self._produce, name="LBFF world import", daemon=True)
+        self._thread.start()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(MODAL_TICK, window=context.window)
+        wm.progress_begin(0, max(job.total, 1))
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def _put(self, item) -> None:
+        # Blocks while the queue is full, but gives up once cancelled so
+        # the main thread never has to drain it.
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _produce(self) -> None:
+        """Background thread: fill the queue with results, then ``None``."""
+        try:
+            for result in self._job.results(self._cancel):
+                self._put(result)
+        except Exception as e:  # reported on the main thread
+            self._put(e)
+        self._put(None)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            return self._stop(context, cancelled=True)
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        for _ in range(self.chunks_per_tick):
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return self._stop(context)
+            if isinstance(item, Exception):
+                return self._stop(context, error=item)
+            self._job.apply(item)
+            self._applied += 1
+        context.window_manager.progress_update(self._applied)
+        context.workspace.status_text_set(
+            f"Importing {os.path.basename(os.path.normpath(self._job.world))}: "
+            f"{self._applied}/{self._job.total} chunks (Esc to cancel)"
+        )
+        return {'RUNNING_MODAL'}
+
+    def _stop(self, context, cancelled: bool = False, error: Optional[Exception] = None):
+        self._cancel.set()
+        self._thread.join()
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        job = self._job
+        try:
+            if error is None:
+                # A cancelled import keeps (and records) the chunks applied so
+                # far; the next import of the world picks up the rest.
+                level, message = job.finish(cancelled)
+        except IMPORT_ERRORS as e:
+            error = e
+        finally:
+            job.close()
+        if error is not None:
+            # The worker thread catches everything, and no caller is left to
+            # show a traceback for errors outside IMPORT_ERRORS, so print it.
+            reason = str(error)
+            if not isinstance(error, IMPORT_ERRORS):
+                print(f"[LBFF Minecraft Importer] Background import of {job.world} failed:")
+                traceback.print_exception(type(error), error, error.__traceback__)
+                reason = f"{type(error).__name__}: {error}"
+            self.report({'ERROR'}, f"Could not import {job.world}: {reason}")
+            return {'CANCELLED'}
+        self.report(level, message)
+        return {'CANCELLED'} if cancelled else {'FINISHED'}
+
+
+class LBFF_OT_add_minecraft_area(bpy.types.Operator):
+    """Save a named block-coordinate area for selective world imports"""
+    bl_idname = "lbff.add_minecraft_area"
+    bl_label = "Add Import Area"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: StringProperty(name="Name", default="Area")
+    min_corner: IntVectorProperty(name="Min", description="Minimum block X, Z", size=2, default=(-256, -256))
+    max_corner: IntVectorProperty(name="Max", description="Maximum block X, Z", size=2, default=(255, 255))
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        areas = context.scene.lbff_minecraft.areas
+        area = areas.get(self.name) or areas.add()
+        area.name = self.name
+        area.min_x, area.min_z = self.min_corner
+        area.max_x, area.max_z = self.max_corner
+        self.report({'INFO'}, f"Saved import area '{self.name}'")
+        return {'FINISHED'}
+
+
+class LBFF_OT_export_profile(bpy.types.Operator):
+    """Save the profiler history as JSON or as a Chrome trace"""
+    bl_idname = "lbff.export_profile"
+    bl_label = "Export Profile"
+
+    filepath: StringProperty(name="File", subtype='FILE_PATH')
+    format: EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "Stage records as plain JSON"),
+            ('CHROME', "Chrome Trace", "Trace events for chrome://tracing or Perfetto"),
+        ],
+        default='JSON',
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "lbff_trace.json" if self.format == 'CHROME' else "lbff_profile.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        records = PROFILER.history()
+        try:
+            save_profile(self.filepath, records, trace=self.format == 'CHROME')
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write {self.filepath}: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Saved {len(records)} profiled stages to {self.filepath}")
+        return {'FINISHED'}
+
+
+class LBFF_OT_clear_profile(bpy.types.Operator):
+    """Forget the recorded profiler history"""
+    bl_idname = "lbff.clear_profile"
+    bl_label = "Clear Profile"
 
     def execute(self, context):
-        print("Importing Minecraft Texture...")
-        # TODO: Add import logic here
+        PROFILER.clear()
         return {'FINISHED'}
 
 
-classes = [LBFF_OT_import_minecraft_texture]
+classes = [
+    LBFF_OT_import_minecraft_texture,
+    LBFF_OT_import_minecraft_block_textures,
+    LBFF_OT_import_minecraft_world,
+    LBFF_OT_add_minecraft_area,
+    LBFF_OT_export_profile,
+    LBFF_OT_clear_profile,
+]
@@ -0,0 +1,47 @@
+"""Sidebar panels for the LBFF Minecraft importer.
+
+The profiler panel lists the most recent :mod:`.core.profiling` stage
+records, newest first with each operation's stages indented below it.
+"""
+
+import bpy
+
+from .core.profiling import PROFILER
+from .operators import LBFF_OT_clear_profile, LBFF_OT_export_profile
+
+# Rows shown in the panel; the ring buffer keeps more for export.
+HISTORY_ROWS = 40
+
+
+class LBFF_PT_profiler(bpy.types.Panel):
+    bl_label = "Profiler"
+    bl_idname = "LBFF_PT_profiler"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "LBFF"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.window_manager, "lbff_profiling")
+        row = layout.row(align=True)
+        row.operator(LBFF_OT_export_profile.bl_idname, text="JSON").format = 'JSON'
+        row.operator(LBFF_OT_export_profile.bl_idname, text="Chrome Trace").format = 'CHROME'
+        row.operator(LBFF_OT_clear_profile.bl_idname, text="", icon='TRASH')
+
+        records = PROFILER.history()
+        if not records:
+            layout.label(text="No stages recorded")
+            return
+        col = layout.column(align=True)
+        for record in reversed(records[-HISTORY_ROWS:]):
+            name = record.stage if record.stage == record.operation else f"    {record.stage}"
+            text = f"{name}  {record.duration_ns / 1e6:.1f} ms"
+            if record.items:
+                text += f"  {record.items} items"
+            if abs(record.rss_delta) >= 2 ** 20:
+                text += f"  {record.rss_delta / 2 ** 20:+.0f} MiB"
+            col.label(text=text)
+
+
+classes = [LBFF_PT_profiler]
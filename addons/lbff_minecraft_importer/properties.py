@@ -0,0 +1,100 @@
+"""Scene settings for the LBFF Minecraft importer.
+
+The settings live on ``Scene.lbff_minecraft`` so every importer operator
+reads the same resource-pack stack and named import areas. The profiler
+switch is process-wide and lives on ``WindowManager.lbff_profiling``.
+"""
+
+import bpy
+from bpy.props import BoolProperty, CollectionProperty, IntProperty, StringProperty
+
+from .core.profiling import PROFILER
+from .core.resource_pack import PackStack, parse_pack_stack
+from .core.spatial import BoxArea
+
+
+class LBFF_PG_minecraft_area(bpy.types.PropertyGroup):
+    """A named block-coordinate rectangle for selective world imports."""
+
+    min_x: IntProperty(name="Min X")
+    min_z: IntProperty(name="Min Z")
+    max_x: IntProperty(name="Max X")
+    max_z: IntProperty(name="Max Z")
+
+    def box(self) -> BoxArea:
+        return BoxArea(self.min_x, self.min_z, self.max_x, self.max_z)
+
+
+class LBFF_PG_minecraft_importer_settings(bpy.types.PropertyGroup):
+    """Per-scene importer settings."""
+
+    pack_stack: StringProperty(
+        name="Pack Stack",
+        description=(
+            "Resource packs separated by ';', highest priority first. "
+            "Entries may be .jar/.zip archives or loose pack folders; "
+            "the vanilla client jar usually comes last"
+        ),
+        default="",
+    )
+    use_atlas: BoolProperty(
+        name="Texture Atlas",
+        description=(
+            "Pack imported block textures into shared power-of-two atlas pages "
+            "with one material per page instead of one material per texture"
+        ),
+        default=False,
+    )
+    atlas_max_size: IntProperty(
+        name="Atlas Size",
+        description="Maximum atlas page width and height in pixels",
+        default=4096,
+        min=64,
+        max=16384,
+    )
+    atlas_padding: IntProperty(
+        name="Atlas Padding",
+        description="Edge pixels replicated around each texture to avoid bleeding",
+        default=0,
+        min=0,
+        max=16,
+    )
+    use_biome_tint: BoolProperty(
+        name="Biome Tint",
+        description=(
+            "Colour grass, leaves, vines and water per biome through a face-corner colour "
+            "attribute that the block materials multiply by"
+        ),
+        default=True,
+    )
+    areas: CollectionProperty(
+        name="Import Areas",
+        description="Named areas that world imports can be limited to",
+        type=LBFF_PG_minecraft_area,
+    )
+
+
+def scene_pack_stack(context) -> PackStack:
+    """Return an unopened :class:`PackStack` for the scene's pack-stack setting.
+
+    Relative (``//``) Blender paths are made absolute.
+    """
+    paths = parse_pack_stack(context.scene.lbff_minecraft.pack_stack)
+    return PackStack([bpy.path.abspath(p) for p in paths])
+
+
+def _set_profiling(self, value):
+    PROFILER.enabled = value
+
+
+def profiling_property():
+    """Return the ``WindowManager.lbff_profiling`` toggle; it mirrors ``PROFILER.enabled``."""
+    return BoolProperty(
+        name="Profile Imports",
+        description="Record the wall time, item count and memory growth of each import stage",
+        get=lambda self: PROFILER.enabled,
+        set=_set_profiling,
+    )
+
+
+classes = [LBFF_PG_minecraft_area, LBFF_PG_minecraft_importer_settings]
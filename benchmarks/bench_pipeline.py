@@ -0,0 +1,80 @@
+"""Throughput of the importer's bpy-free data paths on synthetic inputs."""
+
+import pytest
+
+from synthetic import chunk_nbts, synthetic_pack, synthetic_region, texture_pngs
+
+from lbff_minecraft_importer.core.atlas import build_atlas
+from lbff_minecraft_importer.core.mesher import BlockTable, chunk_states, mesh_chunk
+from lbff_minecraft_importer.core.nbt import parse_nbt
+from lbff_minecraft_importer.core.palette import CHUNK_SELECT, iter_sections
+from lbff_minecraft_importer.core.png import decode_png
+from lbff_minecraft_importer.core.region import RegionFile
+from lbff_minecraft_importer.core.resource_pack import read_central_directory
+
+
+@pytest.fixture(scope="module")
+def pngs(bench_size):
+    return texture_pngs(bench_size(400))
+
+
+@pytest.fixture(scope="module")
+def nbts(bench_size):
+    return chunk_nbts(bench_size(32))
+
+
+@pytest.fixture(scope="module")
+def parsed(nbts):
+    return [parse_nbt(data, CHUNK_SELECT) for data in nbts]
+
+
+def test_pack_indexing(bench, tmp_path):
+    path = synthetic_pack(tmp_path / "pack.zip", bench.size(2000))
+    data = path.read_bytes()
+    entries = bench("pack_index", lambda: read_central_directory(data), items=bench.size(2000) + 1)
+    assert len(entries) == bench.size(2000) + 1
+
+
+def test_png_decode(bench, pngs):
+    images = bench("png_decode", lambda: [decode_png(data) for data in pngs], items=len(pngs))
+    assert images[0].shape == (16, 16, 4)
+
+
+def test_region_read(bench, tmp_path):
+    path = synthetic_region(tmp_path / "r.0.0.mca", bench.size(32))
+
+    def read():
+        with RegionFile(path) as region:
+            return [region.read_chunk(x, z) for x, z in region.present()]
+
+    chunks = bench("region_read", read, items=min(bench.size(32), 1024))
+    assert all(chunk is not None for chunk in chunks)
+
+
+def test_nbt_parse(bench, nbts):
+    roots = bench("nbt_parse", lambda: [parse_nbt(data, CHUNK_SELECT) for data in nbts], items=len(nbts))
+    assert len(roots[0]["sections"]) > 0
+
+
+def test_palette_unpack(bench, parsed):
+    count = sum(1 for root in parsed for _ in iter_sections(root))
+    sections = bench("palette_unpack", lambda: [s for root in parsed for s in iter_sections(root)], items=count)
+    assert sections[0].blocks.shape == (16, 16, 16)
+
+
+def test_meshing(bench, parsed):
+    sections = [list(iter_sections(root)) for root in parsed]
+    table = BlockTable()
+    states = [chunk_states(chunk, table) for chunk in sections]
+
+    def mesh():
+        return [mesh_chunk(s, table, (0, low * 16, 0)) for low, s in states]
+
+    meshes = bench("mesh_chunk", mesh, items=len(states))
+    assert all(len(m.loop_starts) for m in meshes)
+
+
+def test_atlas_packing(bench, pngs):
+    images = {f"minecraft:block/synthetic_{i}": decode_png(data) for i, data in enumerate(pngs)}
+    layout, pages = bench("atlas_build", lambda: build_atlas(images, 4096, 1), items=len(images))
+    assert len(layout.rects) == len(images) and pages
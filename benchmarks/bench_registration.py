@@ -0,0 +1,46 @@
+"""Import, register and unregister time of each addon under the fake ``bpy``."""
+
+import importlib
+import sys
+import time
+
+import pytest
+
+import synthetic  # noqa: F401  (puts the addons folder on sys.path)
+
+ADDONS = ["lbff_addon_template", "lbff_gaffer", "lbff_minecraft_importer", "addons.lbff_all_in_one"]
+
+
+def _is_addon_module(name):
+    return name.split(".")[0].startswith("lbff_") or name.startswith("addons.lbff_")
+
+
+def _purge():
+    for name in [name for name in sys.modules if _is_addon_module(name)]:
+        del sys.modules[name]
+
+
+@pytest.mark.parametrize("name", ADDONS)
+def test_addon_registration(bench, fake_bpy, name):
+    saved = {key: module for key, module in sys.modules.items() if _is_addon_module(key)}
+    imports, registers, unregisters = [], [], []
+    try:
+        for _ in range(bench.repeat):
+            _purge()
+            start = time.perf_counter_ns()
+            module = importlib.import_module(name)
+            imported = time.perf_counter_ns()
+            module.register()
+            registered = time.perf_counter_ns()
+            module.unregister()
+            imports.append(imported - start)
+            registers.append(registered - imported)
+            unregisters.append(time.perf_counter_ns() - registered)
+            assert fake_bpy.registered == [] and fake_bpy.types.TOPBAR_MT_editor_menus == []
+    finally:
+        _purge()
+        sys.modules.update(saved)
+    label = name.rsplit(".", 1)[-1]
+    bench.record(f"import:{label}", imports)
+    bench.record(f"register:{label}", registers)
+    bench.record(f"unregister:{label}", unregisters)
@@ -0,0 +1,150 @@
+"""Benchmark harness: timing, JSON baselines and regression thresholds.
+
+Run with ``python -m pytest benchmarks``. Each benchmark times a stage with
+the :func:`bench` fixture, which keeps the best of ``--bench-repeat`` runs
+and fails the benchmark when the stage is more than ``--bench-threshold``
+percent slower per item than in the baseline (``benchmarks/baseline.json``
+unless ``--bench-baseline`` names another file). ``--bench-save`` writes
+this run's results as the new baseline instead of comparing; baselines are
+machine specific, so record one on the machine that compares against it.
+Slowdowns below :data:`NOISE_FLOOR_NS` in absolute terms are ignored so
+sub-millisecond stages such as class registration don't flake.
+Inputs are generated on the fly (see :mod:`synthetic`) and
+``--bench-scale`` multiplies their size. Results are only compared against
+a baseline recorded at the same scale; when there is none, or it lacks a
+stage, the run warns and the summary says what was not compared.
+"""
+
+import json
+import time
+import warnings
+from pathlib import Path
+
+import pytest
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+NOISE_FLOOR_NS = 1_000_000
+
+_results_key = pytest.StashKey[dict]()
+# (stages, why they are empty) of the baseline, loaded once per session.
+_baseline_key = pytest.StashKey[tuple]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("lbff benchmarks")
+    group.addoption("--bench-scale", type=float, default=1.0, help="multiply the synthetic input sizes")
+    group.addoption("--bench-repeat", type=int, default=5, help="runs per stage; the fastest counts")
+    group.addoption("--bench-baseline", default=str(BASELINE_PATH), help="baseline JSON to compare against")
+    group.addoption("--bench-threshold", type=float, default=25.0,
+                    help="fail stages more than this many percent slower than the baseline")
+    group.addoption("--bench-save", action="store_true", help="write the results as the new baseline")
+    group.addoption("--bench-json", default=None, help="also write the results to this JSON file")
+
+
+def pytest_configure(config):
+    config.stash[_results_key] = {}
+
+
+def scaled(scale: float, base: int) -> int:
+    return max(1, int(base * scale))
+
+
+def _load_baseline(config):
+    """Return ``(stages, problem)``; ``problem`` says why there is nothing to compare against."""
+    path = config.getoption("--bench-baseline")
+    scale = config.getoption("--bench-scale")
+    try:
+        baseline = json.loads(Path(path).read_text(encoding="utf-8"))
+    except OSError:
+        return {}, f"no baseline at {path}"
+    except ValueError as e:
+        return {}, f"baseline {path} is not valid JSON ({e})"
+    if baseline.get("scale") != scale:
+        return {}, f"baseline {path} was recorded at --bench-scale {baseline.get('scale')}, not {scale}"
+    return baseline.get("stages", {}), None
+
+
+class Bench:
+    """Times stages and checks them against the baseline; see the module docstring."""
+
+    def __init__(self, config):
+        self.scale = config.getoption("--bench-scale")
+        self.repeat = max(1, config.getoption("--bench-repeat"))
+        self.threshold = config.getoption("--bench-threshold")
+        self.results = config.stash[_results_key]
+        self.baseline = {}
+        if not config.getoption("--bench-save"):
+            if _baseline_key not in config.stash:
+                config.stash[_baseline_key] = _load_baseline(config)
+                problem = config.stash[_baseline_key][1]
+                if problem is not None:
+                    warnings.warn(f"{problem}; stages are not compared", pytest.PytestWarning, stacklevel=2)
+            self.baseline = config.stash[_baseline_key][0]
+
+    def size(self, base: int) -> int:
+        """Return ``base`` scaled by ``--bench-scale`` (at least 1)."""
+        return scaled(self.scale, base)
+
+    def __call__(self, name: str, fn, items: int = 1):
+        """Time ``fn()`` as stage ``name`` processing ``items`` items; return its last result."""
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter_ns()
+            result = fn()
+            samples.append(time.perf_counter_ns() - start)
+        self.record(name, samples, items)
+        return result
+
+    def record(self, name: str, samples, items: int = 1) -> None:
+        """Record stage ``name`` from nanosecond ``samples`` timed by the caller."""
+        best = min(samples)
+        self.results[name] = {"ns": best, "items": items, "ns_per_item": best / items}
+        previous = self.baseline.get(name)
+        if previous is None:
+            return
+        slowdown = (best / items) / previous["ns_per_item"] - 1
+        if slowdown * 100 > self.threshold and best - previous["ns_per_item"] * items > NOISE_FLOOR_NS:
+            pytest.fail(
+                f"{name}: {best / items / 1e3:.2f} us/item is {slowdown:.0%} slower than the baseline "
+                f"({previous['ns_per_item'] / 1e3:.2f} us/item; threshold {self.threshold:g}%)",
+                pytrace=False,
+            )
+
+
+@pytest.fixture
+def bench(request):
+    return Bench(request.config)
+
+
+@pytest.fixture(scope="session")
+def bench_size(request):
+    """``bench.size`` for fixtures shared between benchmarks."""
+    scale = request.config.getoption("--bench-scale")
+    return lambda base: scaled(scale, base)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash[_results_key]
+    if not results:
+        return
+    terminalreporter.section("LBFF benchmarks")
+    width = max(len(name) for name in results)
+    for name, result in sorted(results.items()):
+        terminalreporter.write_line(
+            f"{name:<{width}}  {result['ns'] / 1e6:10.3f} ms  {result['items']:8d} items  "
+            f"{result['ns_per_item'] / 1e3:10.3f} us/item"
+        )
+    if _baseline_key in config.stash:
+        stages, problem = config.stash[_baseline_key]
+        missing = sorted(set(results) - set(stages))
+        if problem is not None:
+            terminalreporter.write_line(f"not compared: {problem}", yellow=True)
+        elif missing:
+            terminalreporter.write_line(f"not in the baseline, not compared: {', '.join(missing)}", yellow=True)
+    payload = json.dumps({"scale": config.getoption("--bench-scale"), "stages": results}, indent=1, sort_keys=True)
+    paths = [config.getoption("--bench-json")]
+    if config.getoption("--bench-save"):
+        paths.append(config.getoption("--bench-baseline"))
+    for path in filter(None, paths):
+        Path(path).write_text(payload, encoding="utf-8")
+        terminalreporter.write_line(f"results written to {path}")
@@ -0,0 +1,157 @@
+"""Synthetic resource packs and worlds for the benchmarks.
+
+Everything is generated from a seeded ``numpy`` generator, so a given size
+always produces the same bytes. Chunks are 1.18+ style: a noisy heightfield
+of stone, dirt and grass with sand and water at sea level, ores in the
+stone and the occasional tree, so palettes, bit widths and meshing load
+resemble real terrain rather than noise.
+"""
+
+import struct
+import sys
+import zipfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+ADDONS_PATH = Path(__file__).resolve().parents[1] / "addons"
+if str(ADDONS_PATH) not in sys.path:
+    sys.path.insert(0, str(ADDONS_PATH))
+
+from lbff_minecraft_importer.core.png import encode_png  # noqa: E402
+
+SEA_LEVEL = 62
+MIN_SECTION = -4
+SECTIONS = 12  # y -64 .. 127
+
+_TERRAIN = ["air", "stone", "dirt", "grass_block", "sand", "water", "oak_log", "oak_leaves",
+            "coal_ore", "iron_ore", "gravel", "bedrock"]
+AIR, STONE, DIRT, GRASS, SAND, WATER, LOG, LEAVES, COAL, IRON, GRAVEL, BEDROCK = range(len(_TERRAIN))
+
+
+def texture(rng: np.random.Generator, size: int = 16) -> np.ndarray:
+    """Return a ``(size, size, 4)`` RGBA texture: a base colour with per-pixel noise."""
+    base = rng.integers(40, 200, size=3)
+    rgb = np.clip(base + rng.integers(-30, 30, size=(size, size, 3)), 0, 255)
+    alpha = np.full((size, size, 1), 255)
+    return np.concatenate([rgb, alpha], axis=2).astype(np.uint8)
+
+
+def texture_pngs(count: int, seed: int = 0) -> list:
+    """Return ``count`` encoded PNGs, every eighth one 64x64 and the rest 16x16."""
+    rng = np.random.default_rng(seed)
+    return [encode_png(texture(rng, 64 if i % 8 == 7 else 16)) for i in range(count)]
+
+
+def synthetic_pack(path: Path, textures: int, seed: int = 0) -> Path:
+    """Write a resource pack zip with ``textures`` block textures and return its path."""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("pack.mcmeta", '{"pack": {"pack_format": 15, "description": "synthetic"}}')
+        for i, data in enumerate(texture_pngs(textures, seed)):
+            # PNGs are already deflated; real packs mostly store them.
+            compression = zipfile.ZIP_DEFLATED if i % 4 == 0 else zipfile.ZIP_STORED
+            zf.writestr(f"assets/minecraft/textures/block/synthetic_{i}.png", data, compress_type=compression)
+    return path
+
+
+def pack_indices(values: np.ndarray, bits: int) -> np.ndarray:
+    """Pack ``values`` into 1.16+ non-spanning longs of ``bits`` bits each."""
+    per_long = 64 // bits
+    count = -(-len(values) // per_long)
+    padded = np.zeros(count * per_long, dtype=np.uint64)
+    padded[:len(values)] = values
+    shifts = np.arange(per_long, dtype=np.uint64) * np.uint64(bits)
+    words = np.bitwise_or.reduce(padded.reshape(count, per_long) << shifts, axis=1)
+    return words.view(np.int64)
+
+
+def _terrain(rng: np.random.Generator, cx: int, cz: int) -> np.ndarray:
+    """Return a ``[y, z, x]`` array of :data:`_TERRAIN` indices for chunk ``(cx, cz)``."""
+    x = cx * 16 + np.arange(16)
+    z = cz * 16 + np.arange(16)
+    height = (SEA_LEVEL + 6 * np.sin(x[None, :] / 23.0) + 5 * np.cos(z[:, None] / 17.0)
+              + rng.integers(0, 3, size=(16, 16))).astype(int)
+    y = (MIN_SECTION * 16 + np.arange(SECTIONS * 16))[:, None, None]
+    blocks = np.where(y < height - 4, STONE, np.where(y < height, DIRT, np.where(y == height, GRASS, AIR)))
+    beach = height <= SEA_LEVEL + 1
+    blocks[(y >= height - 3) & (y <= height) & beach] = SAND
+    blocks[(y > height) & (y <= SEA_LEVEL)] = WATER
+    stone = blocks == STONE
+    ore = rng.random(blocks.shape)
+    blocks[stone & (ore < 0.01)] = COAL
+    blocks[stone & (ore > 0.995)] = IRON
+    blocks[stone & (ore > 0.99) & (ore <= 0.995)] = GRAVEL
+    blocks[0] = BEDROCK
+    for _ in range(rng.integers(0, 3)):
+        tx, tz = rng.integers(2, 14, size=2)
+        ground = height[tz, tx] - MIN_SECTION * 16
+        if height[tz, tx] <= SEA_LEVEL + 1 or ground + 7 >= len(blocks):
+            continue
+        blocks[ground + 3:ground + 7, tz - 2:tz + 3, tx - 2:tx + 3] = LEAVES
+        blocks[ground + 1:ground + 6, tz, tx] = LOG
+    return blocks
+
+
+def synthetic_chunk(rng: np.random.Generator, cx: int, cz: int) -> dict:
+    """Return the NBT root of chunk ``(cx, cz)`` as plain Python values."""
+    blocks = _terrain(rng, cx, cz)
+    sections = []
+    for i in range(SECTIONS):
+        used, local = np.unique(blocks[i * 16:(i + 1) * 16], return_inverse=True)
+        palette = [{"Name": f"minecraft:{_TERRAIN[b]}"} for b in used.tolist()]
+        states = {"palette": palette}
+        if len(palette) > 1:
+            bits = max(4, int(np.ceil(np.log2(len(palette)))))
+            states["data"] = pack_indices(local.reshape(-1), bits)
+        biomes = {"palette": ["minecraft:plains", "minecraft:beach"],
+                  "data": pack_indices(rng.integers(0, 2, size=64), 1)}
+        sections.append({"Y": MIN_SECTION + i, "block_states": states, "biomes": biomes})
+    return {"DataVersion": 3953, "xPos": cx, "zPos": cz, "yPos": MIN_SECTION, "Status": "minecraft:full",
+            "sections": sections}
+
+
+def _payload(value):
+    """Encode ``value`` as an NBT payload; returns ``(tag, bytes)``."""
+    if isinstance(value, dict):
+        parts = []
+        for key, item in value.items():
+            tag, payload = _payload(item)
+            parts.append(bytes([tag]) + struct.pack(">H", len(key)) + key.encode() + payload)
+        return 10, b"".join(parts) + b"\0"
+    if isinstance(value, list):
+        items = [_payload(v) for v in value]
+        tag = items[0][0] if items else 0
+        return 9, bytes([tag]) + struct.pack(">i", len(items)) + b"".join(p for _, p in items)
+    if isinstance(value, str):
+        return 8, struct.pack(">H", len(value)) + value.encode()
+    if isinstance(value, np.ndarray):
+        return 12, struct.pack(">i", len(value)) + value.astype(">i8").tobytes()
+    return 3, struct.pack(">i", value)
+
+
+def nbt_bytes(root: dict) -> bytes:
+    """Encode ``root`` as an uncompressed, unnamed root compound."""
+    return b"\x0a\x00\x00" + _payload(root)[1]
+
+
+def chunk_nbts(count: int, seed: int = 0) -> list:
+    """Return the uncompressed NBT of ``count`` chunks laid out row by row, 32 per row."""
+    rng = np.random.default_rng(seed)
+    return [nbt_bytes(synthetic_chunk(rng, i % 32, i // 32)) for i in range(count)]
+
+
+def synthetic_region(path: Path, chunks: int, seed: int = 0) -> Path:
+    """Write region ``r.0.0.mca`` style data with the first ``chunks`` (at most 1024) chunks, zlib compressed."""
+    header = bytearray(8192)
+    body = bytearray()
+    for i, nbt in enumerate(chunk_nbts(min(chunks, 1024), seed)):
+        payload = zlib.compress(nbt)
+        record = struct.pack(">IB", len(payload) + 1, 2) + payload
+        record += b"\0" * (-len(record) % 4096)
+        sector = 2 + len(body) // 4096
+        struct.pack_into(">I", header, 4 * i, (sector << 8) | (len(record) // 4096))
+        struct.pack_into(">I", header, 4096 + 4 * i, 1_700_000_000 + i)
+        body += record
+    path.write_bytes(bytes(header + body))
+    return path
@@ -0,0 +1,11 @@
+"""Fixtures shared by ``tests/`` and ``benchmarks/``."""
+
+import pytest
+
+from tests.fake_bpy import install_fake_bpy
+
+
+@pytest.fixture
+def fake_bpy(monkeypatch):
+    """A fresh fake ``bpy`` installed in ``sys.modules`` for the duration of the test."""
+    return install_fake_bpy(monkeypatch)
@@ -0,0 +1,371 @@
+"""A minimal stand-in for Blender's ``bpy`` so addon modules run under plain pytest.
+
+``make_fake_bpy()`` returns a module with just enough surface for the LBFF
+addons to import, register and unregister:
+
+- ``bpy.types`` hands out a placeholder class for any Blender type name.
+  ``Menu`` supports ``append``/``remove`` of draw functions, and
+  ``TOPBAR_MT_editor_menus`` is a plain list.
+- ``bpy.props`` property functions return their keyword arguments.
+- ``bpy.utils.register_class`` records classes in ``bpy.registered``. A
+  registered class is reachable as ``bpy.types.<bl_idname>``, like in Blender.
+- ``bpy.app.timers.register`` queues callbacks in ``bpy.timers`` instead of
+  running them; ``unregister`` and ``is_registered`` work on that list.
+- ``bpy.data`` holds collections, objects, meshes, images, materials,
+  lights and node groups with ``new``/``get``/``remove``, custom
+  properties, Blender's ``.001`` name suffixes and mesh and light user
+  counts, so operators that build datablocks can run. Mesh and pixel
+  ``foreach_set`` calls keep the values they were given and
+  ``foreach_get`` reads them back, with polygon centres and areas computed
+  from the mesh; nodes accept any socket.
+- ``bpy.context.scene`` has a master ``collection`` and no camera.
+
+The ``fake_bpy`` fixture (see ``conftest.py``) installs one in ``sys.modules``.
+"""
+
+import sys
+import types
+
+import numpy as np
+
+
+class _Types(types.ModuleType):
+    """``bpy.types``: unknown Blender type names resolve to fresh placeholder classes."""
+
+    def __getattr__(self, name):
+        # Registered LBFF classes only exist once registered, so lookups of
+        # e.g. ``LBFF_MT_main_menu`` fail like in Blender before that.
+        if name.startswith("LBFF_") or name.startswith("_"):
+            raise AttributeError(name)
+        cls = type(name, (), {})
+        setattr(self, name, cls)
+        return cls
+
+
+class _Menu:
+    """``bpy.types.Menu`` with the class-level draw-function list Blender adds."""
+
+    @classmethod
+    def append(cls, draw_fn):
+        if "_draw_fns" not in cls.__dict__:
+            cls._draw_fns = []
+        cls._draw_fns.append(draw_fn)
+
+    @classmethod
+    def remove(cls, draw_fn):
+        cls.__dict__.get("_draw_fns", []).remove(draw_fn)
+
+
+class _ID:
+    """A datablock: a name plus ID custom properties."""
+
+    def __init__(self, name):
+        self.name = name
+        self._props = {}
+
+    def get(self, key, default=None):
+        return self._props.get(key, default)
+
+    def __getitem__(self, key):
+        return self._props[key]
+
+    def __setitem__(self, key, value):
+        self._props[key] = value
+
+    def __contains__(self, key):
+        return key in self._props
+
+
+class _Elements:
+    """Mesh vertices/loops/polygons, pixels or layer data: a count plus ``foreach_set`` values."""
+
+    def __init__(self):
+        self.count = 0
+        self.values = {}
+
+    def add(self, count):
+        self.count += count
+
+    def foreach_set(self, attr, values=None):
+        # Image.pixels.foreach_set takes only the values.
+        if values is None:
+            attr, values = "pixels", attr
+        self.values[attr] = values
+
+    def foreach_get(self, attr, out):
+        out[:] = np.ravel(self.values[attr])
+
+    def __len__(self):
+        return self.count
+
+
+class _Polygons(_Elements):
+    """``Mesh.polygons``; ``center`` and ``area`` are derived from the vertices and loops."""
+
+    def __init__(self, mesh):
+        super().__init__()
+        self._mesh = mesh
+
+    def foreach_get(self, attr, out):
+        if attr not in ("center", "area"):
+            return super().foreach_get(attr, out)
+        co = np.reshape(self._mesh.vertices.values["co"], (-1, 3))
+        loops = np.ravel(self._mesh.loops.values["vertex_index"])
+        values = []
+        for start, total in zip(np.ravel(self.values["loop_start"]), np.ravel(self.values["loop_total"])):
+            corners = co[loops[start:start + total]]
+            if attr == "center":
+                values.append(corners.mean(axis=0))
+            else:
+                values.append(np.linalg.norm(np.cross(corners, np.roll(corners, -1, axis=0)).sum(axis=0)) / 2)
+        out[:] = np.ravel(values)
+
+
+class _Layers(list):
+    """``Mesh.uv_layers`` and ``Mesh.attributes``; the first layer is the active one."""
+
+    def new(self, name="", type=None, domain=None):
+        layer = types.SimpleNamespace(name=name, data_type=type, domain=domain, data=_Elements())
+        self.append(layer)
+        return layer
+
+    def get(self, name, default=None):
+        return next((layer for layer in self if layer.name == name), default)
+
+    @property
+    def active(self):
+        return self[0] if self else None
+
+
+class _Mesh(_ID):
+    def __init__(self, name, data):
+        super().__init__(name)
+        self._data = data
+        self.vertices, self.loops, self.polygons = _Elements(), _Elements(), _Polygons(self)
+        self.uv_layers, self.attributes = _Layers(), _Layers()
+        self.materials = []
+
+    @property
+    def users(self):
+        return sum(obj.data is self for obj in self._data.objects)
+
+    def update(self, calc_edges=False):
+        pass
+
+
+class _Light(_ID):
+    def __init__(self, name, light_type, data):
+        super().__init__(name)
+        self._data = data
+        self.type = light_type
+        self.energy = 10.0
+        self.color = (1.0, 1.0, 1.0)
+
+    @property
+    def users(self):
+        return sum(obj.data is self for obj in self._data.objects)
+
+
+class _Modifiers(list):
+    def new(self, name, type):
+        modifier = types.SimpleNamespace(name=name, type=type, node_group=None)
+        self.append(modifier)
+        return modifier
+
+
+class _Object(_ID):
+    def __init__(self, name, object_data):
+        super().__init__(name)
+        self.data = object_data
+        self.modifiers = _Modifiers()
+        self.location = (0.0, 0.0, 0.0)
+
+    @property
+    def type(self):
+        return {_Mesh: 'MESH', _Light: 'LIGHT'}.get(type(self.data), 'EMPTY')
+
+    @property
+    def matrix_world(self):
+        # Objects are only ever translated.
+        x, y, z = self.location
+        return ((1.0, 0.0, 0.0, x), (0.0, 1.0, 0.0, y), (0.0, 0.0, 1.0, z), (0.0, 0.0, 0.0, 1.0))
+
+
+class _Links(list):
+    """``Collection.objects``/``children``; linking twice raises like in Blender."""
+
+    def link(self, item):
+        if item in self:
+            raise RuntimeError(f"'{item.name}' already in collection")
+        self.append(item)
+
+    def unlink(self, item):
+        self.remove(item)
+
+
+class _Collection(_ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = _Links()
+        self.children = _Links()
+
+    @property
+    def all_objects(self):
+        objects = list(self.objects)
+        for child in self.children:
+            objects += [obj for obj in child.all_objects if obj not in objects]
+        return objects
+
+
+class _Image(_ID):
+    def __init__(self, name, width=0, height=0, alpha=False):
+        super().__init__(name)
+        self.size = (width, height)
+        self.pixels = _Elements()
+        self.source = 'GENERATED'
+        self.packed = False
+
+    def pack(self):
+        self.packed = True
+
+
+class _Sockets(dict):
+    """Node inputs/outputs; any socket name exists, and iterating yields the sockets made so far."""
+
+    def __missing__(self, name):
+        socket = self[name] = types.SimpleNamespace(name=name, default_value=None, enabled=True)
+        return socket
+
+    def __iter__(self):
+        return iter(list(self.values()))
+
+
+class _Nodes(list):
+    def get(self, name):
+        return next((node for node in self if node.name == name), None)
+
+    def new(self, bl_idname):
+        node_type = {"ShaderNodeTexImage": 'TEX_IMAGE', "ShaderNodeBsdfPrincipled": 'BSDF_PRINCIPLED'}
+        node = types.SimpleNamespace(name=bl_idname, bl_idname=bl_idname, type=node_type.get(bl_idname, bl_idname),
+                                     inputs=_Sockets(), outputs=_Sockets())
+        if bl_idname == "GeometryNodeInputNamedAttribute":
+            node.outputs["Attribute"]
+        self.append(node)
+        return node
+
+
+class _NodeLinks(list):
+    def new(self, from_socket, to_socket):
+        link = types.SimpleNamespace(from_socket=from_socket, to_socket=to_socket)
+        self.append(link)
+        return link
+
+
+class _Material(_ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.use_nodes = False
+        nodes = _Nodes()
+        nodes.new("ShaderNodeBsdfPrincipled").name = "Principled BSDF"
+        self.node_tree = types.SimpleNamespace(nodes=nodes, links=_NodeLinks(), animation_data=None)
+
+
+class _NodeGroup(_ID):
+    def __init__(self, name, tree_type):
+        super().__init__(name)
+        self.bl_idname = tree_type
+        self.nodes = _Nodes()
+        self.links = _NodeLinks()
+        self.interface = types.SimpleNamespace(new_socket=lambda name, in_out, socket_type: None)
+
+
+class _DataCollection(list):
+    """A ``bpy.data`` collection; ``new`` names datablocks uniquely with ``.001`` suffixes."""
+
+    def __init__(self, data, factory):
+        super().__init__()
+        self._data = data
+        self._factory = factory
+
+    def new(self, name, *args, **kwargs):
+        names = {item.name for item in self}
+        unique, n = name, 0
+        while unique in names:
+            n += 1
+            unique = f"{name}.{n:03d}"
+        item = self._factory(unique, *args, **kwargs)
+        self.append(item)
+        return item
+
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+    def remove(self, item):
+        super().remove(item)
+        # Removing a datablock unlinks it everywhere.
+        for collection in [*self._data.collections, self._data._scene_collection]:
+            for links in (collection.objects, collection.children):
+                if item in links:
+                    links.unlink(item)
+
+
+def _make_data():
+    data = types.SimpleNamespace(_scene_collection=_Collection("Scene Collection"))
+    data.collections = _DataCollection(data, _Collection)
+    data.objects = _DataCollection(data, _Object)
+    data.meshes = _DataCollection(data, lambda name: _Mesh(name, data))
+    data.images = _DataCollection(data, _Image)
+    data.materials = _DataCollection(data, _Material)
+    data.lights = _DataCollection(data, lambda name, light_type: _Light(name, light_type, data))
+    data.node_groups = _DataCollection(data, _NodeGroup)
+    return data
+
+
+def _property(kind):
+    def prop(**kwargs):
+        return (kind, kwargs)
+    return prop
+
+
+def make_fake_bpy():
+    """Create a fresh fake ``bpy`` module; see the module docstring for what it covers."""
+    fake_bpy = types.ModuleType("bpy")
+    fake_bpy.registered = []
+    fake_bpy.timers = []
+
+    types_mod = _Types("bpy.types")
+    types_mod.Menu = _Menu
+    types_mod.TOPBAR_MT_editor_menus = []
+    fake_bpy.types = types_mod
+
+    props = types.ModuleType("bpy.props")
+    for kind in ("Bool", "Int", "Float", "String", "Enum", "Pointer", "Collection", "IntVector", "FloatVector"):
+        setattr(props, f"{kind}Property", _property(kind))
+    fake_bpy.props = props
+
+    def register_class(cls):
+        fake_bpy.registered.append(cls)
+        setattr(types_mod, getattr(cls, "bl_idname", cls.__name__), cls)
+
+    def unregister_class(cls):
+        fake_bpy.registered.remove(cls)
+        types_mod.__dict__.pop(getattr(cls, "bl_idname", cls.__name__), None)
+
+    fake_bpy.utils = types.SimpleNamespace(register_class=register_class, unregister_class=unregister_class)
+    fake_bpy.app = types.SimpleNamespace(background=False, timers=types.SimpleNamespace(
+        register=lambda fn, first_interval=0.0: fake_bpy.timers.append(fn),
+        unregister=fake_bpy.timers.remove, is_registered=lambda fn: fn in fake_bpy.timers))
+    fake_bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    fake_bpy.data = _make_data()
+    fake_bpy.context = types.SimpleNamespace(scene=types.SimpleNamespace(
+        collection=fake_bpy.data._scene_collection, camera=None))
+    return fake_bpy
+
+
+def install_fake_bpy(monkeypatch):
+    """Put a fresh fake ``bpy`` (and its ``bpy.types``/``bpy.props`` submodules) into ``sys.modules``."""
+    fake_bpy = make_fake_bpy()
+    monkeypatch.setitem(sys.modules, "bpy", fake_bpy)
+    monkeypatch.setitem(sys.modules, "bpy.types", fake_bpy.types)
+    monkeypatch.setitem(sys.modules, "bpy.props", fake_bpy.props)
+    return fake_bpy
@@ -0,0 +1,187 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def make_fake_addon(name, calls):
+    module = types.ModuleType(name)
+    module.register = lambda: calls.append(("register", name))
+    module.unregister = lambda: calls.append(("unregister", name))
+    return module
+
+
+def test_sub_addons_load_lazily_and_once(fake_bpy, monkeypatch):
+    registered, timers = fake_bpy.registered, fake_bpy.timers
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    calls = []
+    for name in ("lbff_minecraft_importer", "lbff_gaffer"):
+        monkeypatch.setitem(sys.modules, f"addons.{name}", make_fake_addon(name, calls))
+    monkeypatch.delitem(sys.modules, "addons.lbff_all_in_one", raising=False)
+    aio = importlib.import_module("addons.lbff_all_in_one")
+
+    aio.register()
+    # Only the loader's own classes and one placeholder per addon; nothing imported.
+    assert calls == [] and aio._registry.modules == {}
+    placeholders = [cls for cls in registered if cls.bl_idname.startswith("LBFF_MT_lazy_")]
+    assert [cls.lbff_addon for cls in placeholders] == ["lbff_minecraft_importer", "lbff_gaffer"]
+
+    # Drawing a placeholder twice schedules a single load.
+    menu = placeholders[1]()
+    menu.layout = types.SimpleNamespace(operator=lambda *args, **kwargs: types.SimpleNamespace())
+    menu.draw(None)
+    menu.draw(None)
+    assert len(timers) == 1
+    timers.pop()()
+    assert calls == [("register", "lbff_gaffer")]
+
+    # Scripts load explicitly; repeated loads reuse the cached module.
+    assert aio.load_addon("lbff_gaffer") is sys.modules["addons.lbff_gaffer"]
+    assert calls == [("register", "lbff_gaffer")]
+
+    aio.unregister()
+    assert calls == [("register", "lbff_gaffer"), ("unregister", "lbff_gaffer")]
+    assert registered == [] and fake_bpy.types.TOPBAR_MT_editor_menus == []
+
+    report = aio.timing_report()
+    assert set(report["loader"]) == {"register_classes", "register_menus", "unregister_menus", "unregister_classes"}
+    gaffer, importer = report["addons"][1], report["addons"][0]
+    assert set(gaffer["phases"]) == {"resolve", "register", "unregister"} and importer["phases"] == {}
+    assert "lbff_minecraft_importer (not loaded)" in aio.format_timing_report(report)
+
+
+class RecordingLayout:
+    """Stands in for ``UILayout``; records the operator entries a menu draws."""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.entries = []
+
+    def operator(self, idname, text=None):
+        props = types.SimpleNamespace()
+        self.entries.append((idname, text or self.labels[idname], props))
+        return props
+
+    def __getattr__(self, name):  # prop, separator, menu, ...
+        return lambda *args, **kwargs: None
+
+
+def test_manifests_match_the_sub_addon_menus(fake_bpy, monkeypatch):
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    saved = {name: module for name, module in sys.modules.items() if name.startswith("addons.")}
+    try:
+        aio = importlib.import_module("addons.lbff_all_in_one")
+        for name, manifest in aio.ADDON_MANIFESTS.items():
+            module = importlib.import_module(f"addons.{name}")
+            labels = {cls.bl_idname: cls.bl_label for cls in module.classes if hasattr(cls, "bl_idname")}
+            menu = next(cls for cls in module.classes if cls.__name__.startswith("LBFF_MT_"))()
+            menu.layout = RecordingLayout(labels)
+            menu.draw(types.SimpleNamespace(scene=types.SimpleNamespace(lbff_minecraft=None)))
+            drawn = [(idname, text, vars(props)) for idname, text, props in menu.layout.entries]
+            assert manifest.label == menu.bl_label
+            assert list(manifest.operators) == drawn, name
+    finally:
+        for name in [name for name in sys.modules if name.startswith("addons.")]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+
+def test_load_addon_proxy_finishes_when_the_target_goes_modal(fake_bpy, monkeypatch):
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    monkeypatch.setitem(sys.modules, "addons.lbff_gaffer", make_fake_addon("lbff_gaffer", []))
+    monkeypatch.delitem(sys.modules, "addons.lbff_all_in_one", raising=False)
+    aio = importlib.import_module("addons.lbff_all_in_one")
+    results = iter([{'RUNNING_MODAL'}, {'CANCELLED'}])
+    calls = []
+
+    def target(execution_context, **props):
+        calls.append((execution_context, props))
+        return next(results)
+
+    fake_bpy.ops = types.SimpleNamespace(lbff=types.SimpleNamespace(gaffer_create_lighting=target))
+    op = aio.LBFF_OT_load_addon()
+    op.module, op.operator, op.properties = "lbff_gaffer", "lbff.gaffer_create_lighting", '{"mode": "EMISSIVE"}'
+    assert op.invoke(None, None) == {'FINISHED'}
+    assert op.execute(None) == {'CANCELLED'}
+    assert calls == [('INVOKE_DEFAULT', {"mode": "EMISSIVE"}), ('EXEC_DEFAULT', {"mode": "EMISSIVE"})]
+
+
+def test_stubs_declare_the_real_operator_properties(fake_bpy, monkeypatch):
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    saved = {name: module for name, module in sys.modules.items() if name.startswith("addons.")}
+    try:
+        aio = importlib.import_module("addons.lbff_all_in_one")
+        for name, manifest in aio.ADDON_MANIFESTS.items():
+            module = importlib.import_module(f"addons.{name}")
+            operators = {cls.bl_idname: cls for cls in module.classes if cls.__name__.startswith("LBFF_OT_")}
+            assert set(manifest.stubs) == set(operators), name
+            for idname, declared in manifest.stubs.items():
+                real = operators[idname].__dict__.get("__annotations__", {})
+                assert set(declared) == set(real), idname
+                for key, (kind, kwargs) in declared.items():
+                    real_kind, real_kwargs = real[key]
+                    assert kind == real_kind or (kind, real_kind) == ("String", "Enum"), (idname, key)
+                    assert kwargs.get("size") == real_kwargs.get("size"), (idname, key)
+    finally:
+        for name in [name for name in sys.modules if name.startswith("addons.")]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+
+def fresh_loader(monkeypatch, calls):
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    for name in ("lbff_minecraft_importer", "lbff_gaffer"):
+        monkeypatch.setitem(sys.modules, f"addons.{name}", make_fake_addon(name, calls))
+    monkeypatch.delitem(sys.modules, "addons.lbff_all_in_one", raising=False)
+    return importlib.import_module("addons.lbff_all_in_one")
+
+
+def test_stub_operator_loads_its_addon_and_repeats_the_call(fake_bpy, monkeypatch):
+    calls = []
+    aio = fresh_loader(monkeypatch, calls)
+    aio.register()
+    stub = getattr(fake_bpy.types, "lbff.gaffer_create_lighting")
+    assert stub.lbff_addon == "lbff_gaffer" and calls == []
+
+    dispatched = []
+    fake_bpy.ops = types.SimpleNamespace(lbff=types.SimpleNamespace(
+        gaffer_create_lighting=lambda execution_context, **props: dispatched.append((execution_context, props))))
+    op = stub()
+    op.mode, op.watts, op.max_lights = "EMISSIVE", 5.0, 32
+    op.properties = types.SimpleNamespace(is_property_set=lambda key: key in ("mode", "watts"))
+    assert op.execute(types.SimpleNamespace(window=None)) == {'FINISHED'}
+    assert op.invoke(types.SimpleNamespace(window=None), None) == {'FINISHED'}
+    # Both calls wait for a single load, which runs outside the stub.
+    assert calls == [] and dispatched == [] and len(fake_bpy.timers) == 1
+    fake_bpy.timers.pop()()
+    assert calls == [("register", "lbff_gaffer")]
+    assert stub not in fake_bpy.registered
+    assert dispatched == [('EXEC_DEFAULT', {"mode": "EMISSIVE", "watts": 5.0}),
+                          ('INVOKE_DEFAULT', {"mode": "EMISSIVE", "watts": 5.0})]
+
+    aio.unregister()
+    assert fake_bpy.registered == []
+
+
+def test_unregister_drops_pending_loads(fake_bpy, monkeypatch):
+    calls = []
+    aio = fresh_loader(monkeypatch, calls)
+    aio.register()
+    aio._schedule_load("lbff_minecraft_importer")
+    assert len(fake_bpy.timers) == 1
+    aio.unregister()
+    assert fake_bpy.timers == [] and aio._scheduled == {} and fake_bpy.registered == []
+    assert calls == []
+
+
+def test_background_runs_load_every_addon_at_startup(fake_bpy, monkeypatch):
+    calls = []
+    aio = fresh_loader(monkeypatch, calls)
+    fake_bpy.app.background = True
+    monkeypatch.setattr(aio.atexit, "register", lambda fn: None)
+    aio.register()
+    assert calls == [("register", "lbff_minecraft_importer"), ("register", "lbff_gaffer")]
+    assert not [cls for cls in fake_bpy.registered if hasattr(cls, "lbff_addon")]
+    aio.unregister()
@@ -0,0 +1,119 @@
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tests.test_minecraft_importer import make_nbt, make_operator, make_png, make_region, pack_indices, world_import
+
+ADDONS_PATH = Path(__file__).resolve().parents[1] / "addons"
+
+
+@pytest.fixture
+def clustering(fake_bpy, monkeypatch):
+    monkeypatch.syspath_prepend(str(ADDONS_PATH))
+    yield importlib.import_module("lbff_gaffer.clustering")
+    for name in [name for name in sys.modules if name.split(".")[0] == "lbff_gaffer"]:
+        del sys.modules[name]
+
+
+@pytest.mark.parametrize("method", ["KMEANS", "OCTREE"])
+def test_emissive_blocks_cluster_into_a_bounded_set_of_lights(clustering, method):
+    assert clustering.emitter_for_texture("minecraft:block/glowstone").level == 15
+    assert clustering.emitter_for_texture("lava_still.001") == clustering.EMISSIVE_TEXTURES["lava"]
+    assert clustering.emitter_for_texture("block/soul_torch").color == clustering.EMISSIVE_TEXTURES["soul_torch"].color
+    assert clustering.emitter_for_texture("redstone_lamp") is None
+    assert clustering.emitter_for_texture("stone") is None
+
+    # Three far-apart groups of torches (warm) and one of soul lanterns (blue).
+    rng = np.random.default_rng(1)
+    centres = np.array([[0, 0, 64], [200, 0, 64], [0, 200, 64], [200, 200, 64]], dtype=float)
+    points = np.concatenate([c + rng.normal(0, 3, size=(5000, 3)) for c in centres])
+    weights = np.ones(len(points))
+    colors = np.repeat([[1.0, 0.7, 0.4]] * 3 + [[0.4, 0.8, 1.0]], 5000, axis=0)
+
+    lights = clustering.cluster_emitters(points, weights, colors, 16, method)
+    assert len(lights.weights) == 16
+    assert lights.counts.sum() == len(points)
+    assert lights.weights.sum() == pytest.approx(weights.sum())
+    # No light straddles two groups, so colours stay pure and positions stay near a group.
+    nearest = np.linalg.norm(lights.positions[:, None] - centres[None], axis=2).min(axis=1)
+    assert nearest.max() < 20
+    assert set(np.round(lights.colors[:, 2], 6)) == {0.4, 1.0}
+
+    assert len(clustering.cluster_emitters(points, weights, colors, 1, method).weights) == 1
+    assert len(clustering.cluster_emitters(points[:3], weights[:3], colors[:3], 16, method).weights) == 3
+    assert len(clustering.cluster_emitters(np.zeros((0, 3)), [], np.zeros((0, 3)), 16, method).weights) == 0
+
+
+@pytest.fixture
+def gaffer(fake_bpy, monkeypatch):
+    """Gaffer's operators, with the Minecraft importer importable next to them."""
+    monkeypatch.syspath_prepend(str(ADDONS_PATH))
+    yield importlib.import_module("lbff_gaffer.operators")
+    for name in [name for name in sys.modules if name.split(".")[0] in ("lbff_gaffer", "lbff_minecraft_importer")]:
+        del sys.modules[name]
+
+
+# Emissive glowstone, an instanced torch and an instanced post that does not glow.
+EMISSIVE_MODEL_FILES = {
+    "models/block/glowstone.json": {"parent": "block/cube_all", "textures": {"all": "block/glowstone"}},
+    "models/block/torch.json": {"textures": {"torch": "block/torch"}, "elements": [{
+        "from": [7, 0, 7], "to": [9, 10, 9],
+        "faces": {f: {"texture": "#torch"} for f in ("up", "north", "south", "west", "east")},
+    }]},
+    "blockstates/glowstone.json": {"variants": {"": {"model": "block/glowstone"}}},
+    "blockstates/torch.json": {"variants": {"": {"model": "block/torch"}}},
+}
+POST = {"Name": "minecraft:post", "Properties": {"north": "false", "east": "false"}}
+
+
+def lit_chunk() -> bytes:
+    """Return chunk NBT with a stone floor, one glowstone block, posts and torches standing on it."""
+    palette = [{"Name": "minecraft:air"}, {"Name": "minecraft:stone"}, {"Name": "minecraft:glowstone"},
+               POST, {"Name": "minecraft:torch"}]
+    blocks = np.zeros((16, 16, 16), dtype=np.int64)  # y, z, x
+    blocks[:2] = 1
+    blocks[2, 4, 4] = 2
+    # Posts come first, so the torch is prototype 1.
+    blocks[2, 0, [0, 2, 4]] = 3
+    blocks[2, [8, 10], [8, 10]] = 4
+    section = {"Y": 0, "block_states": {"palette": palette, "data": pack_indices(blocks.ravel().tolist(), 4)}}
+    return make_nbt({"DataVersion": 3953, "sections": [section]})
+
+
+@pytest.mark.parametrize("use_atlas", [False, True])
+def test_emissive_lights_follow_an_imported_world(gaffer, fake_bpy, tmp_path, monkeypatch, use_atlas):
+    monkeypatch.setenv("LBFF_CACHE_DIR", str(tmp_path / "cache"))
+    chunks = {(lx, 0): (3, lit_chunk(), 100) for lx in range(2)}
+    _, op, context, reports = world_import(fake_bpy, tmp_path, chunks)
+    pack = tmp_path / "pack/assets/minecraft"
+    for name, payload in EMISSIVE_MODEL_FILES.items():
+        (pack / name).write_text(json.dumps(payload))
+    # Materials are shared by identical textures, so each gets its own colour.
+    for name, rgb in (("glowstone", [250, 220, 120]), ("torch", [255, 200, 80])):
+        (pack / f"textures/block/{name}.png").write_bytes(make_png([(rgb + [255]) * 2] * 2))
+    context.scene.lbff_minecraft.use_atlas = use_atlas
+    op.instance_models = True
+    assert op.execute(context) == {'FINISHED'}, reports[-1]
+    assert "10 instances" in reports[-1][1]
+
+    world = context.scene.collection.children[0]
+    materials = {mat.name for obj in world.all_objects for mat in obj.data.materials}
+    assert materials == ({"LBFF_Atlas_0"} if use_atlas else {"stone", "glowstone"})
+
+    lighting = make_operator(gaffer.LBFF_OT_gaffer_create_lighting, reports)
+    lighting.mode, lighting.max_lights = 'EMISSIVE', 3
+    for _ in range(2):
+        assert lighting.execute(context) == {'FINISHED'}
+        emissive = [child for child in world.children if child.get(gaffer.GAFFER_PROP) == 'EMISSIVE']
+        assert len(emissive) == 1
+        lights = emissive[0].objects
+        assert 0 < len(lights) <= 3 and len(fake_bpy.data.lights) == len(lights)
+        # Five open glowstone faces and two torches per chunk; the posts and floor add nothing.
+        torch = gaffer.MODEL_FACES * 14 / 15
+        assert sum(light.data.energy for light in lights) == pytest.approx(2 * (5 + 2 * torch) * lighting.watts)
+        assert reports[-1] == ({'INFO'}, f"Created {len(lights)} lights for 14 emissive faces and models")
@@ -0,0 +1,1083 @@
+import gzip
+import importlib
+import json
+import os
+import re
+import struct
+import subprocess
+import sys
+import time
+import types
+import zipfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ADDONS_PATH = Path(__file__).resolve().parents[1] / "addons"
+
+
+@pytest.fixture
+def importer(monkeypatch):
+    """Import modules of the importer's bpy-free ``core`` package.
+
+    The addon ``__init__`` only wires up its Blender classes when ``bpy``
+    imports, so the package loads under plain pytest.
+    """
+    monkeypatch.syspath_prepend(str(ADDONS_PATH))
+    yield lambda name: importlib.import_module(f"lbff_minecraft_importer.core.{name}")
+    for name in list(sys.modules):
+        if name == "lbff_minecraft_importer" or name.startswith("lbff_minecraft_importer."):
+            del sys.modules[name]
+
+
+def png_chunk(ctype: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + ctype + body + struct.pack(">I", zlib.crc32(ctype + body))
+
+
+def make_png(rows, color_type=6, palette=None, filters=(0,)):
+    """Encode ``rows`` (lists of byte values per scanline) with cycling filters."""
+    bpp = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    width = len(rows[0]) // bpp
+    raw = bytearray()
+    prior = [0] * len(rows[0])
+    for y, row in enumerate(rows):
+        ftype = filters[y % len(filters)]
+        out = []
+        for i, x in enumerate(row):
+            a = row[i - bpp] if i >= bpp else 0
+            b = prior[i]
+            c = prior[i - bpp] if i >= bpp else 0
+            if ftype == 0:
+                pred = 0
+            elif ftype == 1:
+                pred = a
+            elif ftype == 2:
+                pred = b
+            elif ftype == 3:
+                pred = (a + b) // 2
+            else:
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                pred = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+            out.append((x - pred) & 0xFF)
+        raw += bytes([ftype] + out)
+        prior = row
+    data = b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, len(rows), 8, color_type, 0, 0, 0))
+    if palette is not None:
+        data += png_chunk(b"PLTE", bytes(c for rgb in palette for c in rgb))
+    return data + png_chunk(b"IDAT", zlib.compress(bytes(raw))) + png_chunk(b"IEND", b"")
+
+
+def make_zip(path: Path, members: dict):
+    with zipfile.ZipFile(path, "w") as zf:
+        for i, (name, data) in enumerate(members.items()):
+            compression = zipfile.ZIP_DEFLATED if i % 2 else zipfile.ZIP_STORED
+            zf.writestr(name, data, compress_type=compression)
+    return path
+
+
+def test_zip_pack_reads_members_and_reuses_index(importer, tmp_path, monkeypatch):
+    resource_pack = importer("resource_pack")
+    members = {
+        "assets/minecraft/textures/block/stone.png": b"stone" * 100,
+        "assets/minecraft/textures/block/dirt.png": b"dirt" * 100,
+        "pack.mcmeta": b"{}",
+    }
+    jar = make_zip(tmp_path / "client.jar", members)
+    cache = tmp_path / "cache"
+
+    with resource_pack.ZipPack(jar, cache_dir=cache) as pack:
+        assert sorted(pack.names()) == sorted(members)
+        for name, data in members.items():
+            assert pack.read(name) == data
+        index_file = pack.index_cache_path()
+    assert index_file.exists()
+
+    # A second open must come from the persisted index, not the archive.
+    calls = []
+    original = resource_pack.read_central_directory
+    monkeypatch.setattr(resource_pack, "read_central_directory", lambda buf: calls.append(1) or original(buf))
+    with resource_pack.ZipPack(jar, cache_dir=cache) as pack:
+        assert pack.read(resource_pack.texture_member("block/dirt")) == b"dirt" * 100
+    assert calls == []
+
+    # Rewriting the archive changes its fingerprint and invalidates the index.
+    make_zip(jar, {"pack.mcmeta": b'{"pack": {}}'})
+    with resource_pack.ZipPack(jar, cache_dir=cache) as pack:
+        assert list(pack.names()) == ["pack.mcmeta"]
+    assert calls == [1]
+
+
+def test_zip_pack_closes_when_the_index_cannot_be_read(importer, tmp_path):
+    resource_pack = importer("resource_pack")
+    jar = make_zip(tmp_path / "client.jar", {"pack.mcmeta": b"{}"})
+    jar.write_bytes(jar.read_bytes()[:-10])
+    pack = resource_pack.ZipPack(jar, cache_dir=tmp_path / "cache")
+    for _ in range(2):
+        with pytest.raises(resource_pack.ResourcePackError):
+            pack.open()
+        assert pack._mmap is None and pack._file is None
+    assert pack.index == {}
+
+
+def test_pack_stack_resolves_overrides_by_priority(importer, tmp_path):
+    resource_pack = importer("resource_pack")
+    stone = "assets/minecraft/textures/block/stone.png"
+    dirt = "assets/minecraft/textures/block/dirt.png"
+    vanilla = make_zip(tmp_path / "client.jar", {stone: b"vanilla-stone", dirt: b"vanilla-dirt"})
+    pack = make_zip(tmp_path / "pack.zip", {stone: b"pack-stone"})
+    dev = tmp_path / "dev"
+    (dev / "assets/minecraft/textures/block").mkdir(parents=True)
+    (dev / dirt).write_bytes(b"dev-dirt")
+
+    paths = resource_pack.parse_pack_stack(f" {dev} ; {pack};{vanilla}; ")
+    assert [str(p) for p in paths] == [str(dev), str(pack), str(vanilla)]
+
+    with resource_pack.PackStack(paths, cache_dir=tmp_path / "cache") as stack:
+        assert stack.read(stone) == b"pack-stone"
+        assert stack.read(dirt) == b"dev-dirt"
+        assert stack.index_cache_path().exists()
+        fingerprint = stack.fingerprint
+
+    # Editing the loose dev pack changes the stack fingerprint.
+    (dev / stone).write_bytes(b"dev-stone")
+    with resource_pack.PackStack(paths, cache_dir=tmp_path / "cache") as stack:
+        assert stack.fingerprint != fingerprint
+        assert stack.read(stone) == b"dev-stone"
+
+
+def test_decode_png_reverses_every_filter(importer, monkeypatch):
+    png = importer("png")
+    rows = [[(x * 37 + y * 11 + c * 5) % 256 for x in range(5) for c in range(4)] for y in range(6)]
+    rgba = png.decode_png(make_png(rows, filters=(0, 1, 2, 3, 4)))
+    assert rgba.shape == (6, 5, 4)
+    assert rgba.tolist() == np.array(rows, dtype=np.uint8).reshape(6, 5, 4).tolist()
+
+    # Byte by byte and along anti-diagonals give the same pixels, also for 3-byte pixels.
+    noisy = np.random.default_rng(3).integers(0, 256, size=(9, 7 * 3))
+    data = make_png(noisy.tolist(), color_type=2, filters=(3, 4, 4, 1, 0, 2))
+    for wavefront in (png.WAVEFRONT_PIXELS, 1):
+        monkeypatch.setattr(png, "WAVEFRONT_PIXELS", wavefront)
+        decoded = png.decode_png(data)
+        assert decoded[..., :3].tolist() == noisy.reshape(9, 7, 3).tolist() and (decoded[..., 3] == 255).all()
+    # The content hash ignores how the file was encoded.
+    assert png.pixel_hash(rgba) == png.pixel_hash(png.decode_png(make_png(rows)))
+
+    pixels = png.blender_pixels(rgba)
+    assert pixels.dtype == np.float32 and pixels.shape == (6 * 5 * 4,)
+    # Blender's first row is the image's bottom row.
+    assert pixels[:4].tolist() == pytest.approx([v / 255 for v in rows[-1][:4]])
+
+
+def test_decode_png_palette(importer):
+    png = importer("png")
+    palette = [(255, 0, 0), (0, 255, 0)]
+    rgba = png.decode_png(make_png([[0, 1], [1, 0]], color_type=3, palette=palette))
+    assert rgba[0, 1].tolist() == [0, 255, 0, 255]
+    assert rgba[1, 1].tolist() == [255, 0, 0, 255]
+
+
+def test_atlas_layout_is_deterministic_and_blits_textures(importer, tmp_path):
+    atlas = importer("atlas")
+    images = {
+        f"minecraft:block/t{i}": np.full((16, 16, 4), i, dtype=np.uint8) for i in range(40)
+    }
+    images["minecraft:block/tall"] = np.full((32, 16, 4), 200, dtype=np.uint8)
+
+    layout, pages = atlas.build_atlas(images, max_size=64, padding=1)
+    again = atlas.pack_layout({n: (a.shape[1], a.shape[0]) for n, a in reversed(images.items())}, 64, 1)
+    assert again.rects == layout.rects
+    assert len(pages) > 1
+    for w, h in layout.pages:
+        assert w & (w - 1) == 0 and h & (h - 1) == 0 and max(w, h) <= 64
+
+    for name, rect in layout.rects.items():
+        tile = pages[rect.page][rect.y:rect.y + rect.height, rect.x:rect.x + rect.width]
+        assert (tile == images[name]).all()
+
+    page, u0, v0, u1, v1 = layout.uv_rect("minecraft:block/tall")
+    uvs = atlas.remap_uvs([[0, 0], [1, 1]], [[u0, v0, u1, v1]] * 2)
+    assert uvs.ravel().tolist() == pytest.approx([u0, v0, u1, v1])
+
+    key = atlas.atlas_cache_key("fp", images, 64, 1)
+    atlas.save_cached_atlas(tmp_path, key, layout, pages)
+    cached_layout, cached_pages = atlas.load_cached_atlas(tmp_path, key)
+    assert cached_layout.rects == layout.rects
+    assert all((a == b).all() for a, b in zip(cached_pages, pages))
+
+
+def make_operator(op_class, reports):
+    """Instantiate ``op_class`` with its property defaults, recording ``report()`` calls in ``reports``."""
+    op = op_class()
+    for name, (_kind, options) in op_class.__annotations__.items():
+        setattr(op, name, options.get("default", ""))
+    op.report = lambda level, message: reports.append((level, message))
+    return op
+
+
+def test_block_texture_import_decodes_in_worker_processes(fake_bpy, importer, tmp_path, monkeypatch):
+    monkeypatch.setenv("LBFF_CACHE_DIR", str(tmp_path / "cache"))
+    operators = importlib.import_module("lbff_minecraft_importer.operators")
+    textures = importer("textures")
+    png = importer("png")
+    pools = []
+
+    class RecordingPool(textures.ProcessPoolExecutor):
+        def __init__(self, max_workers=None):
+            pools.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(textures, "ProcessPoolExecutor", RecordingPool)
+    folder = tmp_path / "pack/assets/minecraft/textures/block"
+    folder.mkdir(parents=True)
+    rng = np.random.default_rng(5)
+    expected = {}
+    for i in range(textures.POOL_MIN_TEXTURES + 4):
+        rows = rng.integers(0, 256, size=(16, 16 * 4))
+        rows[:, 3::4] = 255
+        expected[f"tex_{i:02d}"] = rows.reshape(16, 16, 4).astype(np.uint8)
+        # Paeth and Average rows, as most encoders write them.
+        (folder / f"tex_{i:02d}.png").write_bytes(make_png(rows.tolist(), filters=(4, 3)))
+    (folder / "tex_copy.png").write_bytes((folder / "tex_00.png").read_bytes())
+    (folder / "broken.png").write_bytes(b"\x89PNG\r\n\x1a\nnot really")
+
+    scene = fake_bpy.context.scene
+    scene.lbff_minecraft = types.SimpleNamespace(pack_stack=str(tmp_path / "pack"), use_atlas=False,
+                                                 atlas_max_size=256, atlas_padding=0)
+    context = types.SimpleNamespace(scene=scene)
+    reports = []
+    op = make_operator(operators.LBFF_OT_import_minecraft_block_textures, reports)
+    op.workers = 2
+
+    assert op.execute(context) == {'FINISHED'}
+    level, message = reports[-1]
+    assert level == {'WARNING'} and message.startswith("Imported 21 textures")
+    assert "40 datablocks created, 2 reused, 1 failed" in message
+    assert pools == [2]
+    images = {image.name: image for image in fake_bpy.data.images}
+    assert sorted(images) == sorted(expected)
+    assert np.array_equal(images["tex_07"].pixels.values["pixels"], png.blender_pixels(expected["tex_07"]))
+    assert all(image.packed for image in images.values())
+    materials = {mat.name: mat for mat in fake_bpy.data.materials}
+    texture_node = next(node for node in materials["tex_07"].node_tree.nodes if node.type == 'TEX_IMAGE')
+    assert texture_node.image is images["tex_07"] and texture_node.interpolation == 'Closest'
+
+    # A second import finds every image and material by content.
+    assert op.execute(context) == {'FINISHED'}
+    assert "0 datablocks created, 42 reused" in reports[-1][1]
+    assert len(fake_bpy.data.images) == len(fake_bpy.data.materials) == 20
+
+    # With the atlas, the static textures share one page and its material.
+    scene.lbff_minecraft.use_atlas = True
+    assert op.execute(context) == {'FINISHED'}
+    uv_table = json.loads(fake_bpy.data.materials.get("LBFF_Atlas_0")[operators.ATLAS_UV_TABLE_PROP])
+    assert len(uv_table) == 21 and "minecraft:block/tex_copy" in uv_table
+    assert len(fake_bpy.data.images) == 21 and reports[-1][0] == {'WARNING'}
+
+
+def test_animation_frames_are_views_and_blend_lazily(importer):
+    animation = importer("animation")
+    png = importer("png")
+    strip = np.zeros((48, 16, 4), dtype=np.uint8)
+    for i in range(3):
+        strip[i * 16:(i + 1) * 16] = (i * 100, 0, 0, 255)
+    meta = animation.parse_mcmeta(
+        b'{"animation": {"frametime": 2, "interpolate": true, "frames": [0, {"index": 2, "time": 4}]}}', 16, 48
+    )
+    assert meta.frames == ((0, 2), (2, 4)) and meta.total_ticks == 6
+
+    view = animation.frame_view(strip, meta, 2)
+    assert view.base is strip and view[0, 0, 0] == 200
+
+    # 20 fps -> one game tick per scene frame; frame 4 is a quarter into index 2.
+    schedule = list(animation.scene_schedule(meta, 20.0, 1, 4))
+    assert [s[1] for s in schedule] == [0, 0, 2, 2]
+    assert schedule[3][3] == pytest.approx(0.25)
+
+    texture = animation.AnimatedTexture(strip, meta)
+    frames = dict(texture.frames_for_range(20.0, 1, 4))
+    assert frames[1].base is strip
+    assert frames[2][0, 0].tolist() == [100, 0, 0, 255]
+    assert len(texture._blended) == 2
+
+    assert png.decode_png(png.encode_png(strip)).tolist() == strip.tolist()
+
+
+def make_region(path: Path, chunks: dict):
+    """Write an Anvil region; ``chunks`` maps (lx, lz) -> (compression, payload, timestamp)."""
+    header = bytearray(8192)
+    body = bytearray()
+    for (lx, lz), (compression, payload, timestamp) in chunks.items():
+        sector = 2 + len(body) // 4096
+        record = struct.pack(">IB", len(payload) + 1, compression) + payload
+        record += b"\0" * (-len(record) % 4096)
+        struct.pack_into(">I", header, 4 * (lx + 32 * lz), (sector << 8) | (len(record) // 4096))
+        struct.pack_into(">I", header, 4096 + 4 * (lx + 32 * lz), timestamp)
+        body += record
+    path.write_bytes(bytes(header + body))
+    return path
+
+
+def test_region_reader_streams_chunks(importer, tmp_path):
+    region = importer("region")
+    # Literal "ab", overlapping match (offset 2, length 6), final literal "c".
+    lz4_block = bytes([0x22]) + b"ab" + b"\x02\x00" + bytes([0x10]) + b"c"
+    lz4_stream = (
+        b"LZ4Block" + bytes([0x20]) + struct.pack("<iii", len(lz4_block), 9, 0) + lz4_block
+        + b"LZ4Block" + bytes([0x10]) + struct.pack("<iii", 0, 0, 0)
+    )
+    path = make_region(tmp_path / "r.-1.2.mca", {
+        (0, 0): (2, zlib.compress(b"zlib-chunk"), 111),
+        (31, 5): (4, lz4_stream, 222),
+    })
+
+    with region.RegionFile(path) as rf:
+        assert sorted(rf.present()) == [(0, 0), (31, 5)]
+        assert rf.timestamps[5, 31] == 222
+        assert rf.read_chunk(1, 1) is None
+        chunk = rf.read_chunk(31, 5)
+    assert (chunk.x, chunk.z, chunk.nbt) == (-32 + 31, 64 + 5, b"ababababc")
+
+    for workers in (0, 2):
+        chunks = sorted(region.iter_chunks([path], workers=workers, batch=1))
+        assert [(c.x, c.z, c.timestamp, c.nbt) for c in chunks] == [
+            (-32, 64, 111, b"zlib-chunk"),
+            (-1, 69, 222, b"ababababc"),
+        ]
+
+
+def nbt_payload(value):
+    """Encode ``value`` as an NBT payload; returns ``(tag, bytes)``."""
+    if isinstance(value, dict):
+        body = b"".join(
+            bytes([tag]) + struct.pack(">H", len(k)) + k.encode() + payload
+            for k, (tag, payload) in ((k, nbt_payload(v)) for k, v in value.items())
+        )
+        return 10, body + b"\0"
+    if isinstance(value, list):
+        items = [nbt_payload(v) for v in value]
+        tag = items[0][0] if items else 0
+        return 9, bytes([tag]) + struct.pack(">i", len(items)) + b"".join(p for _, p in items)
+    if isinstance(value, str):
+        return 8, struct.pack(">H", len(value)) + value.encode()
+    if isinstance(value, np.ndarray):
+        tag = {1: 7, 4: 11, 8: 12}[value.dtype.itemsize]
+        return tag, struct.pack(">i", len(value)) + value.astype(value.dtype.newbyteorder(">")).tobytes()
+    if isinstance(value, float):
+        return 6, struct.pack(">d", value)
+    return 3, struct.pack(">i", value)
+
+
+def make_nbt(root: dict) -> bytes:
+    return b"\x0a\x00\x00" + nbt_payload(root)[1]
+
+
+def test_nbt_arrays_are_views_and_selection_skips(importer):
+    nbt = importer("nbt")
+    longs = np.arange(-3, 253, dtype=np.int64)
+    data = make_nbt({
+        "DataVersion": 3953,
+        "Entities": [{"id": "minecraft:pig", "Pos": [1.0, 2.0, 3.0]}],
+        "sections": [
+            {"Y": -4, "block_states": {"palette": [{"Name": "minecraft:stone"}], "data": longs},
+             "biomes": {"palette": ["minecraft:plains"]}},
+            {"Y": -3, "block_states": {"palette": [{"Name": "minecraft:air"}]}},
+        ],
+        "Heightmaps": {"WORLD_SURFACE": np.arange(37, dtype=np.int64)},
+    })
+
+    full = nbt.parse_nbt(data)
+    assert full["Entities"][0]["Pos"] == [1.0, 2.0, 3.0]
+    states = full["sections"][0]["block_states"]["data"]
+    assert states.dtype == np.dtype(">i8") and states.tolist() == longs.tolist()
+    assert states.base is not None  # a view, not a copy
+
+    picked = nbt.parse_nbt(data, select=["sections[*].block_states", "DataVersion"])
+    assert set(picked) == {"DataVersion", "sections"}
+    assert picked["sections"][1] == {"block_states": {"palette": [{"Name": "minecraft:air"}]}}
+    assert picked["sections"][0]["block_states"]["data"].tolist() == longs.tolist()
+
+    with pytest.raises(nbt.NBTError):
+        nbt.parse_nbt(data[:40])
+
+
+def pack_indices(values, bits):
+    """Reference (per-entry) packer in the post-1.16 non-spanning layout."""
+    per_long = 64 // bits
+    longs = []
+    for i in range(0, len(values), per_long):
+        word = 0
+        for j, v in enumerate(values[i:i + per_long]):
+            word |= v << (j * bits)
+        longs.append(word - (1 << 64) if word >= 1 << 63 else word)
+    return np.array(longs, dtype=np.int64)
+
+
+def test_palette_unpacking_matches_reference(importer):
+    palette = importer("palette")
+    rng = np.random.default_rng(1)
+    for bits in (1, 4, 5, 7, 12, 15):
+        values = rng.integers(0, 1 << bits, size=4096).tolist()
+        packed = pack_indices(values, bits).astype(">i8")
+        assert palette.unpack_indices(packed, bits, 4096).tolist() == values
+
+    names = [{"Name": f"minecraft:b{i}"} for i in range(20)]
+    blocks = rng.integers(0, 20, size=4096)
+    states = {"palette": names, "data": pack_indices(blocks.tolist(), 5)}
+    biomes = {"palette": ["minecraft:plains", "minecraft:desert"], "data": pack_indices([1] * 64, 1)}
+    chunk = {"sections": [
+        {"Y": 0, "block_states": {"palette": [{"Name": "minecraft:air"}]}},
+        {"Y": 1, "block_states": states, "biomes": biomes},
+    ]}
+    (section,) = palette.iter_sections(chunk)
+    assert section.y == 1
+    assert section.blocks.shape == (16, 16, 16)
+    assert section.blocks.ravel().tolist() == blocks.tolist()
+    assert section.biomes.shape == (4, 4, 4) and (section.biomes == 1).all()
+
+
+def test_mesher_culls_hidden_faces_and_merges_coplanar(importer):
+    mesher = importer("mesher")
+    table = mesher.BlockTable()
+    stone = table.state_id({"Name": "minecraft:stone"})
+    glass = table.state_id({"Name": "minecraft:glass"})
+    states = np.zeros((3, 3, 4), dtype=np.int32)
+    states[1, 1, 0:3] = stone
+
+    data = mesher.mesh_chunk(states, table)
+    # A 3x1x1 bar of one texture: 6 merged quads sharing its 8 corners.
+    assert len(data.loop_starts) == 6 and len(data.vertices) == 8
+    assert data.materials == ["minecraft:block/stone"]
+    quads = data.vertices[data.loops].reshape(-1, 4, 3)
+    normals = np.cross(quads[:, 1] - quads[:, 0], quads[:, 2] - quads[:, 0])
+    assert ((normals * (quads.mean(axis=1) - [1.5, -1.5, 1.5])).sum(axis=1) > 0).all()
+    assert len(mesher.mesh_chunk(states, table, greedy=False).loop_starts) == 14
+
+    # Glass does not hide stone, but hides faces against other glass.
+    states[1, 1, 3] = glass
+    states[1, 0, 3] = glass
+    data = mesher.mesh_chunk(states, table, origin=(16, 0, 0))
+    assert len(data.loop_starts) == 12
+    assert data.vertices[:, 0].min() == 16
+
+    atlas = {"minecraft:block/stone": (0, 0.0, 0.0, 0.5, 0.5)}
+    data = mesher.mesh_chunk(states, table, atlas=atlas)
+    assert len(data.loop_starts) == 23
+    assert data.materials == ["minecraft:block/glass", "atlas:0"]
+    stone_faces = data.material_indices == 1
+    assert data.uvs.reshape(-1, 4, 2)[stone_faces].max() == 0.5
+
+
+MODEL_FILES = {
+    "models/block/block.json": {},
+    "models/block/cube.json": {"parent": "block/block", "elements": [{
+        "from": [0, 0, 0], "to": [16, 16, 16],
+        "faces": {f: {"texture": "#" + f, "cullface": f} for f in ("down", "up", "north", "south", "west", "east")},
+    }]},
+    "models/block/cube_all.json": {"parent": "block/cube", "textures": {
+        f: "#all" for f in ("down", "up", "north", "south", "west", "east")}},
+    "models/block/stone.json": {"parent": "minecraft:block/cube_all", "textures": {"all": "minecraft:block/stone"}},
+    "models/block/slab.json": {"elements": [{
+        "from": [0, 0, 0], "to": [16, 8, 16],
+        "faces": {
+            "down": {"texture": "#bottom", "cullface": "down"},
+            "up": {"texture": "#top"},
+            "north": {"texture": "#side", "cullface": "north"},
+            "south": {"texture": "#side", "cullface": "south"},
+            "west": {"texture": "#side", "cullface": "west"},
+            "east": {"texture": "#side", "cullface": "east"},
+        },
+    }]},
+    "models/block/stone_slab.json": {"parent": "block/slab", "textures": {
+        "bottom": "block/stone", "top": "block/smooth_stone", "side": "#bottom"}},
+    "models/block/post.json": {"textures": {"t": "block/stone"}, "elements": [{
+        "from": [6, 0, 6], "to": [10, 16, 10], "faces": {"north": {"texture": "#t"}}}]},
+    "blockstates/stone.json": {"variants": {"": {"model": "minecraft:block/stone"}}},
+    "blockstates/stone_slab.json": {"variants": {
+        "type=bottom": {"model": "block/stone_slab"},
+        "type=double": [{"model": "block/stone"}, {"model": "block/stone_slab"}],
+    }},
+    "blockstates/post.json": {"multipart": [
+        {"apply": {"model": "block/post"}},
+        {"when": {"OR": [{"north": "true"}, {"east": "true|low"}]}, "apply": {"model": "block/post", "y": 90}},
+    ]},
+}
+
+
+def test_model_resolver_bakes_states_once_and_persists(importer, tmp_path):
+    resource_pack = importer("resource_pack")
+    models = importer("models")
+    mesher = importer("mesher")
+    pack = tmp_path / "pack"
+    for name, payload in MODEL_FILES.items():
+        (pack / "assets/minecraft" / name).parent.mkdir(parents=True, exist_ok=True)
+        (pack / "assets/minecraft" / name).write_text(json.dumps(payload))
+
+    with resource_pack.PackStack([pack], cache_dir=tmp_path / "cache") as stack:
+        resolver = models.ModelResolver(stack)
+        slab = resolver.resolve("minecraft:stone_slab", {"type": "bottom"})
+        assert len(slab.textures) == 6
+        assert set(slab.textures) == {"minecraft:block/stone", "minecraft:block/smooth_stone"}
+        assert slab.positions[..., 1].max() == 0.5
+        assert resolver.resolve("minecraft:stone_slab", {"type": "bottom"}) is slab
+        assert resolver.resolve("minecraft:stone_slab", {"type": "double"}).textures == ("minecraft:block/stone",) * 6
+
+        # Multipart: the y=90 copy applies for east=low and turns north into east.
+        post = resolver.resolve("minecraft:post", {"north": "false", "east": "low"})
+        assert len(post.textures) == 2
+        normals = post.face_normals().round(3).tolist()
+        assert normals == [[0, 0, -1], [1, 0, 0]]
+
+        table = mesher.BlockTable(mesher.model_describer(resolver))
+        states = np.zeros((1, 1, 2), dtype=np.int32)
+        states[0, 0, 0] = table.state_id({"Name": "minecraft:stone_slab", "Properties": {"type": "bottom"}})
+        states[0, 0, 1] = table.state_id({"Name": "minecraft:stone"})
+        assert table.arrays()[0].tolist() == [False, False, True]
+        # The slab's east face is culled by the stone; the stone's west face is not.
+        assert len(mesher.mesh_chunk(states, table).loop_starts) == 11
+        resolver.save()
+
+        # A fresh resolver for the same stack bakes nothing from JSON.
+        stack.read = lambda member: pytest.fail(f"read {member}")
+        cached = models.ModelResolver(stack).resolve("minecraft:stone_slab", {"type": "bottom"})
+        assert cached.textures == slab.textures
+        assert np.allclose(cached.positions, slab.positions)
+
+    (pack / "assets/minecraft/blockstates/stone_slab.json").unlink()
+    with resource_pack.PackStack([pack], cache_dir=tmp_path / "cache") as stack:
+        # The stack fingerprint changed, so the persisted states are ignored.
+        with pytest.raises(models.ModelError):
+            models.ModelResolver(stack).resolve("minecraft:stone_slab", {"type": "bottom"})
+
+
+def test_instanced_models_match_baked_geometry(importer, tmp_path):
+    resource_pack = importer("resource_pack")
+    models = importer("models")
+    mesher = importer("mesher")
+    pack = tmp_path / "pack"
+    for name, payload in MODEL_FILES.items():
+        (pack / "assets/minecraft" / name).parent.mkdir(parents=True, exist_ok=True)
+        (pack / "assets/minecraft" / name).write_text(json.dumps(payload))
+    props = {"north": "true", "east": "false"}
+
+    with resource_pack.PackStack([pack], cache_dir=tmp_path / "cache") as stack:
+        resolver = models.ModelResolver(stack, persist=False)
+        table = mesher.BlockTable(mesher.model_describer(resolver, instance=True))
+        states = np.zeros((2, 2, 2), dtype=np.int32)
+        states[1, 0, 1] = states[0, 1, 0] = table.state_id({"Name": "minecraft:post", "Properties": props})
+        states[0, 0, 0] = table.state_id({"Name": "minecraft:stone"})
+        baked = resolver.resolve("minecraft:post", props)
+
+    # Posts are never culled, so they become instances of one prototype.
+    assert len(table.prototype_models) == 1
+    assert len(mesher.mesh_chunk(states, table).loop_starts) == 6
+    points = mesher.instance_points(states, table, origin=(16, 0, 32))
+    assert points.prototypes.tolist() == [0, 0, 0, 0]
+
+    prototype = mesher.prototype_mesh(table, 0)
+    placed = set()
+    for position, (rx, _, rz) in zip(points.positions, points.rotations):
+        cx, sx, cz, sz = np.cos(rx), np.sin(rx), np.cos(rz), np.sin(rz)
+        rotation = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]]) @ np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+        placed |= set(map(tuple, (prototype.vertices @ rotation.T + position).round(4).tolist()))
+
+    expected = set()
+    for x, y, z in [(17, 1, 32), (16, 0, 33)]:
+        corners = baked.positions.reshape(-1, 3) + [x, y, z]
+        expected |= set(map(tuple, np.stack([corners[:, 0], -corners[:, 2], corners[:, 1]], axis=1).round(4).tolist()))
+    assert placed == expected
+
+
+def test_manifest_skips_unchanged_chunks(importer, tmp_path):
+    region = importer("region")
+    manifest_mod = importer("manifest")
+    chunks = {(0, 0): (3, b"a" * 10, 100), (1, 0): (3, b"b" * 10, 100), (0, 1): (3, b"c" * 10, 100)}
+    path = make_region(tmp_path / "r.-1.0.mca", chunks)
+
+    present = region.chunk_timestamps([path])
+    assert present == {(-32, 0): 100, (-31, 0): 100, (-32, 1): 100}
+    manifest = manifest_mod.WorldManifest("settings")
+    for chunk in region.iter_chunks([path], workers=0):
+        manifest.record((chunk.x, chunk.z), chunk.timestamp, manifest_mod.chunk_digest(chunk.nbt))
+    manifest = manifest_mod.WorldManifest.from_json(manifest.to_json())
+    assert manifest.settings_key == "settings" and len(manifest.chunks) == 3
+
+    # Touch one chunk without changing it, rewrite another, delete a third.
+    chunks[(0, 0)] = (3, b"a" * 10, 200)
+    chunks[(1, 0)] = (3, b"B" * 10, 200)
+    del chunks[(0, 1)]
+    make_region(path, chunks)
+    present = region.chunk_timestamps([path])
+    assert manifest.removed(present) == {(-32, 1)}
+
+    def stale(r, lx, lz):
+        return manifest.needs_decode((r.rx * 32 + lx, r.rz * 32 + lz), int(r.timestamps[lz, lx]))
+
+    decoded = {(c.x, c.z): c for c in region.iter_chunks([path], workers=0, select=stale)}
+    assert set(decoded) == {(-32, 0), (-31, 0)}
+    changed = [key for key, c in decoded.items() if manifest.needs_mesh(key, manifest_mod.chunk_digest(c.nbt))]
+    assert changed == [(-31, 0)]
+    assert manifest_mod.WorldManifest.from_json("{not json") is None
+
+
+def test_world_index_limits_reads_to_the_area(importer, tmp_path):
+    spatial = importer("spatial")
+    manifest_mod = importer("manifest")
+    folder = tmp_path / "region"
+    folder.mkdir()
+    make_region(folder / "r.0.0.mca", {(0, 0): (3, b"a", 1), (2, 0): (3, b"b", 2), (31, 31): (3, b"c", 3)})
+    make_region(folder / "r.-1.0.mca", {(31, 0): (3, b"d", 4)})
+    (folder / "notes.txt").write_text("not a region")
+
+    index = spatial.WorldIndex(folder)
+    assert sorted(index.regions) == [(-1, 0), (0, 0)]
+    box = spatial.BoxArea(0, 0, 40, 15)
+    assert [p.name for p in index.region_paths(box)] == ["r.0.0.mca"]
+    assert index.chunk_timestamps(box) == {(0, 0): 1, (2, 0): 2}
+    assert index.chunk_timestamps() == {(0, 0): 1, (2, 0): 2, (31, 31): 3, (-1, 0): 4}
+
+    near = spatial.RadiusArea(-4.0, 8.0, 6.0)
+    assert index.chunk_timestamps(near) == {(0, 0): 1, (-1, 0): 4}
+    inside = index.contains(near)
+    assert inside((0, 0)) and not inside((31, 31))
+
+    # A partial re-import only removes chunks that belong to its area.
+    manifest = manifest_mod.WorldManifest("s", {key: manifest_mod.ChunkRecord(1, "") for key in [(0, 0), (5, 5)]})
+    assert manifest.removed({}, within=index.contains(box)) == {(0, 0)}
+
+    world = tmp_path / "world"
+    world.mkdir()
+    level = {"Data": {"SpawnX": 1, "SpawnY": 70, "SpawnZ": 2,
+                      "Player": {"Pos": [10.5, 64.0, -3.5], "Dimension": "minecraft:the_nether"}}}
+    (world / "level.dat").write_bytes(gzip.compress(make_nbt(level)))
+    assert spatial.player_position(world) == (10.5, 64.0, -3.5, "minecraft:the_nether")
+    del level["Data"]["Player"]
+    (world / "level.dat").write_bytes(make_nbt(level))
+    assert spatial.player_position(world) == (1.0, 70.0, 2.0, "minecraft:overworld")
+    assert spatial.player_position(tmp_path) is None
+
+
+def test_camera_frustum_culls_chunks_behind_and_beside(importer):
+    spatial = importer("spatial")
+    mesher = importer("mesher")
+    # Perspective camera (90 degree FOV, clip 1..200) at Minecraft (8, 70, 8)
+    # looking north: Blender's camera -Z rotated onto +Y.
+    near, far = 1.0, 200.0
+    projection = np.array([
+        [1, 0, 0, 0],
+        [0, 1, 0, 0],
+        [0, 0, -(far + near) / (far - near), -2 * far * near / (far - near)],
+        [0, 0, -1, 0],
+    ])
+    camera = np.array([[1, 0, 0, 8], [0, 0, -1, -8], [0, 1, 0, 70], [0, 0, 0, 1]], dtype=float)
+    view_projection = projection @ np.linalg.inv(camera)
+
+    area = spatial.FrustumArea(spatial.frustum_planes(view_projection))
+    visible = lambda cx, cz: bool(area.overlaps(cx * 16, cz * 16, cx * 16 + 16, cz * 16 + 16))
+    assert visible(0, -3) and visible(2, -3)
+    assert not visible(0, 3)                # behind
+    assert not visible(20, -3)              # outside the side planes
+    assert not visible(0, -20)              # beyond the far clip
+    wide = spatial.FrustumArea(spatial.frustum_planes(view_projection, margin=24))
+    assert wide.overlaps(0, 16, 16, 32) and not wide.overlaps(0, 64, 16, 80)
+
+    xs, zs = np.meshgrid(np.arange(-4, 4) * 16, np.arange(-4, 4) * 16)
+    mask = area.overlaps(xs, zs, xs + 16, zs + 16)
+    assert mask.shape == (8, 8) and mask[:3].any() and not mask[5:].any()
+
+    data = mesher.placeholder_mesh({(0, 0), (-1, 2)}, 62, "minecraft:block/stone")
+    assert data.materials == ["minecraft:block/stone"] and len(data.loop_starts) == 2
+    assert set(data.vertices[:, 2].tolist()) == {63.0}
+    assert data.vertices[:, 1].min() == -48 and data.vertices[:, 0].min() == -16
+
+
+def test_lod_downsamples_to_dominant_blocks_and_heightfields(importer):
+    mesher = importer("mesher")
+    lod = importer("lod")
+    table = mesher.BlockTable()
+    stone = table.state_id({"Name": "minecraft:stone"})
+    dirt = table.state_id({"Name": "minecraft:dirt"})
+    torch = table.state_id({"Name": "minecraft:torch"})
+    cube, _opaque, _faces = table.arrays()
+    assert lod.lod_level(100, (256, 512, 1024)) == 0
+    assert lod.lod_level(600, (256, 512, 1024)) == 2 and lod.lod_level(5000, (256, 512, 1024)) == lod.SURFACE_LOD
+
+    states = np.zeros((32, 16, 16), dtype=np.int32)
+    states[:8] = stone
+    states[:2, :2, :2] = dirt
+    states[0, 0, 0] = stone
+    states[8, :, :] = torch         # non-cubes never win a cell
+    states[9, 0, 0] = stone         # too sparse to fill a 2x cell
+    coarse = lod.dominant_states(states, cube, 2)
+    assert coarse.shape == (16, 8, 8)
+    assert coarse[0, 0, 0] == dirt and (coarse[1:4] == stone).all() and (coarse[4:] == 0).all()
+
+    data = lod.downsampled_mesh(states, table, 4, origin=(32, -64, 16))
+    # Two merged 16x8x16 slabs of stone: 16 blocks wide in 4x cells.
+    assert data.vertices[:, 0].min() == 32 and data.vertices[:, 0].max() == 48
+    assert data.vertices[:, 2].min() == -64 and data.vertices[:, 2].max() == -56
+    assert len(data.loop_starts) == 6
+
+    # Heightmap: 9-bit entries, stone 8 blocks above the bottom at y = -64,
+    # with one column raised to 12.
+    heights = np.full(256, 8)
+    heights[5 * 16 + 3] = 12
+    states[8:12, 5, 3] = stone
+    root = {"Heightmaps": {"MOTION_BLOCKING": pack_indices(heights.tolist(), 9)}, "yPos": -4}
+    assert lod.decode_heightmap(root["Heightmaps"]["MOTION_BLOCKING"])[5, 3] == 12
+    data = lod.surface_mesh(root, states, -4, table, origin=(0, 0, 0))
+    # 256 tops, 4 walls around the raised column, 64 border walls.
+    assert len(data.loop_starts) == 256 + 4 + 64
+    assert data.vertices[:, 2].max() == -52 and data.vertices[:, 2].min() == -57
+    quads = data.vertices[data.loops].reshape(-1, 4, 3)
+    normals = np.cross(quads[:, 1] - quads[:, 0], quads[:, 2] - quads[:, 0])
+    centre = np.array([8, -8, -56])
+    sides = np.abs(normals[:, 2]) < 1e-6
+    assert (normals[~sides, 2] > 0).all()
+    border = sides & (np.abs(quads[:, :, :2].mean(axis=1) - centre[:2]).max(axis=1) == 8)
+    assert border.sum() == 64
+    assert ((normals[border, :2] * (quads[border].mean(axis=1)[:, :2] - centre[:2])).sum(axis=1) > 0).all()
+    assert lod.surface_mesh({}, states, -4, table).vertices[:, 2].max() == -52
+
+
+def test_headless_conversion_writes_mapped_artifacts(importer, tmp_path, monkeypatch):
+    mesher = importer("mesher")
+    models = importer("models")
+    resource_pack = importer("resource_pack")
+    artifacts = importer("artifacts")
+    convert = importer("convert")
+    monkeypatch.setenv("LBFF_CACHE_DIR", str(tmp_path / "cache"))
+    pack = tmp_path / "pack"
+    for name, payload in MODEL_FILES.items():
+        (pack / "assets/minecraft" / name).parent.mkdir(parents=True, exist_ok=True)
+        (pack / "assets/minecraft" / name).write_text(json.dumps(payload))
+
+    blocks = np.zeros(4096, dtype=np.int64)
+    blocks[:256] = 1        # stone floor
+    blocks[300] = 2         # a post
+    section = {"Y": 0, "block_states": {"palette": [
+        {"Name": "minecraft:air"}, {"Name": "minecraft:stone"},
+        {"Name": "minecraft:post", "Properties": {"north": "true", "east": "false"}},
+    ], "data": pack_indices(blocks.tolist(), 4)}}
+    nbt = make_nbt({"DataVersion": 3953, "sections": [section]})
+    world = tmp_path / "world"
+    (world / "region").mkdir(parents=True)
+    make_region(world / "region" / "r.0.0.mca", {(1, 0): (3, nbt, 50), (3, 0): (3, nbt, 60)})
+
+    # The CLI runs without bpy (or the addon's Blender half) importable and
+    # writes into the shared cache by default.
+    env = dict(os.environ, PYTHONPATH=str(ADDONS_PATH))
+    run = subprocess.run(
+        [sys.executable, "-m", "lbff_minecraft_importer.core", str(world), "--packs", str(pack),
+         "--box", "0", "0", "31", "15", "--workers", "2"],
+        env=env, capture_output=True, text=True,
+    )
+    assert run.returncode == 0, run.stderr
+    assert "1 chunks converted" in run.stdout
+
+    with resource_pack.PackStack([pack]) as stack:
+        key = artifacts.mesh_cache_key(stack.fingerprint, greedy=True, instance=True)
+        table = mesher.BlockTable(mesher.model_describer(models.ModelResolver(stack), instance=True))
+        low, states = mesher.chunk_states(importer("palette").iter_sections(importer("nbt").parse_nbt(nbt)), table)
+    out = artifacts.artifact_folder(tmp_path / "cache" / "meshes", key)
+    assert artifacts.load_artifact(out, 3, 0) is None      # outside the box
+    assert artifacts.load_artifact(out, 1, 0, timestamp=49) is None
+    artifact = artifacts.load_artifact(out, 1, 0, timestamp=50)
+    expected = mesher.mesh_chunk(states, table, (16, 0, 0))
+    assert artifact.timestamp == 50 and artifact.mesh.materials == expected.materials
+    assert np.array_equal(artifact.mesh.vertices, expected.vertices)
+    assert np.array_equal(artifact.mesh.loops, expected.loops)
+    # Buffers are read-only views of the mapped file, ready for foreach_set.
+    assert not artifact.mesh.vertices.flags.writeable and artifact.mesh.vertices.flags.c_contiguous
+    # Both post parts (base and rotated copy) instance the same model.
+    assert artifact.prototypes == ["minecraft:block/post"] and artifact.points.prototypes.tolist() == [0, 0]
+
+    stats = convert.convert_world(world, [str(pack)], workers=0, log=lambda line: None)
+    assert (stats.written, stats.unchanged) == (1, 1)
+
+    # One cached unmerged mesh serves atlas imports: only UVs and materials change.
+    flat = mesher.mesh_chunk(states, table, (16, 0, 0), greedy=False)
+    uv_table = {"minecraft:block/stone": (0, 0.0, 0.0, 0.5, 0.5)}
+    atlased = mesher.mesh_chunk(states, table, (16, 0, 0), atlas=uv_table)
+    remapped = mesher.atlas_mesh(flat, uv_table)
+    assert remapped.materials == atlased.materials == ["atlas:0"]
+    assert np.array_equal(remapped.uvs, atlased.uvs)
+    assert np.array_equal(remapped.material_indices, atlased.material_indices)
+
+
+def floor_chunk(height: int) -> bytes:
+    """Return chunk NBT with a stone floor ``height`` blocks thick in section 0."""
+    blocks = np.zeros(4096, dtype=np.int64)
+    blocks[:256 * height] = 1
+    section = {"Y": 0, "block_states": {"palette": [{"Name": "minecraft:air"}, {"Name": "minecraft:stone"}],
+                                        "data": pack_indices(blocks.tolist(), 4)}}
+    return make_nbt({"DataVersion": 3953, "sections": [section]})
+
+
+def world_import(fake_bpy, tmp_path, chunks):
+    """Return ``(operators, op, context, reports)`` for importing a stone world with ``chunks``."""
+    operators = importlib.import_module("lbff_minecraft_importer.operators")
+    pack = tmp_path / "pack"
+    for name, payload in MODEL_FILES.items():
+        (pack / "assets/minecraft" / name).parent.mkdir(parents=True, exist_ok=True)
+        (pack / "assets/minecraft" / name).write_text(json.dumps(payload))
+    (pack / "assets/minecraft/textures/block").mkdir(parents=True)
+    (pack / "assets/minecraft/textures/block/stone.png").write_bytes(make_png([[120, 120, 120, 255] * 2] * 2))
+    world = tmp_path / "world"
+    (world / "region").mkdir(parents=True)
+    make_region(world / "region" / "r.0.0.mca", chunks)
+
+    scene = fake_bpy.context.scene
+    scene.lbff_minecraft = types.SimpleNamespace(pack_stack=str(pack), use_atlas=False, atlas_max_size=4096,
+                                                 atlas_padding=0, use_biome_tint=False, areas={})
+    reports = []
+    op = make_operator(operators.LBFF_OT_import_minecraft_world, reports)
+    op.directory, op.workers, op.instance_models = str(world), 1, False
+    return operators, op, types.SimpleNamespace(scene=scene), reports
+
+
+def test_world_reimport_reuses_and_replaces_chunk_objects(fake_bpy, importer, tmp_path, monkeypatch):
+    monkeypatch.setenv("LBFF_CACHE_DIR", str(tmp_path / "cache"))
+    profiler = importer("profiling").PROFILER
+    chunks = {(lx, 0): (3, floor_chunk(2), 100) for lx in range(3)}
+    operators, op, context, reports = world_import(fake_bpy, tmp_path, chunks)
+    scene = context.scene
+    world = tmp_path / "world"
+    caches = []
+
+    class RecordingCache(operators.DatablockCache):
+        def __init__(self):
+            super().__init__()
+            caches.append(self)
+
+    monkeypatch.setattr(operators, "DatablockCache", RecordingCache)
+
+    def run():
+        assert op.execute(context) == {'FINISHED'}, reports[-1]
+        collection = scene.collection.children[0]
+        return {obj[operators.CHUNK_PROP]: obj for obj in collection.all_objects}, reports[-1]
+
+    first, (level, message) = run()
+    assert level == {'INFO'} and message.startswith("Imported 3 chunks")
+    assert sorted(obj.name for obj in first.values()) == ["chunk_0_0", "chunk_1_0", "chunk_2_0"]
+    assert first["0,0"].data.materials[0].name == "stone"
+
+    # Nothing changed: every object is kept and no chunk is re-meshed.
+    second, (_level, message) = run()
+    assert second == first and len(fake_bpy.data.meshes) == 3
+    assert message.startswith("Imported 0 chunks") and "3 unchanged" in message
+
+    # Without the manifest every chunk is rebuilt, from the mesh cache rather than decoded.
+    scene.collection.children[0][operators.MANIFEST_PROP] = "{}"
+    monkeypatch.setattr(profiler, "enabled", True)
+    profiler.clear()
+    rebuilt, (_level, message) = run()
+    assert message.startswith("Imported 3 chunks") and not set(rebuilt.values()) & set(first.values())
+    stages = [record.stage for record in profiler.history()]
+    # The one decode is the stone texture's PNG.
+    assert stages.count("decode") == 1 and stages.count("read") >= 3
+    assert sorted(mesh.name for mesh in fake_bpy.data.meshes) == ["chunk_0_0", "chunk_1_0", "chunk_2_0"]
+    # The rebuilt chunks share the first import's image and material.
+    assert caches[0].created == 2 and caches[-1].reused > 0 and caches[-1].created == 0
+    assert len(fake_bpy.data.images) == 1 and len(fake_bpy.data.materials) == 1
+
+    # Touch one chunk without changing it, rewrite another, delete a third.
+    chunks[0, 0] = (3, floor_chunk(2), 200)
+    chunks[1, 0] = (3, floor_chunk(3), 200)
+    del chunks[2, 0]
+    make_region(world / "region" / "r.0.0.mca", chunks)
+    changed, (_level, message) = run()
+    assert sorted(changed) == ["0,0", "1,0"] and changed["0,0"] is rebuilt["0,0"]
+    assert changed["1,0"] is not rebuilt["1,0"] and changed["1,0"].name == "chunk_1_0"
+    assert "1 unchanged (1 re-read), 1 removed" in message
+    # Replaced and removed chunks take their meshes with them.
+    assert sorted(mesh.name for mesh in fake_bpy.data.meshes) == ["chunk_0_0", "chunk_1_0"]
+
+    # Distance LOD moves the far chunk into its own child collection.
+    op.use_lod, op.lod_distances = True, (16, 1000, 2000)
+    lod, _report = run()
+    assert lod["0,0"] is changed["0,0"] and lod["1,0"] is not changed["1,0"]
+    lod1 = scene.collection.children[0].children
+    assert [child.name for child in lod1] == ["LBFF world LOD1"] and list(lod1[0].objects) == [lod["1,0"]]
+    assert len(fake_bpy.data.meshes) == 2
+    assert len(fake_bpy.data.images) == 1 and len(fake_bpy.data.materials) == 1
+    names = [block.name for data in (fake_bpy.data.objects, fake_bpy.data.meshes, fake_bpy.data.images,
+                                     fake_bpy.data.materials, fake_bpy.data.collections) for block in data]
+    assert not [name for name in names if re.search(r"\.\d{3}$", name)]
+
+
+class FakeWindowManager:
+    """The ``WindowManager`` calls a modal import makes; records its progress."""
+
+    def __init__(self):
+        self.progress = []
+
+    def event_timer_add(self, interval, window=None):
+        return interval
+
+    def event_timer_remove(self, timer):
+        pass
+
+    def modal_handler_add(self, op):
+        pass
+
+    def progress_begin(self, low, high):
+        self.progress.append(("begin", high))
+
+    def progress_update(self, value):
+        self.progress.append(("update", value))
+
+    def progress_end(self):
+        self.progress.append(("end",))
+
+
+def run_modal(op, context):
+    assert op.execute(context) == {'RUNNING_MODAL'}
+    while True:
+        result = op.modal(context, types.SimpleNamespace(type='TIMER'))
+        if result != {'RUNNING_MODAL'}:
+            return result
+        time.sleep(0.01)
+
+
+def test_background_world_import_reports_worker_errors(fake_bpy, importer, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("LBFF_CACHE_DIR", str(tmp_path / "cache"))
+    chunks = {(lx, 0): (3, floor_chunk(2), 100) for lx in range(3)}
+    operators, op, context, reports = world_import(fake_bpy, tmp_path, chunks)
+    context.window = None
+    context.window_manager = FakeWindowManager()
+    context.workspace = types.SimpleNamespace(status_text_set=lambda text: None)
+    op.background, op.chunks_per_tick = True, 2
+
+    # Chunks are applied a tick at a time; finish() then records them all.
+    assert run_modal(op, context) == {'FINISHED'}
+    assert reports[-1][0] == {'INFO'} and reports[-1][1].startswith("Imported 3 chunks")
+    assert context.window_manager.progress[0] == ("begin", 3) and context.window_manager.progress[-1] == ("end",)
+    collection = context.scene.collection.children[0]
+    assert len(collection.objects) == 3 and operators.MANIFEST_PROP in collection
+
+    # Any error on the worker thread cancels the import with a report, not only IMPORT_ERRORS.
+    chunks[0, 0] = (3, floor_chunk(3), 200)
+    make_region(tmp_path / "world" / "region" / "r.0.0.mca", chunks)
+
+    def broken(nbt):
+        raise KeyError("sections")
+
+    monkeypatch.setattr(operators, "chunk_digest", broken)
+    assert run_modal(op, context) == {'CANCELLED'}
+    assert reports[-1] == ({'ERROR'}, f"Could not import {tmp_path / 'world'}: KeyError: 'sections'")
+    assert "Traceback" in capsys.readouterr().err
+    assert op._job.stack.packs == [] and not op._thread.is_alive()
+
+
+def test_biome_tints_gather_per_corner(importer, tmp_path):
+    mesher = importer("mesher")
+    models = importer("models")
+    biomes = importer("biomes")
+    artifacts = importer("artifacts")
+    resource_pack = importer("resource_pack")
+    files = dict(MODEL_FILES)
+    files["models/block/leaves.json"] = {"textures": {"all": "block/oak_leaves"}, "elements": [{
+        "from": [0, 0, 0], "to": [16, 16, 16],
+        "faces": {f: {"texture": "#all", "cullface": f, "tintindex": 0}
+                  for f in ("down", "up", "north", "south", "west", "east")},
+    }]}
+    files["blockstates/oak_leaves.json"] = {"variants": {"": {"model": "block/leaves"}}}
+    pack = tmp_path / "pack"
+    for name, payload in files.items():
+        (pack / "assets/minecraft" / name).parent.mkdir(parents=True, exist_ok=True)
+        (pack / "assets/minecraft" / name).write_text(json.dumps(payload))
+
+    # A row of leaves crossing from plains (x < 8) into desert, and a stone block.
+    blocks = np.zeros((16, 16, 16), dtype=np.int64)
+    blocks[0, 0, :] = 1
+    blocks[5, 5, 5] = 2
+    cells = np.zeros((4, 4, 4), dtype=np.int64)
+    cells[:, :, 2:] = 1
+    chunk = {"sections": [{"Y": 0, "block_states": {
+        "palette": [{"Name": "minecraft:air"}, {"Name": "minecraft:oak_leaves"}, {"Name": "minecraft:stone"}],
+        "data": pack_indices(blocks.ravel().tolist(), 4),
+    }, "biomes": {
+        "palette": ["minecraft:plains", "minecraft:desert"], "data": pack_indices(cells.ravel().tolist(), 1),
+    }}]}
+    sections = list(importer("palette").iter_sections(chunk))
+
+    with resource_pack.PackStack([pack]) as stack:
+        table = mesher.BlockTable(mesher.model_describer(models.ModelResolver(stack, persist=False)))
+        low, states = mesher.chunk_states(sections, table)
+    assert table.texture_tints == {"minecraft:block/oak_leaves": biomes.FOLIAGE}
+
+    # Colormap pixel (row, column) holds (column, row, 0).
+    rows, columns = np.mgrid[0:256, 0:256]
+    colormap = np.stack([columns, rows, np.zeros_like(rows), np.full_like(rows, 255)], axis=2).astype(np.uint8)
+    tints = biomes.BiomeTints(table, foliage=colormap)
+    mesh = mesher.mesh_chunk(states, table, (32, 0, 16))
+    grid = tints.biome_grid(*biomes.chunk_biomes(sections))
+    colors = tints.mesh_colors(mesh, grid, (32, 0, 16))
+
+    def expected(temperature, downfall):
+        rgb = [int((1 - temperature) * 255), int((1 - downfall * temperature) * 255), 0]
+        return np.append(biomes.srgb_to_linear(np.array(rgb, dtype=np.uint8)), 1.0)
+
+    leaves = np.repeat(np.array(mesh.materials)[mesh.material_indices] == "minecraft:block/oak_leaves", 4)
+    x = mesh.vertices[mesh.loops, 0] - 32
+    # The merged row's corners take the biome at their own end.
+    assert np.allclose(colors[leaves & (x < 8)], expected(0.8, 0.4))
+    assert np.allclose(colors[leaves & (x > 8)], expected(1.0, 0.0))     # desert's 2.0 clamps to 1
+    assert (colors[~leaves] == 1).all()
+
+    # Artifacts carry what a warm import needs to tint without the NBT.
+    artifact = artifacts.chunk_artifact(2, 1, 7, "d", mesh, mesher.instance_points(states, table), table,
+                                        low, biomes.chunk_biomes(sections))
+    assert artifacts.save_artifact(tmp_path / "meshes", artifact)
+    loaded = artifacts.load_artifact(tmp_path / "meshes", 2, 1, 7)
+    assert loaded.tints == {"minecraft:block/oak_leaves": "foliage"}
+    assert loaded.biomes == ["minecraft:plains", "minecraft:desert"]
+    ids = np.array([table.texture_id(name) for name in loaded.textures], dtype=np.int32)
+    warm = loaded.mesh._replace(face_textures=ids[loaded.mesh.face_textures])
+    assert np.array_equal(tints.mesh_colors(warm, tints.biome_grid(loaded.biomes, loaded.biome_grid), (32, 0, 16)),
+                          colors)
+
+
+def test_profiler_records_stages_into_a_ring_buffer(importer):
+    profiling = importer("profiling")
+    profiler = profiling.Profiler(capacity=3)
+
+    with profiler.run("op") as run, profiler.stage("read") as s:
+        s.items = 7
+    assert run is s and profiler.history() == []
+
+    profiler.enabled = True
+    with profiler.run("lbff.test"):
+        with profiler.stage("read", 2):
+            pass
+        with profiler.stage("decode") as s:
+            s.items = 5
+    # Modal operators name their operation once execute() has returned.
+    with profiler.stage("mesh", operation="lbff.modal"):
+        pass
+    records = profiler.history()
+    # The ring buffer dropped the oldest record ("read").
+    assert [(r.operation, r.stage, r.items) for r in records] == [
+        ("lbff.test", "decode", 5), ("lbff.test", "lbff.test", 0), ("lbff.modal", "mesh", 0),
+    ]
+    run = records[1]
+    assert run.start_ns <= records[0].start_ns and records[0].duration_ns <= run.duration_ns
+    assert all(isinstance(r.rss_delta, int) for r in records)
+    if profiling.current_rss():
+        with profiler.stage("grow"):
+            kept = b"x" * (64 << 20)
+        with profiler.stage("idle"):
+            pass
+        grow, idle = profiler.history()[-2:]
+        # The delta is the stage's own growth, not the process's high-water mark.
+        assert grow.rss_delta >= 48 << 20 and abs(idle.rss_delta) < 16 << 20
+        del kept
+
+    trace = profiling.chrome_trace(records)
+    event = trace["traceEvents"][0]
+    assert event["ph"] == "X" and event["name"] == "decode" and event["args"]["items"] == 5
+    assert event["dur"] == records[0].duration_ns / 1000
+    assert profiling.history_json(records)["stages"][0]["stage"] == "decode"